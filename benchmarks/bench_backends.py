@@ -0,0 +1,66 @@
+"""QolsysDB backends: in-memory SQLite tables versus Python dict tables, on load_db, dbChanged updates and readers.
+
+"sqlite file" is the sqlite backend kept in a database file (WAL journal, synchronous=NORMAL) in a temporary directory.
+
+Run from the repository root: python -m benchmarks.bench_backends
+"""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import measure, report
+from benchmarks.synthetic import synthetic_database, synthetic_updates
+from qolsys_controller.database.db import DATABASE_BACKENDS, QolsysDB
+
+
+def main() -> None:
+    database = synthetic_database()
+    rows = sum(len(table["resultSet"]) for table in database)
+    updates = synthetic_updates(10000)
+
+    directory = tempfile.TemporaryDirectory()
+    databases = {backend: QolsysDB(backend) for backend in DATABASE_BACKENDS}
+    databases["sqlite file"] = QolsysDB("sqlite", Path(directory.name) / "panel_database.db")
+
+    for backend, db in databases.items():
+        elapsed = measure(lambda db=db: db.load_db(database))
+        report(f"{backend}: load_db", elapsed, rows)
+
+        tables = [db.get_table(m["uri"]) for m in updates]
+
+        def apply_updates(db: QolsysDB = db) -> None:
+            for table, m in zip(tables, updates, strict=True):
+                if table is not None:
+                    with db.transaction():
+                        table.update(m["selection"], m["selectionArgs"], m["contentValues"])
+
+        elapsed = measure(apply_updates)
+        report(f"{backend}: table.update replay", elapsed, len(updates))
+
+        zones = db.get_zones()
+        short_ids = [zone["shortID"] for zone in zones if zone["shortID"]]
+        node_ids = [device["node_id"] for device in db.get_zwave_devices()]
+        partition_ids = [partition["partition_id"] for partition in db.get_partitions()]
+
+        elapsed = measure(lambda db=db: db.get_zones())
+        report(f"{backend}: get_zones ({len(zones)} zones)", elapsed)
+
+        elapsed = measure(lambda db=db: [db.get_powerg(short_id) for short_id in short_ids])
+        report(f"{backend}: get_powerg", elapsed, len(short_ids))
+
+        elapsed = measure(lambda db=db: [db.get_zwave_device(node_id) for node_id in node_ids])
+        report(f"{backend}: get_zwave_device", elapsed, len(node_ids))
+
+        elapsed = measure(lambda db=db: [db.get_alarm_type(partition_id) for partition_id in partition_ids])
+        report(f"{backend}: get_alarm_type", elapsed, len(partition_ids))
+
+        elapsed = measure(lambda db=db: (db.get_partitions(), db.get_automation_devices(), db.get_scenes()))
+        report(f"{backend}: get_partitions/automation/scenes", elapsed)
+
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
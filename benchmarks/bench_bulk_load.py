@@ -0,0 +1,39 @@
+"""QolsysDB.load_db bulk loader versus row by row inserts, on a panel with long history tables.
+
+Run from the repository root: python -m benchmarks.bench_bulk_load
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from benchmarks.common import measure, report
+from benchmarks.synthetic import synthetic_database
+from qolsys_controller.database.db import QolsysDB
+
+
+def _load_row_by_row(db: QolsysDB, database: list[dict[str, Any]]) -> None:
+    with db.transaction():
+        db.clear_db()
+        for uri in database:
+            table = db.get_table(uri["uri"])
+            if table is not None:
+                for row in uri["resultSet"]:
+                    table.insert(data=row)
+
+
+def main() -> None:
+    for history in (2000, 50000):
+        database = synthetic_database(history=history, eu_event=history)
+        rows = sum(len(table["resultSet"]) for table in database)
+        db = QolsysDB()
+
+        elapsed = measure(lambda database=database: _load_row_by_row(db, database))
+        report(f"row by row insert ({rows} rows)", elapsed, rows)
+
+        elapsed = measure(lambda database=database: db.load_db(database))
+        report(f"load_db executemany ({rows} rows)", elapsed, rows)
+
+
+if __name__ == "__main__":
+    main()
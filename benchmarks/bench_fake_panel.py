@@ -0,0 +1,53 @@
+"""End-to-end throughput against the local fake panel (requires the bridge extra).
+
+Run from the repository root: python -m benchmarks.bench_fake_panel
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import report
+from benchmarks.synthetic import synthetic_database, synthetic_updates
+from qolsys_controller.controller import QolsysController
+from tests.fake_panel import FakePanel
+
+
+async def _run(directory: Path, updates: int = 5000, commands: int = 200) -> None:
+    async with FakePanel(directory, database=synthetic_database()) as panel:
+        controller = QolsysController()
+        panel.configure(controller)
+
+        start = time.perf_counter()
+        task = asyncio.create_task(controller.run_forever(reconnect=False, run_once=False, start_pairing=False))
+        await controller.wait_until_connected()
+        report("session initialization (includes 2 s settle delay)", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(commands):
+            await controller.commands.panel.pingevent()
+        report("sequential command round trip", time.perf_counter() - start, commands)
+
+        ingress = controller.mqtt_ingress_queue
+        applied = ingress.stats()["apply"]["count"]
+        start = time.perf_counter()
+        await panel.emit_db_changed(synthetic_updates(updates))
+        while ingress.stats()["apply"]["count"] < applied + updates:
+            await asyncio.sleep(0.001)
+        report("dbChanged stream, publish to applied", time.perf_counter() - start, updates)
+        print(f"ingress stats: {ingress.stats()}")
+
+        await controller.stop()
+        await task
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_run(Path(tmp)))
+
+
+if __name__ == "__main__":
+    main()
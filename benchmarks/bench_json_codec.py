@@ -0,0 +1,36 @@
+"""Encode/decode cost of each available JSON codec on representative panel payloads.
+
+Run from the repository root: python -m benchmarks.bench_json_codec
+"""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks.common import measure, report
+from benchmarks.synthetic import synthetic_database, synthetic_updates
+from qolsys_controller.json_codec import JSON_CODECS, create_json_codec
+
+
+def main() -> None:
+    syncdatabase = json.dumps({"eventName": "syncdatabase", "fulldbdata": synthetic_database()}).encode()
+    updates = [json.dumps(m).encode() for m in synthetic_updates(10000)]
+    decoded_updates = [json.loads(m) for m in updates]
+    print(f"syncdatabase payload: {len(syncdatabase) / 1024:.0f} KiB")
+
+    for name in JSON_CODECS[1:]:
+        codec = create_json_codec(name)
+        if codec.name != name:
+            print(f"{name:<10} not installed")
+            continue
+
+        elapsed = measure(lambda: codec.loads(syncdatabase))
+        report(f"{name:<8} loads syncdatabase", elapsed)
+        elapsed = measure(lambda: [codec.loads(m) for m in updates])
+        report(f"{name:<8} loads dbChanged", elapsed, len(updates))
+        elapsed = measure(lambda: [codec.dumps(m) for m in decoded_updates])
+        report(f"{name:<8} dumps dbChanged", elapsed, len(decoded_updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Event loop blocking time while QolsysPanel.load_database applies a syncdatabase snapshot.
+
+Run from the repository root: python -m benchmarks.bench_load_database
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from benchmarks.common import report
+from benchmarks.synthetic import synthetic_database
+from qolsys_controller.controller import QolsysController
+
+
+async def _max_loop_lag(coro: object) -> tuple[float, float]:
+    """Run coro while a 1 ms ticker records the longest gap between ticks. Returns (elapsed, max_lag)."""
+    max_lag = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal max_lag
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            max_lag = max(max_lag, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await coro  # type: ignore[misc]
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return elapsed, max_lag
+
+
+async def _run(threshold: int) -> tuple[float, float]:
+    # No Z-Wave nodes: zwave_report would wait for panel responses
+    database = synthetic_database(zwave=0)
+    controller = QolsysController()
+    controller.settings.sync_database_thread_threshold = threshold
+    return await _max_loop_lag(controller.panel.load_database(database))
+
+
+def main() -> None:
+    for label, threshold in (("event loop", 1 << 30), ("worker thread", 0)):
+        elapsed, max_lag = asyncio.run(_run(threshold))
+        report(f"load_database ({label}) total", elapsed)
+        report(f"load_database ({label}) max loop lag", max_lag)
+
+
+if __name__ == "__main__":
+    main()
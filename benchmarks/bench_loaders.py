@@ -0,0 +1,34 @@
+"""QolsysPanel domain loaders (get_*_from_db) on an 8-partition / 250-zone / 150-PowerG database, for both backends.
+
+Run from the repository root: python -m benchmarks.bench_loaders
+"""
+
+from __future__ import annotations
+
+from benchmarks.common import load_controller, measure, report
+from benchmarks.synthetic import synthetic_database
+from qolsys_controller.database.db import DATABASE_BACKENDS, QolsysDB
+
+
+def main() -> None:
+    database = synthetic_database(partitions=8, zones=250, powerg=150)
+    controller = load_controller(database)
+    panel = controller.panel
+
+    for backend in DATABASE_BACKENDS:
+        db = QolsysDB(backend)
+        db.load_db(database)
+        panel.db.adopt(db)
+
+        elapsed = measure(panel.get_partitions_from_db)
+        report(f"{backend}: get_partitions_from_db (8 partitions)", elapsed)
+
+        elapsed = measure(panel.get_zones_from_db)
+        report(f"{backend}: get_zones_from_db (250 zones)", elapsed)
+
+        elapsed = measure(panel.get_automation_devices_from_db)
+        report(f"{backend}: get_automation_devices_from_db", elapsed)
+
+
+if __name__ == "__main__":
+    main()
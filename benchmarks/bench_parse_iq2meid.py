@@ -0,0 +1,58 @@
+"""Per-message cost of QolsysPanel.parse_iq2meid_message.
+
+Run from the repository root: python -m benchmarks.bench_parse_iq2meid
+"""
+
+from __future__ import annotations
+
+from benchmarks.common import load_controller, measure, report
+from benchmarks.synthetic import synthetic_database, synthetic_updates
+
+OUTPUT_RULES_URI = "content://com.qolsys.qolsysprovider.OutputRulesContentProvider/output_rules"
+SENSOR_URI = "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor"
+
+
+def main() -> None:
+    controller = load_controller(synthetic_database())
+    panel = controller.panel
+
+    updates = synthetic_updates(10000)
+    elapsed = measure(lambda: [panel.parse_iq2meid_message(m) for m in updates])
+    report("mixed dbChanged update stream", elapsed, len(updates))
+
+    # Last arm of the dispatch chain, no domain work: isolates lookup overhead
+    tail = [
+        {
+            "eventName": "dbChanged",
+            "dbOperation": "update",
+            "uri": OUTPUT_RULES_URI,
+            "selection": "_id=?",
+            "selectionArgs": ["1"],
+            "contentValues": {"_id": "1"},
+        }
+    ] * 10000
+    elapsed = measure(lambda: [panel.parse_iq2meid_message(m) for m in tail])
+    report("output_rules update (end of dispatch chain)", elapsed, len(tail))
+
+    # Panel resending the stored values: no database write, no zone update
+    zone = panel.db.get_zones()[0]
+    unchanged = [
+        {
+            "eventName": "dbChanged",
+            "dbOperation": "update",
+            "uri": SENSOR_URI,
+            "selection": "zoneid=?",
+            "selectionArgs": [zone["zoneid"]],
+            "contentValues": {
+                "zoneid": zone["zoneid"],
+                "sensorstatus": zone["sensorstatus"],
+                "sensorname": zone["sensorname"],
+            },
+        }
+    ] * 10000
+    elapsed = measure(lambda: [panel.parse_iq2meid_message(m) for m in unchanged])
+    report("sensor update with unchanged values", elapsed, len(unchanged))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Replay a panel MQTT capture through the controller message handlers.
+
+Run from the repository root:
+    python -m benchmarks.bench_replay                  # synthetic capture, as fast as possible
+    python -m benchmarks.bench_replay capture.jsonl.gz --speed 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import report
+from benchmarks.synthetic import synthetic_database, synthetic_updates
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.mqtt_capture import MQTT_CAPTURE_VERSION, replay_capture
+
+
+def write_synthetic_capture(path: Path, updates: int = 10000, interval: float = 0.001) -> None:
+    """syncdatabase response followed by a dbChanged stream, one message every interval seconds."""
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"capture": "qolsys_controller", "version": MQTT_CAPTURE_VERSION}) + "\n")
+        response = {"eventName": "syncdatabase", "requestID": "0", "fulldbdata": synthetic_database()}
+        handle.write(json.dumps({"t": 0.0, "topic": "response_synthetic", "payload": json.dumps(response)}) + "\n")
+        for i, message in enumerate(synthetic_updates(updates), start=1):
+            handle.write(json.dumps({"t": i * interval, "topic": "iq2meid", "payload": json.dumps(message)}) + "\n")
+
+
+async def _replay(path: Path, speed: float) -> dict[str, float]:
+    controller = QolsysController()
+    return await replay_capture(controller, path, speed=speed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("capture", nargs="?", help="capture file, a synthetic one is generated if omitted")
+    parser.add_argument("--speed", type=float, default=0, help="1 = recorded speed, N = N times faster, 0 = unthrottled")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.capture) if args.capture else Path(tmp) / "synthetic.jsonl.gz"
+        if not args.capture:
+            write_synthetic_capture(path)
+
+        result = asyncio.run(_replay(path, args.speed))
+        report(f"replay {path.name} (speed {args.speed:g})", result["elapsed"], int(result["messages"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Reconnect resync: full rebuild versus incremental diff of the syncdatabase snapshot.
+
+Run from the repository root: python -m benchmarks.bench_resync
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import time
+from typing import Any
+from unittest.mock import patch
+
+from benchmarks.common import report
+from benchmarks.synthetic import synthetic_database
+from qolsys_controller.automation_zwave.device import QolsysAutomationDeviceZwave
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.enum_qolsys import QolsysNotification
+from qolsys_controller.observable import Event
+
+SENSOR_URI = "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor"
+
+
+def _reconnect_snapshot(database: list[dict[str, Any]], changed: int) -> list[dict[str, Any]]:
+    snapshot = copy.deepcopy(database)
+    for table in snapshot:
+        if table["uri"] == SENSOR_URI:
+            for row in table["resultSet"][:changed]:
+                row["sensorstatus"] = "Open"
+    return snapshot
+
+
+async def _run(incremental: bool, changed: int) -> tuple[float, int, int]:
+    database = synthetic_database()
+    controller = QolsysController()
+    controller.settings.incremental_resync = incremental
+    controller.settings.sync_database_thread_threshold = 1 << 30
+    # zwave_report would wait for panel responses, count the calls instead
+    reports = 0
+
+    async def zwave_report(self: QolsysAutomationDeviceZwave) -> None:
+        nonlocal reports
+        reports += 1
+
+    with patch.object(QolsysAutomationDeviceZwave, "zwave_report", zwave_report):
+        await controller.panel.load_database(database)
+
+    # Subscribe to every zone and to the state like the MQTT bridge does, count delivered events
+    events = 0
+
+    def on_event(event: Event) -> None:
+        nonlocal events
+        events += 1
+
+    for notification in QolsysNotification:
+        controller.state.register(notification, on_event)
+        for zone in controller.state.zones:
+            zone.register(notification, on_event)
+
+    snapshot = _reconnect_snapshot(database, changed)
+    reports = 0
+    with patch.object(QolsysAutomationDeviceZwave, "zwave_report", zwave_report):
+        start = time.perf_counter()
+        await controller.panel.load_database(snapshot)
+        elapsed = time.perf_counter() - start
+
+    return elapsed, events, reports
+
+
+def main() -> None:
+    for changed in (0, 5):
+        for label, incremental in (("full", False), ("incremental", True)):
+            elapsed, events, reports = asyncio.run(_run(incremental, changed))
+            report(f"resync {label}, {changed} zones changed ({events} events, {reports} zwave_report)", elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""QolsysState entity lookups by id, as done for every iq2meid update and bridge command, on a 500-zone / 200-device install.
+
+Run from the repository root: python -m benchmarks.bench_state_lookup
+"""
+
+from __future__ import annotations
+
+from benchmarks.common import load_controller, measure, report
+from benchmarks.synthetic import synthetic_database
+
+
+def main() -> None:
+    database = synthetic_database(partitions=8, zones=500, powerg=300, zwave=200, scenes=20)
+    state = load_controller(database).state
+
+    zone_ids = [zone.zone_id for zone in state.zones]
+    short_ids = [int(zone.shortID) for zone in state.zones if zone.shortID]
+    partition_ids = [partition.id for partition in state.partitions]
+    device_ids = [device.virtual_node_id for device in state.automation_devices]
+    scene_ids = [scene.scene_id for scene in state.scenes]
+
+    elapsed = measure(lambda: [state.zone(zone_id) for zone_id in zone_ids])
+    report(f"zone ({len(zone_ids)} zones)", elapsed, len(zone_ids))
+
+    elapsed = measure(lambda: [state.zone_from_short_id(short_id) for short_id in short_ids])
+    report(f"zone_from_short_id ({len(short_ids)} PowerG zones)", elapsed, len(short_ids))
+
+    elapsed = measure(lambda: [state.partition(partition_id) for partition_id in partition_ids])
+    report(f"partition ({len(partition_ids)} partitions)", elapsed, len(partition_ids))
+
+    elapsed = measure(lambda: [state.automation_device(device_id) for device_id in device_ids])
+    report(f"automation_device ({len(device_ids)} devices)", elapsed, len(device_ids))
+
+    elapsed = measure(lambda: [state.scene(scene_id) for scene_id in scene_ids])
+    report(f"scene ({len(scene_ids)} scenes)", elapsed, len(scene_ids))
+
+    elapsed = measure(lambda: [state.zone("unknown") for _ in range(1000)])
+    report("zone (unknown zone_id)", elapsed, 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""QolsysState.sync_*_data reconciliation on a 500-zone / 200-device install: first sync, unchanged resync, one zone added.
+
+Entity lists are read from the database before timing, only the reconciliation with the state is measured.
+
+Run from the repository root: python -m benchmarks.bench_state_sync
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from benchmarks.common import measure, report
+from benchmarks.synthetic import synthetic_database
+from qolsys_controller.controller import QolsysController
+
+REPEAT = 5
+
+
+def _entities(controller: QolsysController) -> dict[str, Any]:
+    panel = controller.panel
+    return {
+        "partitions": panel.get_partitions_from_db(),
+        "zones": panel.get_zones_from_db(),
+        "automation_devices": panel.get_automation_devices_from_db(),
+        "scenes": panel.get_scenes_from_db(),
+    }
+
+
+def _sync(controller: QolsysController, entities: dict[str, Any]) -> None:
+    state = controller.state
+    state.sync_partitions_data(entities["partitions"])
+    state.sync_zones_data(entities["zones"])
+    state.sync_automation_devices_data(entities["automation_devices"])
+    state.sync_scenes_data(entities["scenes"])
+
+
+def main() -> None:
+    database = synthetic_database(partitions=8, zones=500, powerg=300, zwave=200, scenes=20)
+    smaller = synthetic_database(partitions=8, zones=499, powerg=300, zwave=200, scenes=20)
+
+    # First sync: every entity is added to an empty state
+    controllers = [QolsysController() for _ in range(REPEAT)]
+    batches = []
+    for controller in controllers:
+        controller.panel.db.load_db(database)
+        batches.append((controller, _entities(controller)))
+    pending = iter(batches)
+    elapsed = measure(lambda: _sync(*next(pending)), REPEAT)
+    report("first sync (500 zones, 200 devices)", elapsed)
+
+    # Resync with the same rows: every entity is updated, none changes
+    controller = controllers[0]
+    unchanged = iter([_entities(controller) for _ in range(REPEAT)])
+    elapsed = measure(lambda: _sync(controller, next(unchanged)), REPEAT)
+    report("unchanged resync", elapsed)
+
+    # One zone deleted then added back
+    controller.panel.db.load_db(smaller)
+    without_zone = [_entities(controller)["zones"] for _ in range(REPEAT)]
+    controller.panel.db.load_db(database)
+    with_zone = [_entities(controller)["zones"] for _ in range(REPEAT)]
+    pairs = iter(zip(without_zone, with_zone, strict=True))
+
+    def delete_and_add() -> None:
+        zones_without, zones_with = next(pairs)
+        controller.state.sync_zones_data(zones_without)
+        controller.state.sync_zones_data(zones_with)
+
+    elapsed = measure(delete_and_add, REPEAT)
+    report("sync_zones_data: one zone deleted, then added", elapsed, 2)
+
+
+if __name__ == "__main__":
+    main()
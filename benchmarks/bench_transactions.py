@@ -0,0 +1,41 @@
+"""Commit overhead of the panel database: full load_db and a 10k dbChanged update replay.
+
+Run from the repository root: python -m benchmarks.bench_transactions
+"""
+
+from __future__ import annotations
+
+from benchmarks.common import load_controller, measure, report
+from benchmarks.synthetic import synthetic_database, synthetic_updates
+from qolsys_controller.database.db import QolsysDB
+
+
+def main() -> None:
+    database = synthetic_database()
+    rows = sum(len(table["resultSet"]) for table in database)
+    db = QolsysDB()
+    elapsed = measure(lambda: db.load_db(database))
+    report("load_db", elapsed, rows)
+
+    controller = load_controller(database)
+    panel = controller.panel
+    updates = synthetic_updates(10000)
+    elapsed = measure(lambda: [panel.parse_iq2meid_message(m) for m in updates])
+    report("dbChanged update replay", elapsed, len(updates))
+
+    # Database only, no domain objects: isolates the statement and commit cost
+    tables = [panel.db.get_table(m["uri"]) for m in updates]
+
+    def apply_updates() -> None:
+        for table, m in zip(tables, updates, strict=True):
+            if table is not None:
+                with panel.db.transaction():
+                    table.update(m["selection"], m["selectionArgs"], m["contentValues"])
+
+    elapsed = measure(apply_updates)
+    report("table.update replay (database only)", elapsed, len(updates))
+    print(f"generated SQL cache hit ratio: {panel.db.statement_cache_stats()['update']['hit_ratio']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
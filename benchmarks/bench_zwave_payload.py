@@ -0,0 +1,34 @@
+"""Per-frame cost of QolsysPanel.parse_zwave_message for plain and MultiChannel encapsulated reports.
+
+Run from the repository root: python -m benchmarks.bench_zwave_payload
+"""
+
+from __future__ import annotations
+
+import base64
+
+from benchmarks.common import load_controller, measure, report
+from benchmarks.synthetic import synthetic_database
+from qolsys_controller.enum_zwave import ZwaveCommandClass
+
+SWITCH_REPORT = bytes([ZwaveCommandClass.SwitchBinary, 0x03, 0xFF])
+MULTICHANNEL_SWITCH_REPORT = bytes([ZwaveCommandClass.MultiChannel, 0x0D, 0x02, 0x00, *SWITCH_REPORT])
+
+
+def _messages(payload: bytes, count: int) -> list[dict[str, object]]:
+    encoded = base64.b64encode(payload).decode()
+    return [{"ZWAVE_RESPONSE": {"NODE_ID": 2, "ZWAVE_PAYLOAD": encoded}} for _ in range(count)]
+
+
+def main() -> None:
+    controller = load_controller(synthetic_database())
+    panel = controller.panel
+
+    for label, payload in (("switch report", SWITCH_REPORT), ("multichannel switch report", MULTICHANNEL_SWITCH_REPORT)):
+        messages = _messages(payload, 10000)
+        elapsed = measure(lambda messages=messages: [panel.parse_zwave_message(m) for m in messages])
+        report(f"ZWAVE_RESPONSE {label}", elapsed, len(messages))
+
+
+if __name__ == "__main__":
+    main()
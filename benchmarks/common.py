@@ -0,0 +1,43 @@
+"""Helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from qolsys_controller.controller import QolsysController
+
+# Benchmarks measure the hot path, not log formatting
+logging.disable(logging.CRITICAL)
+
+
+def load_controller(database: list[dict[str, Any]]) -> QolsysController:
+    """Return a controller whose panel database and state are populated from database, without any MQTT."""
+    controller = QolsysController()
+    panel = controller.panel
+    panel.db.load_db(database)
+    controller.state.sync_partitions_data(panel.get_partitions_from_db())
+    controller.state.sync_zones_data(panel.get_zones_from_db())
+    controller.state.sync_automation_devices_data(panel.get_automation_devices_from_db())
+    controller.state.sync_scenes_data(panel.get_scenes_from_db())
+    return controller
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Return the median wall time in seconds of repeat runs of func."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def report(label: str, seconds: float, count: int = 1) -> None:
+    if count > 1:
+        print(f"{label:<48} {seconds * 1000:10.2f} ms  ({seconds / count * 1e6:8.2f} us/op)")
+    else:
+        print(f"{label:<48} {seconds * 1000:10.2f} ms")
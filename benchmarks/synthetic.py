@@ -0,0 +1,200 @@
+"""Synthetic IQ Panel databases and dbChanged streams for the benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+SENSOR_URI = "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor"
+PARTITION_URI = "content://com.qolsys.qolsysprovider.PartitionContentProvider/partition"
+SETTINGS_URI = "content://com.qolsys.qolsysprovider.QolsysSettingsProvider/qolsyssettings"
+STATE_URI = "content://com.qolsys.qolsysprovider.StateContentProvider/state"
+ALARMED_SENSOR_URI = "content://com.qolsys.qolsysprovider.AlarmedSensorProvider/alarmedsensor"
+POWERG_URI = "content://com.qolsys.qolsysprovider.PowerGDeviceContentProvider/powerg_device"
+ZWAVE_NODE_URI = "content://com.qolsys.qolsysprovider.ZwaveContentProvider/zwave_node"
+AUTOMATION_URI = "content://com.qolsys.qolsysprovider.AutomationDeviceContentProvider/automation"
+HISTORY_URI = "content://com.qolsys.qolsysprovider.HistoryContentProvider/history"
+EU_EVENT_URI = "content://com.qolsys.qolsysprovider.EUEventContentProvider/eu_event"
+SCENE_URI = "content://com.qolsys.qolsysprovider.SceneContentProvider/scene"
+
+PANEL_SETTINGS = [
+    "PANEL_TAMPER_STATE",
+    "AC_STATUS",
+    "BATTERY_STATUS",
+    "FAIL_TO_COMMUNICATE",
+    "SECURE_ARMING",
+    "AUTO_BYPASS",
+    "TEMPFORMAT",
+    "LANGUAGE",
+    "COUNTRY",
+    "HARDWARE_VERSION",
+    "MAC_ADDRESS",
+]
+
+
+def synthetic_database(
+    partitions: int = 8,
+    zones: int = 250,
+    powerg: int = 150,
+    zwave: int = 40,
+    history: int = 2000,
+    eu_event: int = 2000,
+    scenes: int = 10,
+) -> list[dict[str, Any]]:
+    """Return a fulldbdata payload shaped like a syncdatabase response."""
+    partition_rows = []
+    setting_rows = []
+    state_rows = []
+    alarmed_rows: list[dict[str, str]] = []
+    row_id = 0
+
+    for pid in range(partitions):
+        partition_rows.append({"_id": str(pid), "partition_id": str(pid), "name": f"Partition {pid}", "devices": ""})
+        for name, value in [
+            ("SYSTEM_STATUS", "DISARM"),
+            ("SYSTEM_STATUS_CHANGED_TIME", "0"),
+            ("EXIT_SOUNDS", "ON"),
+            ("ENTRY_DELAYS", "ON"),
+        ]:
+            row_id += 1
+            setting_rows.append({"_id": str(row_id), "partition_id": str(pid), "name": name, "value": value})
+        for name, value in [("ALARM_STATE", "None"), ("QUICK_EXIT_STATE", "None")]:
+            row_id += 1
+            state_rows.append({"_id": str(row_id), "partition_id": str(pid), "name": name, "value": value})
+
+    for name in PANEL_SETTINGS:
+        row_id += 1
+        setting_rows.append({"_id": str(row_id), "partition_id": "0", "name": name, "value": "0"})
+
+    sensor_rows = []
+    powerg_rows = []
+    for zid in range(1, zones + 1):
+        is_powerg = zid <= powerg
+        sensor_rows.append(
+            {
+                "_id": str(zid),
+                "zoneid": str(zid),
+                "sensorid": str(100000 + zid),
+                "sensorname": f"Zone {zid}",
+                "sensorstatus": "Closed",
+                "sensortype": "Door_Window",
+                "sensorgroup": "entryexitdelay",
+                "partition_id": str(zid % partitions),
+                "battery_status": "Normal",
+                "time": "0",
+                "latestdBm": "-60",
+                "averagedBm": "-62",
+                "current_capability": "POWERG" if is_powerg else "SRF",
+                "shortID": str(zid) if is_powerg else "",
+            }
+        )
+        if is_powerg:
+            powerg_rows.append(
+                {
+                    "_id": str(zid),
+                    "shortID": str(zid),
+                    "longID": f"{zid:08x}",
+                    "temperature": "21.5",
+                    "light": "",
+                    "battery_voltage": "3100",
+                    "status_data": "",
+                    "extras": "",
+                }
+            )
+
+    zwave_rows = []
+    automation_rows = []
+    for nid in range(2, zwave + 2):
+        zwave_rows.append(
+            {
+                "_id": str(nid),
+                "node_id": str(nid),
+                "node_name": f"Light {nid}",
+                "node_type": "Light",
+                "node_status": "Normal",
+                "partition_id": "0",
+                "command_class_list": "[37,38,114]",
+                "meter_capabilities": "",
+                "multisensor_capabilities": "",
+            }
+        )
+        automation_rows.append(
+            {
+                "_id": str(nid),
+                "virtual_node_id": str(nid),
+                "device_name": f"Light {nid}",
+                "device_type": "Light",
+                "protocol": "Z-Wave",
+                "end_point": "0",
+                "partition_id": "0",
+                "state": "off",
+                "status": "Online",
+                "extras": "{}",
+            }
+        )
+
+    history_rows = [
+        {"_id": str(i), "partition_id": "0", "device": "Zone 1", "events": "Open", "time": str(i), "type": "Sensor"}
+        for i in range(history)
+    ]
+    eu_event_rows = [
+        {"_id": str(i), "partition_id": "0", "history_id": str(i), "device": "Zone 1", "events": "Open", "time": str(i)}
+        for i in range(eu_event)
+    ]
+    scene_rows = [{"_id": str(i), "scene_id": str(i), "name": f"Scene {i}", "icon": "", "color": ""} for i in range(scenes)]
+
+    return [
+        {"uri": PARTITION_URI, "resultSet": partition_rows},
+        {"uri": SETTINGS_URI, "resultSet": setting_rows},
+        {"uri": STATE_URI, "resultSet": state_rows},
+        {"uri": ALARMED_SENSOR_URI, "resultSet": alarmed_rows},
+        {"uri": SENSOR_URI, "resultSet": sensor_rows},
+        {"uri": POWERG_URI, "resultSet": powerg_rows},
+        {"uri": ZWAVE_NODE_URI, "resultSet": zwave_rows},
+        {"uri": AUTOMATION_URI, "resultSet": automation_rows},
+        {"uri": HISTORY_URI, "resultSet": history_rows},
+        {"uri": EU_EVENT_URI, "resultSet": eu_event_rows},
+        {"uri": SCENE_URI, "resultSet": scene_rows},
+    ]
+
+
+def synthetic_updates(count: int, zones: int = 250, zwave: int = 40, seed: int = 1) -> list[dict[str, Any]]:
+    """Return a stream of iq2meid dbChanged update messages with a realistic mix of tables."""
+    rng = random.Random(seed)
+    messages: list[dict[str, Any]] = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.6:
+            zid = str(rng.randint(1, zones))
+            content = {"zoneid": zid, "time": str(i)}
+            if rng.random() < 0.3:
+                content["sensorstatus"] = rng.choice(["Open", "Closed"])
+            else:
+                content["latestdBm"] = str(-rng.randint(40, 90))
+            messages.append(_update(SENSOR_URI, "zoneid=?", [zid], content))
+        elif roll < 0.8:
+            nid = str(rng.randint(2, zwave + 1))
+            content = {"node_id": nid, "node_status": rng.choice(["Normal", "Failed"]), "last_updated_date": str(i)}
+            messages.append(_update(ZWAVE_NODE_URI, "node_id=?", [nid], content))
+        elif roll < 0.9:
+            nid = str(rng.randint(2, zwave + 1))
+            content = {"virtual_node_id": nid, "state": rng.choice(["on", "off"]), "last_updated_date": str(i)}
+            messages.append(_update(AUTOMATION_URI, "virtual_node_id=?", [nid], content))
+        elif roll < 0.95:
+            content = {"name": "AC_STATUS", "value": rng.choice(["Connected", "Disconnected"]), "partition_id": "0"}
+            messages.append(_update(SETTINGS_URI, "name=? AND partition_id=?", ["AC_STATUS", "0"], content))
+        else:
+            content = {"name": "ALARM_STATE", "value": "None", "partition_id": "0"}
+            messages.append(_update(STATE_URI, "name=? AND partition_id=?", ["ALARM_STATE", "0"], content))
+    return messages
+
+
+def _update(uri: str, selection: str, selection_args: list[str], content_values: dict[str, str]) -> dict[str, Any]:
+    return {
+        "eventName": "dbChanged",
+        "dbOperation": "update",
+        "uri": uri,
+        "selection": selection,
+        "selectionArgs": selection_args,
+        "contentValues": content_values,
+    }
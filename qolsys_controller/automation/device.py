@@ -438,7 +438,9 @@ class QolsysAutomationDevice(QolsysObservable, ABC):
     def virtual_node_id(self, value: str) -> None:
         if self._virtual_node_id != value:
             LOGGER.debug("%s - virtual_node_id: %s", self.prefix, value)
+            previous_virtual_node_id = self._virtual_node_id
             self._virtual_node_id = value
+            self._controller.state.automation_device_rekey(self, previous_virtual_node_id)
             self.notify(Event(QolsysNotification.AUTOMATION_UPDATE, self, self.to_dict_event()))
 
     @property
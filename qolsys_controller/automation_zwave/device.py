@@ -26,6 +26,9 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Raw Z-Wave frames are passed as memoryview: encapsulated frames are sliced without copying
+ZwavePayload = bytes | memoryview
+
 
 class QolsysAutomationDeviceZwave(QolsysAutomationDevice):
     def __init__(self, controller: QolsysController, zwave_dict: dict[str, str], dict: dict[str, str]) -> None:
@@ -96,12 +99,18 @@ class QolsysAutomationDeviceZwave(QolsysAutomationDevice):
 
         self.end_batch_update()
 
-    def update_raw(self, payload: bytes, endpoint: int = 0) -> None:
+    def update_raw(self, payload: ZwavePayload, endpoint: int = 0) -> None:
+        payload = memoryview(payload)
         try:
             command_class = payload[0]
-            LOGGER.debug(
-                "%s - endpoint%s - update_raw - command class: 0x%02X: %s", self.prefix, endpoint, command_class, payload.hex()
-            )
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    "%s - endpoint%s - update_raw - command class: 0x%02X: %s",
+                    self.prefix,
+                    endpoint,
+                    command_class,
+                    payload.hex(),
+                )
 
             match command_class:
                 case ZwaveCommandClass.SwitchBinary:
@@ -117,12 +126,14 @@ class QolsysAutomationDeviceZwave(QolsysAutomationDevice):
                         self.update_raw(payload[4:], source_endpoint)
 
                 case ZwaveCommandClass.ThermostatOperatingState:
-                    LOGGER.debug("%s - Received ThermostatOperatingState report %s", self.prefix, payload.hex())
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug("%s - Received ThermostatOperatingState report %s", self.prefix, payload.hex())
 
         except IndexError:
-            LOGGER.debug("update_raw: invalid payload:%s", payload)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug("update_raw: invalid payload:%s", payload.hex())
 
-    def parse_command_25(self, payload: bytes, endpoint: int) -> None:
+    def parse_command_25(self, payload: memoryview, endpoint: int) -> None:
         command = payload[1]
 
         if command == 0x03:
@@ -153,7 +164,7 @@ class QolsysAutomationDeviceZwave(QolsysAutomationDevice):
             if isinstance(outlet_service, OutletServiceZwave):
                 outlet_service.is_on = payload[2] == 0xFF
 
-    def parse_command_32(self, payload: bytes, endpoint: int) -> None:
+    def parse_command_32(self, payload: memoryview, endpoint: int) -> None:
         command = payload[1]
 
         # Process report
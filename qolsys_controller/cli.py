@@ -42,6 +42,11 @@ class ControllerConfig:
     mqtt_bridge_friendly_name: str = "iq_panel"
     mqtt_bridge_port: int = 8883
     log_mqtt_messages: bool = False
+    json_codec: str = "auto"
+    mqtt_capture_file: str = ""
+    warm_start: bool = False
+    database_file: bool = False
+    database_ignore_tables: list[str] = field(default_factory=list)
 
 
 def _detect_local_ip() -> Any:
@@ -90,6 +95,11 @@ def load_config(path: str) -> ControllerConfig:
             mqtt_bridge_friendly_name=raw.get("mqtt_bridge_friendly_name", "iq_panel"),
             mqtt_bridge_port=int(raw.get("mqtt_bridge_port", 8883)),
             log_mqtt_messages=bool(raw.get("log_mqtt_messages", False)),
+            json_codec=raw.get("json_codec", "auto"),
+            mqtt_capture_file=raw.get("mqtt_capture_file", ""),
+            warm_start=bool(raw.get("warm_start", False)),
+            database_file=bool(raw.get("database_file", False)),
+            database_ignore_tables=list(raw.get("database_ignore_tables", [])),
         )
 
 
@@ -109,6 +119,11 @@ class Controller:
         settings.panel_mac = self.config.panel_mac
         settings.random_mac = self.config.random_mac
         settings.log_mqtt_messages = self.config.log_mqtt_messages
+        settings.json_codec = self.config.json_codec
+        settings.mqtt_capture_file = self.config.mqtt_capture_file
+        settings.warm_start = self.config.warm_start
+        settings.database_file = self.config.database_file
+        settings.database_ignore_tables = self.config.database_ignore_tables
         settings.auto_discover_pki = self.config.auto_discover_pki
         settings.check_user_code_on_arm = self.config.check_user_code_on_arm
         settings.check_user_code_on_disarm = self.config.check_user_code_on_disarm
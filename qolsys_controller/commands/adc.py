@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
 from typing import TYPE_CHECKING, Any
@@ -58,13 +57,13 @@ class AdcCommands:
         virtual_command = {
             "operation_name": "send_virtual_device_description",
             "virtual_device_operation": 4,
-            "virtual_device_description": json.dumps(device_list),
+            "virtual_device_description": self._controller.settings.codec.dumps_str(device_list),
         }
 
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(virtual_command),
+                "dataValue": self._controller.settings.codec.dumps_str(virtual_command),
             }
         ]
 
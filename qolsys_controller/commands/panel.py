@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
 from enum import StrEnum
@@ -145,7 +144,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(arming_command),
+                "dataValue": self._controller.settings.codec.dumps_str(arming_command),
             }
         ]
 
@@ -192,7 +191,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(quick_exit_command),
+                "dataValue": self._controller.settings.codec.dumps_str(quick_exit_command),
             }
         ]
 
@@ -237,7 +236,7 @@ class PanelCommands:
         command.append("remote_panel_battery_level", 100)
         command.append("remote_panel_battery_health", 2)
         command.append("remote_panel_plugged", 1)
-        command.append("dhcpInfo", json.dumps(dhcpInfo))
+        command.append("dhcpInfo", self._controller.settings.codec.dumps_str(dhcpInfo))
 
         response = await command.send_command()
         LOGGER.debug("MQTT Panel Client - Receiving connect command")
@@ -300,7 +299,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(disarm_command),
+                "dataValue": self._controller.settings.codec.dumps_str(disarm_command),
             }
         ]
 
@@ -341,7 +340,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(scene_command),
+                "dataValue": self._controller.settings.codec.dumps_str(scene_command),
             }
         ]
 
@@ -386,7 +385,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(speak_command),
+                "dataValue": self._controller.settings.codec.dumps_str(speak_command),
             }
         ]
 
@@ -431,7 +430,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(trigger_command),
+                "dataValue": self._controller.settings.codec.dumps_str(trigger_command),
             }
         ]
 
@@ -461,7 +460,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(trigger_command),
+                "dataValue": self._controller.settings.codec.dumps_str(trigger_command),
             }
         ]
 
@@ -491,7 +490,7 @@ class PanelCommands:
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(trigger_command),
+                "dataValue": self._controller.settings.codec.dumps_str(trigger_command),
             }
         ]
 
@@ -524,7 +523,7 @@ class PanelCommands:
         ipcRequest = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(arming_command),
+                "dataValue": self._controller.settings.codec.dumps_str(arming_command),
             }
         ]
 
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import secrets
+import sqlite3
 import ssl
+import time
 from datetime import datetime, timezone
 from typing import Any
 
@@ -24,6 +25,7 @@ from .enum_qolsys import (
     VALID_CONTROLLER_TRANSITIONS,
     ControllerState,
     QolsysNotification,
+    QolsysPanelType,
 )
 from .errors import (
     InvalidControllerStateTransitionError,
@@ -33,12 +35,15 @@ from .errors import (
     QolsysSslError,
 )
 from .mqtt_bridge.bridge import MqttBridge
+from .mqtt_capture import QolsysMqttCapture
 from .mqtt_command_queue import QolsysMqttCommandQueue
+from .mqtt_ingress_queue import QolsysMqttIngressQueue
 from .panel import QolsysPanel
 from .pki import QolsysPKI
 from .settings import QolsysSettings
 from .state import QolsysState
 from .utils_mqtt import generate_random_mac
+from .warm_start import QolsysWarmStart
 
 LOGGER = logging.getLogger(__name__)
 
@@ -80,10 +85,16 @@ class QolsysController:
         # MQTT Panel Client
         self._reconnect_attempt: int = 0
         self._mqtt_publish_queue: asyncio.Queue[MQTTCommand] = asyncio.Queue()
+        self._mqtt_ingress_queue = QolsysMqttIngressQueue()
+        self._mqtt_capture: QolsysMqttCapture | None = None
 
         # MQTT Bridge
         self._mqtt_bridge: MqttBridge | None = None
 
+        # Warm Start: state loaded from the last snapshot until the live sync completes
+        self._warm_start = QolsysWarmStart(self)
+        self._state_stale: bool = False
+
     @property
     def state(self) -> QolsysState:
         return self._state
@@ -100,6 +111,14 @@ class QolsysController:
     def mqtt_command_queue(self) -> QolsysMqttCommandQueue:
         return self._mqtt_command_queue
 
+    @property
+    def mqtt_ingress_queue(self) -> QolsysMqttIngressQueue:
+        return self._mqtt_ingress_queue
+
+    @property
+    def state_stale(self) -> bool:
+        return self._state_stale
+
     ###########################################################################
     # Controller Operations
     ###########################################################################
@@ -108,13 +127,20 @@ class QolsysController:
         LOGGER.debug("Starting Qolsys Controller Operation")
         self._shutdown_complete.clear()
         try:
+            # Serve the last saved state until the panel is connected and synced
+            database_file_loaded = self.settings.database_file and await self.open_database_file()
+            warm_started = self.settings.warm_start and await self.load_warm_start()
+            if database_file_loaded and not warm_started:
+                warm_started = await self.load_database_file()
+
             async with asyncio.TaskGroup() as tg:
                 # Start MQTT Panel Client Supervisor
                 self._supervisor_task = tg.create_task(
                     self.run_supervised(reconnect=reconnect, start_pairing=start_pairing),
                     name="MQTT Panel Client Supervisor",
                 )
-                await self.wait_until_connected()
+                if not warm_started or run_once:
+                    await self.wait_until_connected()
 
                 # Start MQTT Bridge Broker
                 bridge_task = None
@@ -131,6 +157,12 @@ class QolsysController:
                         bridge_task.cancel()
                     return
 
+                if self.settings.warm_start:
+                    tg.create_task(self.warm_start_save_task(), name="Warm Start Save")
+
+                if self.settings.database_file:
+                    tg.create_task(self.database_checkpoint_task(), name="Database File Checkpoint")
+
                 await asyncio.Future()  # Run until cancelled or exception
 
         except* asyncio.CancelledError:
@@ -150,6 +182,12 @@ class QolsysController:
                 await self._pairing_server.stop()
                 self._pairing_server = None
 
+            if self.settings.warm_start:
+                await self.save_warm_start()
+
+            if self.settings.database_file:
+                await self.checkpoint_database_file(truncate=True)
+
             try:
                 await self.set_controller_state(ControllerState.STOPPED)
             except InvalidControllerStateTransitionError:
@@ -229,6 +267,10 @@ class QolsysController:
                 # Fresh outbound queue per connection attempt so stale commands
                 # from a previous session don't get sent on reconnect.
                 self._mqtt_publish_queue = asyncio.Queue()
+                self._mqtt_ingress_queue = QolsysMqttIngressQueue(
+                    maxsize=self.settings.mqtt_ingress_queue_size,
+                    overflow_policy=self.settings.mqtt_ingress_overflow_policy,
+                )
 
                 # Configure controller
                 if not self._is_configured:
@@ -243,12 +285,17 @@ class QolsysController:
                     await mqtt_panel_client.subscribe("response_" + self.settings.random_mac, qos=self.settings.mqtt_qos)
                     await mqtt_panel_client.subscribe("ZWAVE_RESPONSE", qos=self.settings.mqtt_qos)
 
-                    if self.settings.log_mqtt_messages:
+                    if self.settings.mqtt_capture_file:
+                        self._mqtt_capture = QolsysMqttCapture(self.settings.mqtt_capture_file)
+                        self._mqtt_capture.open()
+
+                    if self.settings.log_mqtt_messages or self._mqtt_capture is not None:
                         await mqtt_panel_client.subscribe("mastermeid", qos=self.settings.mqtt_qos)
 
                     # Managed Background Tasks
                     async with asyncio.TaskGroup() as tg:
                         tg.create_task(self.mqtt_listen_task(mqtt_panel_client))
+                        tg.create_task(self.mqtt_apply_task())
                         tg.create_task(self.mqtt_publish_task(mqtt_panel_client))
 
                         await asyncio.sleep(2)
@@ -307,6 +354,9 @@ class QolsysController:
 
             finally:
                 self.mqtt_command_queue.fail_all_pending(QolsysMqttError("MQTT Command failed due to disconnection"))
+                if self._mqtt_capture is not None:
+                    self._mqtt_capture.close()
+                    self._mqtt_capture = None
                 self.notify_panel_status_update()
 
             # Only reached on MqttError with reconnect=True; all other paths raise.
@@ -349,7 +399,7 @@ class QolsysController:
 
         return aiomqtt.Client(
             hostname=self.settings.panel_ip,
-            port=8883,
+            port=self.settings.mqtt_port,
             tls_context=ctx,
             tls_insecure=True,
             clean_session=True,
@@ -366,7 +416,7 @@ class QolsysController:
         while True:
             try:
                 command = await self._mqtt_publish_queue.get()
-                payload = json.dumps(command._payload)
+                payload = self.settings.codec.dumps(command._payload)
                 await client.publish(command._topic, payload, command._qos)
 
             except asyncio.CancelledError:
@@ -385,30 +435,80 @@ class QolsysController:
                 raise
 
     async def mqtt_listen_task(self, client: aiomqtt.Client) -> None:
+        # Reader stage: receive and timestamp only, applying is done by mqtt_apply_task.
+        # Command responses take a fast path so they never wait behind queued dbChanged traffic.
         LOGGER.debug("MQTT Panel Client - Listen task started")
+        response_topic = "response_" + self.settings.random_mac
         async for message in client.messages:
-            try:
-                data_str = message.payload.decode()
-                data_json = json.loads(data_str)
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                LOGGER.warning("Invalid JSON payload on topic %s: %s", message.topic, message.payload)
+            if self._mqtt_capture is not None:
+                self._mqtt_capture.write(str(message.topic), message.payload)
+
+            if message.topic.matches(response_topic):
+                self._mqtt_ingress_queue.record_fast_path()
+                data_json = await self._decode_mqtt_message(message)
+                if data_json is not None:
+                    if isinstance(data_json, dict) and "fulldbdata" in data_json:
+                        # syncdatabase snapshot: dbChanged messages still queued are already part of it
+                        self._mqtt_ingress_queue.mark_snapshot()
+                    await self._mqtt_command_queue.handle_response(data_json)
                 continue
 
-            # Log all MQTT messages for debug purposes if enabled in settings
-            if self.settings.log_mqtt_messages:
-                LOGGER.debug("MQTT TOPIC: %s\n%s", message.topic, data_str)
+            await self._mqtt_ingress_queue.put(message)
+
+    async def mqtt_apply_task(self) -> None:
+        LOGGER.debug("MQTT Panel Client - Apply task started")
+        while True:
+            sequence, message = await self._mqtt_ingress_queue.get_with_sequence()
+            start = time.monotonic()
+            await self.handle_mqtt_message(message, sequence)
+            self._mqtt_ingress_queue.record_apply(time.monotonic() - start)
+
+    async def handle_mqtt_message(self, message: aiomqtt.Message, sequence: int | None = None) -> None:
+        # sequence: arrival sequence in the ingress queue, the message is skipped when a snapshot
+        # received while it was being decoded already reflects it
+        data_json = await self._decode_mqtt_message(message)
+        if data_json is None:
+            return
+
+        if sequence is not None and self._mqtt_ingress_queue.superseded(sequence):
+            return
 
-            # Panel response to MQTT Commands and Panel Commands to IQ Remote
-            if message.topic.matches("response_" + self.settings.random_mac):
-                await self._mqtt_command_queue.handle_response(data_json)
+        # Panel updates to IQ2MEID database
+        if message.topic.matches("iq2meid"):
+            self.panel.parse_iq2meid_message(data_json)
 
-            # Panel updates to IQ2MEID database
-            elif message.topic.matches("iq2meid"):
-                self.panel.parse_iq2meid_message(data_json)
+        # Panel Z-Wave response
+        elif message.topic.matches("ZWAVE_RESPONSE"):
+            self.panel.parse_zwave_message(data_json)
 
-            # Panel Z-Wave response
-            elif message.topic.matches("ZWAVE_RESPONSE"):
-                self.panel.parse_zwave_message(data_json)
+    async def _decode_mqtt_message(self, message: aiomqtt.Message) -> Any | None:
+        try:
+            data_json = await self._decode_mqtt_payload(message.payload)
+        except ValueError:
+            # UnicodeDecodeError is a ValueError
+            LOGGER.warning("Invalid JSON payload on topic %s: %s", message.topic, message.payload)
+            return None
+
+        # Log all MQTT messages for debug purposes if enabled in settings
+        if self.settings.log_mqtt_messages:
+            LOGGER.debug("MQTT TOPIC: %s\n%s", message.topic, message.payload.decode(errors="replace"))
+
+        return data_json
+
+    async def _decode_mqtt_payload(self, payload: bytes) -> Any:
+        # Large payloads (syncdatabase) are decoded in a worker thread so the event loop keeps serving
+        # ping, bridge and command traffic. The listen task still awaits the result to preserve ordering.
+        if len(payload) < self.settings.mqtt_decode_thread_threshold:
+            return self.settings.codec.loads(payload)
+
+        start = time.perf_counter()
+        data = await asyncio.to_thread(self.settings.codec.loads, payload)
+        LOGGER.debug(
+            "MQTT Panel Client - Decoded %d bytes payload in worker thread in %.1f ms",
+            len(payload),
+            (time.perf_counter() - start) * 1000,
+        )
+        return data
 
     async def mqtt_initialize_session_task(self) -> None:
         LOGGER.debug("MQTT Panel Client - Initializing session")
@@ -422,6 +522,12 @@ class QolsysController:
         response_database = await self.commands.panel.sync_database()
         await self.panel.load_database(response_database.get("fulldbdata"))
 
+        if self._state_stale:
+            # Warm start state reconciled with the live panel database
+            self._state_stale = False
+            if self.settings.warm_start:
+                await self.save_warm_start()
+
         if self._pairing_was_started:
             LOGGER.debug("Plugin Pairing Completed ")
             await self._pki.pairing_resume_pki_set(False)
@@ -431,6 +537,95 @@ class QolsysController:
             self.panel.dump()
             self.state.dump()
 
+    ###########################################################################
+    # Warm Start
+    ###########################################################################
+
+    async def load_warm_start(self) -> bool:
+        start = time.perf_counter()
+        data = await self._warm_start.load()
+        if data is None:
+            return False
+
+        if data.get("imei"):
+            self.panel.imei = data["imei"]
+        if data.get("product_type", QolsysPanelType.UNKNOWN) != QolsysPanelType.UNKNOWN:
+            self.panel.product_type = data["product_type"]
+
+        # The panel is not connected yet, Z-Wave devices are refreshed after the live sync
+        await self.panel.load_database(data.get("database"), refresh_zwave=False)
+        self._state_stale = True
+        self.notify_panel_status_update()
+
+        LOGGER.info(
+            "Warm Start - Serving state saved %s (stale until the panel is synced), loaded in %.1f ms",
+            data.get("time"),
+            (time.perf_counter() - start) * 1000,
+        )
+        return True
+
+    async def save_warm_start(self) -> bool:
+        # Only persist state received from the panel
+        if self._state_stale or not self.panel.database_loaded:
+            return False
+
+        return await self._warm_start.save()
+
+    async def warm_start_save_task(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.warm_start_save_interval)
+            if self.controller_state == ControllerState.CONNECTED:
+                await self.save_warm_start()
+
+    ###########################################################################
+    # Database File
+    ###########################################################################
+
+    async def open_database_file(self) -> bool:
+        # Move the panel database to the database file, True when the file holds rows from a previous run
+        path = self.settings.database_file_path
+        if self.settings.database_backend != "sqlite":
+            LOGGER.error("Database File - Requires the sqlite database_backend, %s not opened", path)
+            return False
+
+        try:
+            db = await asyncio.to_thread(self.panel.open_database_file, path)
+        except (OSError, sqlite3.Error):
+            LOGGER.exception("Database File - Error opening %s", path)
+            return False
+
+        self.panel.db.adopt(db)
+        rows: int = self.panel.db.memory_report()["rows"]
+        LOGGER.info("Database File - Opened %s, %d rows", path, rows)
+        return rows > 0
+
+    async def load_database_file(self) -> bool:
+        # Serve the rows kept in the database file until the panel is connected and synced, like a warm start
+        start = time.perf_counter()
+        await self.panel.load_database(self.panel.db.dump_db(), refresh_zwave=False)
+        self._state_stale = True
+        self.notify_panel_status_update()
+
+        LOGGER.info(
+            "Database File - Serving state from %s (stale until the panel is synced), loaded in %.1f ms",
+            self.panel.db.path,
+            (time.perf_counter() - start) * 1000,
+        )
+        return True
+
+    async def checkpoint_database_file(self, truncate: bool = False) -> bool:
+        # WAL checkpoint in a worker thread, the event loop keeps writing meanwhile
+        try:
+            return bool(await asyncio.to_thread(self.panel.db.checkpoint, truncate))
+        except sqlite3.Error:
+            LOGGER.exception("Database File - Checkpoint error")
+            return False
+
+    async def database_checkpoint_task(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.database_checkpoint_interval)
+            await self.checkpoint_database_file()
+
     async def mqtt_ping_task(self, client: aiomqtt.Client) -> None:
         LOGGER.debug("MQTT Panel Client - Ping task started")
         while True:
@@ -470,6 +665,7 @@ class QolsysController:
             "panel_ip": self.settings.panel_ip,
             "unique_id": self.panel.unique_id,
             "plugin_ip": self.settings.plugin_ip,
+            "stale": self._state_stale,
             "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         }
 
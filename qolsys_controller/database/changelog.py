@@ -0,0 +1,97 @@
+import itertools  # noqa: INP001
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+CHANGE_LOG_SIZE = 500  # changes kept per table
+
+
+@dataclass(slots=True)
+class QolsysChange:
+    sequence: int
+    table: str
+    operation: str  # insert, update, delete: one row, reload: the whole table (load_db, clear, adopt)
+    primary_key: str | None  # None: any row of the table may have changed (reload)
+    columns: tuple[str, ...]  # columns written by the operation, empty for delete and reload
+    timestamp: float  # time.time()
+
+
+@dataclass
+class QolsysChangeSet:
+    sequence: int  # last sequence number, to pass to the next changes_since call
+    changes: list[QolsysChange] = field(default_factory=list)  # in sequence order
+    truncated: set[str] = field(default_factory=set)  # tables whose changes were dropped from the log: re-read them
+
+
+class QolsysChangeLog:
+    """Bounded per-table log of the changes applied to a QolsysDB, numbered by one monotonic sequence.
+
+    Each table keeps its last CHANGE_LOG_SIZE changes, so a consumer can catch up after a disconnect
+    with changes_since(last sequence seen) instead of re-reading the full state. Tables whose older
+    changes were dropped are reported as truncated, as is every table when the sequence is ahead of
+    the log (the log was created again, e.g. after a restart). A size of 0 disables the log.
+    """
+
+    def __init__(self, size: int = CHANGE_LOG_SIZE) -> None:
+        self._size = size
+        self._sequence = 0
+        self._tables: dict[str, deque[QolsysChange]] = {}
+        self._dropped: dict[str, int] = {}  # table -> sequence of the last change dropped from its log
+
+    @property
+    def enabled(self) -> bool:
+        return self._size > 0
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        # Existing changes beyond the new size are dropped
+        if value == self._size:
+            return
+
+        self._size = value
+        for table in list(self._tables):
+            changes = self._tables[table]
+            while len(changes) > value:
+                self._dropped[table] = changes.popleft().sequence
+            self._tables[table] = deque(changes, maxlen=value or None)
+
+    def record(self, table: str, operation: str, primary_keys: Iterable[str | None], columns: tuple[str, ...] = ()) -> None:
+        if not self._size:
+            return
+
+        changes = self._tables.get(table)
+        if changes is None:
+            changes = self._tables[table] = deque(maxlen=self._size)
+
+        timestamp = time.time()
+        for primary_key in primary_keys:
+            if len(changes) == self._size:
+                self._dropped[table] = changes[0].sequence
+            self._sequence += 1
+            changes.append(QolsysChange(self._sequence, table, operation, primary_key, columns, timestamp))
+
+    def changes_since(self, sequence: int, tables: Iterable[str] | None = None) -> QolsysChangeSet:
+        change_set = QolsysChangeSet(self._sequence)
+        names = self._tables.keys() if tables is None else tables
+        for table in names:
+            if self._dropped.get(table, 0) > sequence or sequence > self._sequence:
+                change_set.truncated.add(table)
+
+            changes = self._tables.get(table, ())
+            # Logs are ordered by sequence: walk back from the newest change
+            start = len(changes)
+            while start and changes[start - 1].sequence > sequence:
+                start -= 1
+            change_set.changes.extend(itertools.islice(changes, start, None))
+
+        change_set.changes.sort(key=lambda change: change.sequence)
+        return change_set
@@ -1,8 +1,14 @@
 import logging  # noqa: INP001
 import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
 from typing import Any
 
-from .table import QolsysTable
+from .changelog import CHANGE_LOG_SIZE, QolsysChangeLog, QolsysChangeSet
+from .diff import QolsysTableDiff, TableSnapshot, diff_snapshots
+from .retention import QolsysRetentionPolicy
+from .table import STATEMENT_CACHE_SIZE, QolsysTable, QolsysTransactionState, statement_cache_stats
 from .table_alarmedsensor import QolsysTableAlarmedSensor
 from .table_automation import QolsysTableAutomation
 from .table_country_locale import QolsysTableCountryLocale
@@ -42,10 +48,35 @@ from .table_zwave_other import QolsysTableZwaveOther
 
 LOGGER = logging.getLogger(__name__)
 
+# sqlite: tables in an in-memory SQLite database, memory: tables in Python dicts (see QolsysMemoryStore)
+DATABASE_BACKENDS = ("sqlite", "memory")
+
+# File-backed sqlite database: layout version kept in PRAGMA user_version, a file with another version is recreated
+DATABASE_FILE_VERSION = 1
+# WAL pages after which a commit checkpoints by itself, checkpoints normally run periodically in a worker (checkpoint)
+DATABASE_FILE_AUTOCHECKPOINT = 10000
+
 
 class QolsysDB:
-    def __init__(self) -> None:  # noqa: PLR0915
-        self._db: sqlite3.Connection = sqlite3.connect(":memory:")
+    def __init__(self, backend: str = "sqlite", path: Path | None = None) -> None:  # noqa: PLR0915
+        if backend not in DATABASE_BACKENDS:
+            msg = f"Unknown database backend: {backend}"
+            raise ValueError(msg)
+
+        if path is not None and backend != "sqlite":
+            msg = f"A database file requires the sqlite backend: {backend}"
+            raise ValueError(msg)
+
+        self._backend = backend
+        self._path = path
+
+        # A database can be built in a worker thread and then adopted on the event loop (see adopt)
+        # Prepared statement cache sized like the generated SQL cache so recurring statement texts are not recompiled
+        self._db: sqlite3.Connection = (
+            self._connect_file(path)
+            if path is not None
+            else sqlite3.connect(":memory:", check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        )
         self._cursor: sqlite3.Cursor = self._db.cursor()
 
         self.table_alarmedsensor = QolsysTableAlarmedSensor(self.db, self.cursor)
@@ -123,6 +154,74 @@ class QolsysDB:
         self._table_array.append(self.table_shades)
         self._table_array.append(self.table_nest_device)
 
+        self._transaction = QolsysTransactionState()
+        self._changes = QolsysChangeLog()
+        for table in self._table_array:
+            table._transaction = self._transaction
+            table._changes = self._changes
+            if backend == "memory":
+                table.use_memory_store()
+
+        if path is not None:
+            self._check_file_tables()
+
+    @staticmethod
+    def _connect_file(path: Path) -> sqlite3.Connection:
+        # An existing file is kept when it passes the integrity check and has the current layout version
+        # WAL journal with synchronous=NORMAL: commits append to the WAL without waiting for the disk,
+        # a crash loses at most the last transactions, never the consistency of the file
+        db = sqlite3.connect(path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        try:
+            check = db.execute("PRAGMA quick_check").fetchone()[0]
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError as err:
+            check, version = str(err), None
+
+        if check != "ok" or version not in (0, DATABASE_FILE_VERSION):
+            LOGGER.warning("Database file %s discarded: %s", path, check if check != "ok" else f"version {version}")
+            db.close()
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{path}{suffix}").unlink(missing_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(f"PRAGMA wal_autocheckpoint={DATABASE_FILE_AUTOCHECKPOINT}")
+        db.execute(f"PRAGMA user_version={DATABASE_FILE_VERSION}")
+        return db
+
+    def _check_file_tables(self) -> None:
+        # Tables of the file whose columns differ from the current layout are created again, empty
+        for table in self._table_array:
+            columns = [row[1] for row in self._db.execute(f"PRAGMA table_info({table.table})")]
+            if columns != table.columns:
+                LOGGER.warning("Database file %s: %s has another layout, its rows are discarded", self._path, table.table)
+                self._cursor.execute(f"DROP TABLE {table.table}")
+                table._create_table()
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def path(self) -> Path | None:
+        # Database file, None for an in-memory database
+        return self._path
+
+    def checkpoint(self, truncate: bool = False) -> bool:
+        # Copy the WAL of the database file into the file, False when readers or the writer kept it from completing
+        # Uses its own connection: safe to run in a worker thread while the event loop keeps writing
+        if self._path is None:
+            return False
+
+        db = sqlite3.connect(self._path)
+        try:
+            busy, _, _ = db.execute(f"PRAGMA wal_checkpoint({'TRUNCATE' if truncate else 'PASSIVE'})").fetchone()
+        finally:
+            db.close()
+
+        return not busy
+
     @property
     def db(self) -> sqlite3.Connection:
         return self._db
@@ -131,263 +230,243 @@ class QolsysDB:
     def cursor(self) -> sqlite3.Cursor:
         return self._cursor
 
-    def get_automation_devices(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_automation.table} ORDER BY _id")
-        self.db.commit()
-
-        automation_devices: list[dict[str, str]] = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            automation_devices.append(row_dict)
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Apply every statement of the scope (one panel message, one load_db) in a single transaction
+        # Nested scopes join the outermost one, which commits on exit, even when an exception is raised,
+        # as statements were committed one by one before
+        self._transaction.depth += 1
+        try:
+            yield
+        finally:
+            self._transaction.depth -= 1
+            if self._transaction.depth == 0:
+                self._db.commit()
 
-        return automation_devices
+    def get_automation_devices(self) -> list[dict[str, str]]:
+        return self.table_automation.select(order_by="_id")
 
     def get_users(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_user.table} ORDER BY _id")
-        self.db.commit()
-
-        users = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            users.append(row_dict)
-
-        return users
+        return self.table_user.select(order_by="_id")
 
     def get_master_slave(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_master_slave.table}")
-        self.db.commit()
-
-        masterslave = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            masterslave.append(row_dict)
-
-        return masterslave
+        return self.table_master_slave.select()
 
     def get_iqremote_settings(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_iqremotesettings.table}")
-        self.db.commit()
-
-        iqremote_settings = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            iqremote_settings.append(row_dict)
-
-        return iqremote_settings
+        return self.table_iqremotesettings.select()
 
     def get_scenes(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_scene.table} ORDER BY scene_id")
-        self.db.commit()
-
-        scenes = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            scenes.append(row_dict)
-
-        return scenes
+        return self.table_scene.select(order_by="scene_id")
 
     def get_partitions(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_partition.table} ORDER BY partition_id")
-        self.db.commit()
-
-        partitions = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            partitions.append(row_dict)
-
-        return partitions
+        return self.table_partition.select(order_by="partition_id")
 
     def get_adc_devices(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_virtual_device.table} ORDER BY CAST(device_id AS INTEGER)")
-        self.db.commit()
-
-        devices = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            devices.append(row_dict)
-
-        return devices
+        return self.table_virtual_device.select(order_by="device_id", numeric=True)
 
     def get_zwave_device(self, node_id: str) -> dict[str, str] | None:
         try:
-            self.cursor.execute(f"SELECT * FROM {self.table_zwave_node.table} WHERE node_id = ?", (node_id,))
-            self.db.commit()
-
-            row = self.cursor.fetchone()
+            row = self.table_zwave_node.first("node_id = ?", [node_id])
 
             if row is None:
                 LOGGER.debug("Zwave node_id %s not found", node_id)
-                return None
 
-            columns = [description[0] for description in self.cursor.description]
-            return dict(zip(columns, row, strict=True))
+            return row
 
         except sqlite3.Error:
             LOGGER.exception("Error getting Zwave device info for node_id %s", node_id)
             return None
 
     def get_zwave_devices(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_zwave_node.table} ORDER BY CAST(node_id AS INTEGER)")
-        self.db.commit()
-
-        devices = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            devices.append(row_dict)
-
-        return devices
+        return self.table_zwave_node.select(order_by="node_id", numeric=True)
 
     def get_zwave_other_devices(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_zwave_other.table} ORDER BY CAST(node_id AS INTEGER)")
-        self.db.commit()
-
-        devices = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            devices.append(row_dict)
-
-        return devices
+        return self.table_zwave_other.select(order_by="node_id", numeric=True)
 
     def get_locks(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_doorlock.table} ORDER BY CAST(node_id AS INTEGER)")
-        self.db.commit()
-
-        locks = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            locks.append(row_dict)
-
-        return locks
+        return self.table_doorlock.select(order_by="node_id", numeric=True)
 
     def get_thermostats(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_thermostat.table} ORDER BY CAST(node_id AS INTEGER)")
-        self.db.commit()
-
-        thermostats = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            thermostats.append(row_dict)
-
-        return thermostats
+        return self.table_thermostat.select(order_by="node_id", numeric=True)
 
     def get_dimmers(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_dimmer.table} ORDER BY CAST(node_id AS INTEGER)")
-        self.db.commit()
-
-        dimmers = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            dimmers.append(row_dict)
-
-        return dimmers
+        return self.table_dimmer.select(order_by="node_id", numeric=True)
 
     def get_zones(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_sensor.table} ORDER BY CAST(zoneid AS INTEGER)")
-        self.db.commit()
-
-        zones = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            zones.append(row_dict)
-
-        return zones
+        return self.table_sensor.select(order_by="zoneid", numeric=True)
 
     def get_weather(self) -> list[dict[str, str]]:
-        self.cursor.execute(f"SELECT * FROM {self.table_weather.table} ORDER BY _id")
-        self.db.commit()
-
-        weather_list = []
-        columns = [description[0] for description in self.cursor.description]
-        for row in self.cursor.fetchall():
-            row_dict = dict(zip(columns, row, strict=True))
-            weather_list.append(row_dict)
-
-        return weather_list
+        return self.table_weather.select(order_by="_id")
 
     def get_powerg(self, short_id: str) -> dict[str, str] | None:
         try:
-            self.cursor.execute(f"SELECT * FROM {self.table_powerg_device.table} WHERE shortID = ?", (short_id,))
-            self.db.commit()
-
-            row = self.cursor.fetchone()
+            row = self.table_powerg_device.first("shortID = ?", [short_id])
 
             if row is None:
                 LOGGER.debug("%s value not found", short_id)
-                return None
 
-            columns = [description[0] for description in self.cursor.description]
-            return dict(zip(columns, row, strict=True))
+            return row
 
         except sqlite3.Error:
             LOGGER.exception("Error getting PowerG device info for shortID %s", short_id)
             return None
 
+    def get_powerg_devices(self) -> dict[str, dict[str, str]]:
+        # All PowerG devices keyed by shortID, first row wins like get_powerg
+        devices: dict[str, dict[str, str]] = {}
+        for row in self.table_powerg_device.select():
+            devices.setdefault(row["shortID"], row)
+
+        return devices
+
     def get_setting_panel(self, setting: str) -> str:
-        self.cursor.execute(
-            f"""SELECT value FROM {self.table_qolsyssettings.table}
-                             WHERE name = ? and partition_id  = ? """,
-            (setting, "0"),
-        )
-        row = self.cursor.fetchone()
+        value = self.table_qolsyssettings.get(setting, "0")
 
-        if row is None:
+        if value is None:
             return ""
 
-        return str(row[0])
+        return value
 
     def get_setting_partition(self, setting: str, partition_id: str) -> str:
-        self.cursor.execute(
-            f"""SELECT value FROM {self.table_qolsyssettings.table}
-                             WHERE name = ? and partition_id  = ? """,
-            (setting, partition_id),
-        )
-        row = self.cursor.fetchone()
+        value = self.table_qolsyssettings.get(setting, partition_id)
 
-        if row is None:
+        if value is None:
             LOGGER.debug("%s value not found", setting)
             return ""
 
-        return str(row[0])
+        return value
 
     def get_state_partition(self, state: str, partition_id: str) -> str | None:
-        self.cursor.execute(
-            f"""SELECT value FROM {self.table_state.table} WHERE name = ? and partition_id  = ? """, (state, partition_id)
-        )
-        row = self.cursor.fetchone()
+        value = self.table_state.get(state, partition_id)
 
-        if row is None:
+        if value is None:
             LOGGER.debug("%s value not found", state)
             return None
 
-        return str(row[0])
+        return value
 
     def get_alarm_type(self, partition_id: str) -> list[str]:
-        alarm_type = []
-        self.cursor.execute(f"SELECT sgroup FROM {self.table_alarmedsensor.table} WHERE partition_id  = ? ", (partition_id))
-        rows = self.cursor.fetchall()
+        return [sgroup for (sgroup,) in self.table_alarmedsensor.rows(("sgroup",), "partition_id = ?", [partition_id])]
 
-        for row in rows:
-            alarm_type.append(row[0])
+    def get_alarm_types(self) -> dict[str, list[str]]:
+        # Alarm types of every partition, keyed by partition_id
+        alarm_types: dict[str, list[str]] = {}
+        for partition_id, sgroup in self.table_alarmedsensor.rows(("partition_id", "sgroup")):
+            alarm_types.setdefault(partition_id, []).append(sgroup)
 
-        return alarm_type
+        return alarm_types
 
     def clear_db(self) -> None:
         for table in self._table_array:
             table.clear()
 
+    def adopt(self, other: "QolsysDB") -> None:
+        # Take over the connection and table layout of a database loaded elsewhere (worker thread)
+        # Table objects are kept so references held by callers stay valid
+        # A file-backed database copies an in-memory sqlite database into its file and keeps its connection
+        keep_connection = self._path is not None and other._path is None and other._backend == "sqlite"
+        if keep_connection:
+            other._db.backup(self._db)
+            self._db.execute(f"PRAGMA user_version={DATABASE_FILE_VERSION}")
+            old_db = other._db
+        else:
+            old_db = self._db
+            self._db = other._db
+            self._cursor = other._cursor
+            self._backend = other._backend
+            self._path = other._path
+
+        # The other database was configured with the current settings, the change log follows them
+        self._changes.size = other._changes.size
+        for table, other_table in zip(self._table_array, other._table_array, strict=True):
+            table.adopt(other_table, keep_connection)
+            self._changes.record(table.table, "reload", [None])
+        old_db.close()
+
+    def configure(
+        self,
+        retention: Mapping[str, QolsysRetentionPolicy],
+        ignore_tables: Iterable[str],
+        change_log_size: int = CHANGE_LOG_SIZE,
+    ) -> None:
+        # Retention policies and ignored tables by table name, tables not listed are unbounded and stored
+        self._changes.size = change_log_size
+        ignored = set(ignore_tables)
+        names = {table.table for table in self._table_array}
+        for name in sorted((set(retention) | ignored) - names):
+            LOGGER.warning("Database configuration: unknown table %s", name)
+
+        for table in self._table_array:
+            table.configure(retention.get(table.table), table.table in ignored)
+
+    @property
+    def change_sequence(self) -> int:
+        # Sequence number of the last change, 0 when none was recorded
+        return self._changes.sequence
+
+    def changes_since(self, sequence: int, tables: Iterable[str] | None = None) -> QolsysChangeSet:
+        # Changes recorded after sequence, for all tables or the given table names
+        # Consumers re-read the rows of truncated tables and of reload changes
+        names = [table.table for table in self._table_array] if tables is None else tables
+        return self._changes.changes_since(sequence, names)
+
+    def memory_report(self) -> dict[str, Any]:
+        # Rows and value bytes of the non empty tables, database_bytes is the SQLite page usage
+        tables = {}
+        for table in self._table_array:
+            rows, size = table.memory_usage()
+            if rows:
+                tables[table.table] = {"rows": rows, "bytes": size}
+
+        report: dict[str, Any] = {
+            "backend": self._backend,
+            "path": str(self._path) if self._path is not None else None,
+            "tables": tables,
+            "rows": sum(table["rows"] for table in tables.values()),
+            "bytes": sum(table["bytes"] for table in tables.values()),
+        }
+        page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        report["database_bytes"] = page_count * page_size
+        return report
+
+    def update_stats(self) -> dict[str, dict[str, int]]:
+        # Effective and no-op (nothing changed) updates by table, for the tables that received updates
+        stats = {table.table: table.update_stats for table in self._table_array}
+        return {name: counts for name, counts in stats.items() if counts["effective"] or counts["noop"]}
+
+    def statement_cache_stats(self) -> dict[str, Any]:
+        # Generated SQL cache is shared by every table and database instance
+        return statement_cache_stats()
+
+    def dump_db(self) -> list[dict[str, Any]]:
+        # Inverse of load_db: non empty tables in the syncdatabase fulldbdata layout
+        database = []
+        for table in self._table_array:
+            rows = table.snapshot()
+            if rows:
+                result_set = [dict(zip(table.columns, row, strict=True)) for row in rows.values()]
+                database.append({"uri": table.uri, "resultSet": result_set})
+
+        return database
+
+    def snapshot(self, tables: list[QolsysTable] | None = None) -> dict[str, TableSnapshot]:
+        return {table.table: table.snapshot() for table in (tables if tables is not None else self._table_array)}
+
+    def diff(self, snapshot: dict[str, TableSnapshot]) -> dict[str, QolsysTableDiff]:
+        # Rows inserted, changed or deleted since snapshot for the tables it contains
+        # Only tables with at least one change are returned
+        diffs = {}
+        for table in self._table_array:
+            if table.table not in snapshot:
+                continue
+
+            diff = diff_snapshots(table.table, table.columns, snapshot[table.table], table.snapshot())
+            if diff.count:
+                diffs[table.table] = diff
+
+        return diffs
+
     def get_table(self, uri: str) -> QolsysTable | None:
         for table in self._table_array:
             if uri == table.uri:
@@ -396,20 +475,20 @@ class QolsysDB:
         return None
 
     def load_db(self, database: Any | None) -> None:
-        self.clear_db()
+        with self.transaction():
+            self.clear_db()
 
-        if not database:
-            LOGGER.error("Loading Database Error, No Data Provided")
-            return
+            if not database:
+                LOGGER.error("Loading Database Error, No Data Provided")
+                return
 
-        for uri in database:
-            table = self.get_table(uri.get("uri", ""))
+            for uri in database:
+                table = self.get_table(uri.get("uri", ""))
 
-            if table is None:
-                LOGGER.error("Please Report")
-                LOGGER.error("Loading Unknown databse URI")
-                LOGGER.error(uri)
-                continue
+                if table is None:
+                    LOGGER.error("Please Report")
+                    LOGGER.error("Loading Unknown databse URI")
+                    LOGGER.error(uri)
+                    continue
 
-            for u in uri.get("resultSet", ""):
-                table.insert(data=u)
+                table.insert_many(uri.get("resultSet") or [])
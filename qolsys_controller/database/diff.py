@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+# Table rows keyed by primary key (first column), as returned by QolsysTable.snapshot()
+TableSnapshot = dict[str, tuple[Any, ...]]
+
+
+@dataclass
+class QolsysTableDiff:
+    table: str
+    inserted: list[dict[str, Any]] = field(default_factory=list)  # new rows
+    changed: list[dict[str, Any]] = field(default_factory=list)  # new version of the rows
+    deleted: list[dict[str, Any]] = field(default_factory=list)  # old rows
+
+    @property
+    def count(self) -> int:
+        return len(self.inserted) + len(self.changed) + len(self.deleted)
+
+    def values(self, column: str) -> set[str]:
+        # Values of column across inserted, changed and deleted rows (e.g. the zoneid of every touched sensor)
+        return {str(row[column]) for row in [*self.inserted, *self.changed, *self.deleted] if row.get(column)}
+
+
+def diff_snapshots(table: str, columns: list[str], old: TableSnapshot, new: TableSnapshot) -> QolsysTableDiff:
+    diff = QolsysTableDiff(table)
+
+    for key, row in new.items():
+        old_row = old.get(key)
+        if old_row is None:
+            diff.inserted.append(dict(zip(columns, row, strict=True)))
+        elif old_row != row:
+            diff.changed.append(dict(zip(columns, row, strict=True)))
+
+    for key, row in old.items():
+        if key not in new:
+            diff.deleted.append(dict(zip(columns, row, strict=True)))
+
+    return diff
@@ -0,0 +1,239 @@
+import itertools
+import logging  # noqa: INP001
+import re
+import sqlite3
+from typing import Any
+
+from .diff import TableSnapshot
+from .selection import QolsysSelection, text_value
+
+LOGGER = logging.getLogger(__name__)
+
+_LEADING_INTEGER = re.compile(r"\s*[+-]?\d+")
+
+
+def _text_key(value: Any) -> tuple[int, Any]:
+    # ORDER BY column: NULL first
+    return (0, "") if value is None else (1, value)
+
+
+def _integer_key(value: Any) -> tuple[int, int]:
+    # ORDER BY CAST(column AS INTEGER): NULL first, text without a leading integer casts to 0
+    if value is None:
+        return (0, 0)
+
+    match = _LEADING_INTEGER.match(value) if isinstance(value, str) else None
+    return (1, int(match.group()) if match else 0)
+
+
+class QolsysMemoryStore:
+    """Rows of one table in Python dicts, used by the QolsysDB memory backend instead of the SQLite table.
+
+    Rows are keyed by primary key, declared secondary indexes map column values to primary keys.
+    Failures are raised as sqlite3 errors with SQLite's messages so QolsysTable handles both backends alike.
+    """
+
+    def __init__(self, table: str, columns: list[str], indexes: list[tuple[str, ...]]) -> None:
+        self._table = table
+        self._columns = columns
+        self._primary_key = columns[0]
+        self._rows: dict[Any, dict[str, Any]] = {}
+        self._indexes: dict[tuple[str, ...], dict[tuple[Any, ...], dict[Any, None]]] = {index: {} for index in indexes}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def clear(self) -> None:
+        self._rows.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def insert(self, data: dict[str, Any]) -> bool:
+        # INSERT OR IGNORE: an existing primary key keeps its row
+        row = {column: text_value(data.get(column, "")) for column in self._columns}
+        key = row[self._primary_key]
+        if key in self._rows:
+            return False
+
+        self._rows[key] = row
+        self._index_add(key, row)
+        return True
+
+    def insert_many(self, rows: list[tuple[Any, ...]]) -> None:
+        # Rows are complete tuples in column order (QolsysTable.insert_many), text values need no conversion
+        columns = self._columns
+        stored = self._rows
+        for values in rows:
+            row = dict(zip(columns, [value if type(value) is str else text_value(value) for value in values], strict=True))
+            key = row[self._primary_key]
+            if key not in stored:
+                stored[key] = row
+                self._index_add(key, row)
+
+    def update(
+        self, selection: QolsysSelection | None, selection_argument: list[Any], data: dict[str, Any]
+    ) -> tuple[list[Any], set[str]]:
+        # Returns the primary keys (after the update) of the rows that changed and the columns whose value changed
+        # Rows already holding the values are left untouched
+        if not data:
+            msg = "near SET: syntax error, no column to update"
+            raise sqlite3.OperationalError(msg)
+
+        keys = self._match(selection, selection_argument)
+        values = {column: text_value(value) for column, value in data.items()}
+        if not keys:
+            return [], set()
+
+        # A primary key change must not collide with another row, the statement is then not applied at all
+        if self._primary_key in values:
+            new_key = values[self._primary_key]
+            if len(keys) > 1 or (new_key in self._rows and new_key not in keys):
+                msg = f"UNIQUE constraint failed: {self._table}.{self._primary_key}"
+                raise sqlite3.IntegrityError(msg)
+
+        updated = []
+        changed: set[str] = set()
+        for key in keys:
+            row = self._rows[key]
+            row_changed = {column: value for column, value in values.items() if row[column] != value}
+            if not row_changed:
+                continue
+
+            self._index_remove(key, row, row_changed)
+            row.update(row_changed)
+
+            new_key = row[self._primary_key]
+            if new_key != key:
+                del self._rows[key]
+                self._rows[new_key] = row
+                self._index_remove(key, row)
+                self._index_add(new_key, row)
+            else:
+                self._index_add(key, row, row_changed)
+            updated.append(new_key)
+            changed.update(row_changed)
+
+        return updated, changed
+
+    def delete(self, selection: QolsysSelection | None, selection_argument: list[Any]) -> list[Any]:
+        keys = self._match(selection, selection_argument)
+        for key in keys:
+            row = self._rows.pop(key)
+            self._index_remove(key, row)
+
+        return keys
+
+    def select(
+        self,
+        selection: QolsysSelection | None,
+        selection_argument: list[Any],
+        order_by: str | None = None,
+        numeric: bool = False,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        # Copies: callers must not be able to change the stored rows
+        return [row.copy() for row in self._selected(selection, selection_argument, order_by, numeric, limit)]
+
+    def rows(
+        self,
+        columns: tuple[str, ...],
+        selection: QolsysSelection | None,
+        selection_argument: list[Any],
+        order_by: str | None = None,
+        numeric: bool = False,
+        limit: int | None = None,
+    ) -> list[tuple[Any, ...]]:
+        return [
+            tuple([row[column] for column in columns])
+            for row in self._selected(selection, selection_argument, order_by, numeric, limit)
+        ]
+
+    def _selected(
+        self,
+        selection: QolsysSelection | None,
+        selection_argument: list[Any],
+        order_by: str | None,
+        numeric: bool,
+        limit: int | None,
+    ) -> list[dict[str, Any]]:
+        # Stored rows matching the selection, ordered and limited like the SQL select
+        rows = [self._rows[key] for key in self._match(selection, selection_argument)]
+
+        if order_by is not None:
+            sort_key = _integer_key if numeric else _text_key
+            rows.sort(key=lambda row: sort_key(row[order_by]))
+
+        if limit is not None:
+            rows = rows[:limit]
+
+        return rows
+
+    def delete_oldest(self, count: int) -> list[Any]:
+        # Rows in insertion order
+        keys = list(itertools.islice(self._rows, count))
+        for key in keys:
+            self._index_remove(key, self._rows.pop(key))
+
+        return keys
+
+    def delete_older(self, column: str, cutoff: int) -> list[Any]:
+        # Rows whose column casts to an integer in [1, cutoff], like the SQLite retention statement
+        keys = [key for key, row in self._rows.items() if 0 < _integer_key(row[column])[1] <= cutoff]
+        for key in keys:
+            self._index_remove(key, self._rows.pop(key))
+
+        return keys
+
+    def payload_bytes(self) -> int:
+        size = 0
+        for row in self._rows.values():
+            for value in row.values():
+                if isinstance(value, str):
+                    size += len(value.encode())
+                elif isinstance(value, bytes):
+                    size += len(value)
+        return size
+
+    def snapshot(self) -> TableSnapshot:
+        columns = self._columns
+        return {key: tuple([row[column] for column in columns]) for key, row in self._rows.items()}
+
+    def _match(self, selection: QolsysSelection | None, selection_argument: list[Any]) -> list[Any]:
+        if selection is None:
+            return list(self._rows)
+
+        criteria = selection.criteria(selection_argument)
+        if criteria is None:
+            return []
+
+        # Narrow down with the primary key or the longest secondary index fully covered by the criteria
+        if self._primary_key in criteria:
+            key = criteria[self._primary_key]
+            candidates = [key] if key in self._rows else []
+        else:
+            index_columns = max(
+                (index for index in self._indexes if all(column in criteria for column in index)), key=len, default=None
+            )
+            if index_columns is None:
+                candidates = list(self._rows)
+            else:
+                values = tuple([criteria[column] for column in index_columns])
+                candidates = list(self._indexes[index_columns].get(values, ()))
+
+        rows = self._rows
+        return [key for key in candidates if all(rows[key][column] == value for column, value in criteria.items())]
+
+    def _index_add(self, key: Any, row: dict[str, Any], changed: dict[str, Any] | None = None) -> None:
+        for columns, index in self._indexes.items():
+            if changed is None or any(column in changed for column in columns):
+                index.setdefault(tuple([row[column] for column in columns]), {})[key] = None
+
+    def _index_remove(self, key: Any, row: dict[str, Any], changed: dict[str, Any] | None = None) -> None:
+        for columns, index in self._indexes.items():
+            if changed is None or any(column in changed for column in columns):
+                values = tuple([row[column] for column in columns])
+                keys = index.get(values)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del index[values]
@@ -0,0 +1,28 @@
+from dataclasses import dataclass  # noqa: INP001
+
+
+@dataclass(frozen=True)
+class QolsysRetentionPolicy:
+    """Bound on the rows kept by a panel table that only ever grows (history, events, messages).
+
+    max_rows keeps the most recently inserted rows. max_age (seconds) drops rows whose time column,
+    panel epoch milliseconds, is older; rows without a numeric time are only bounded by max_rows.
+    None disables a limit.
+    """
+
+    max_rows: int | None = None
+    max_age: int | None = None
+
+
+DAY = 86400
+
+# Table name -> policy, the panel keeps the full history itself
+DEFAULT_RETENTION: dict[str, QolsysRetentionPolicy] = {
+    "history": QolsysRetentionPolicy(max_rows=2000, max_age=30 * DAY),
+    "zwave_history": QolsysRetentionPolicy(max_rows=1000, max_age=30 * DAY),
+    "eu_event": QolsysRetentionPolicy(max_rows=2000, max_age=30 * DAY),
+    "dashboard_msgs": QolsysRetentionPolicy(max_rows=200),
+}
+
+# Age limits are checked at most once per interval on insert, and after every load
+RETENTION_AGE_CHECK_INTERVAL = 60  # seconds
@@ -0,0 +1,107 @@
+import functools
+import logging  # noqa: INP001
+import re
+import sqlite3
+from collections.abc import Sequence
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+SELECTION_CACHE_SIZE = 256
+
+# One equality term of a ContentProvider selection: zoneid=?, name = 'AC_STATUS', partition_id=0
+_SELECTION_TERM = re.compile(r"\s*(\w+)\s*==?\s*(\?|'[^']*'|[+-]?\d+(?:\.\d+)?)\s*")
+_SELECTION_AND = re.compile(r"\s+and\s+", re.IGNORECASE)
+
+
+def text_value(value: Any) -> Any:
+    # TEXT column affinity: numbers are stored and compared as their text representation
+    if value is None or isinstance(value, str | bytes):
+        return value
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int | float):
+        return str(value)
+
+    msg = f"Error binding parameter: type '{type(value).__name__}' is not supported"
+    raise sqlite3.ProgrammingError(msg)
+
+
+class QolsysSelection:
+    """A ContentProvider selection clause parsed once into equality terms joined by AND.
+
+    Column names are checked against the table columns. The SQL fragment is generated from the
+    terms, so only known column names and placeholders reach SQLite: literal values of the clause
+    are bound as parameters. The same terms match rows in memory (QolsysMemoryStore).
+    Invalid clauses raise sqlite3.OperationalError, handled like any other SQL error by QolsysTable.
+    """
+
+    def __init__(self, terms: tuple[tuple[str, str | None], ...]) -> None:
+        # Column and literal value, None for a ? placeholder
+        self.terms = terms
+        self.columns = frozenset(column for column, _ in terms)
+        self.placeholders = sum(1 for _, literal in terms if literal is None)
+        self.sql = " AND ".join(f"{column} = ?" for column, _ in terms)
+
+    def bind(self, selection_argument: Sequence[Any]) -> list[Any]:
+        # SQL parameters of the fragment: selection arguments and literals in term order
+        if len(selection_argument) != self.placeholders:
+            msg = (
+                f"Incorrect number of bindings supplied. The current statement uses {self.placeholders}, "
+                f"and there are {len(selection_argument)} supplied."
+            )
+            raise sqlite3.ProgrammingError(msg)
+
+        arguments = iter(selection_argument)
+        return [next(arguments) if literal is None else literal for _, literal in self.terms]
+
+    def criteria(self, selection_argument: Sequence[Any]) -> dict[str, Any] | None:
+        # Column values a row must have, None when the terms contradict each other (a = 1 AND a = 2)
+        criteria: dict[str, Any] = {}
+        for (column, _), value in zip(self.terms, self.bind(selection_argument), strict=True):
+            value = text_value(value)
+            if criteria.setdefault(column, value) != value:
+                return None
+
+        return criteria
+
+    def matches(self, row: dict[str, Any], selection_argument: Sequence[Any]) -> bool:
+        criteria = self.criteria(selection_argument)
+        return criteria is not None and all(row.get(column) == value for column, value in criteria.items())
+
+
+@functools.lru_cache(maxsize=SELECTION_CACHE_SIZE)
+def compile_selection(selection: str, columns: frozenset[str]) -> QolsysSelection:
+    terms: list[tuple[str, str | None]] = []
+    for term in _SELECTION_AND.split(selection):
+        match = _SELECTION_TERM.fullmatch(term)
+        if match is None:
+            msg = f"unsupported selection: {selection}"
+            raise sqlite3.OperationalError(msg)
+
+        column, value = match.groups()
+        if column not in columns:
+            msg = f"no such column: {column}"
+            raise sqlite3.OperationalError(msg)
+
+        terms.append((column, None if value == "?" else value.strip("'")))
+
+    return QolsysSelection(tuple(terms))
+
+
+@functools.lru_cache(maxsize=SELECTION_CACHE_SIZE)
+def _parse_selection_arguments(selection_argument: str) -> tuple[str, ...]:
+    items = selection_argument.strip().strip("[]").strip()
+    if not items:
+        return ()
+
+    return tuple(item.strip() for item in items.split(","))
+
+
+def selection_arguments(selection_argument: Sequence[Any] | str | None) -> list[Any]:
+    # Firmware 4.4.1 sends selection_argument as a string: '[3,1]', firmware 4.6.1 as a list: ['3','1']
+    # None, '' and '[]' are no arguments (selection without placeholders)
+    if isinstance(selection_argument, str):
+        return list(_parse_selection_arguments(selection_argument))
+
+    return list(selection_argument) if selection_argument else []
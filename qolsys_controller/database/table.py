@@ -1,21 +1,112 @@
+import functools
 import logging
 import sqlite3
+import time
+from typing import Any
 
 from qolsys_controller.errors import QolsysSqlError
 
+from .changelog import QolsysChangeLog
+from .diff import TableSnapshot
+from .memory import QolsysMemoryStore
+from .retention import RETENTION_AGE_CHECK_INTERVAL, QolsysRetentionPolicy
+from .selection import QolsysSelection, compile_selection, selection_arguments, text_value
+
 LOGGER = logging.getLogger(__name__)
 
+# Generated SQL texts by statement shape, bounded as selections come from the panel
+STATEMENT_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _insert_statement(table: str, columns: frozenset[str]) -> str:
+    return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(f':{key}' for key in columns)})"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _update_statement(table: str, columns: frozenset[str], where: str | None) -> tuple[str, tuple[str, ...]]:
+    # Returns the query and the order in which the SET values must be bound
+    # where is the SQL fragment of a compiled selection, never text from the panel
+    ordered_columns = tuple(sorted(columns))
+    set_clause = ", ".join([f"{key} = ?" for key in ordered_columns])
+
+    if where:
+        return f"UPDATE {table} SET {set_clause} WHERE {where}", ordered_columns
+
+    return f"UPDATE {table} SET {set_clause}", ordered_columns
+
+
+# Query texts already checked by the full scan diagnostic
+_explained_queries: set[str] = set()
+
+
+def log_full_scan(cursor: sqlite3.Cursor, table: str, query: str, params: Any = ()) -> None:
+    # Debug diagnostic: log statements that scan the whole table, once per query text
+    if not LOGGER.isEnabledFor(logging.DEBUG) or query in _explained_queries:
+        return
+
+    if len(_explained_queries) >= STATEMENT_CACHE_SIZE:
+        _explained_queries.clear()
+    _explained_queries.add(query)
+
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        plan = [row[3] for row in cursor.fetchall()]
+    except sqlite3.Error as err:
+        LOGGER.debug("%s - Unable to explain query: %s (%s)", table, query, err)
+        return
+
+    scans = [detail for detail in plan if detail.startswith("SCAN")]
+    if scans:
+        LOGGER.debug("%s - Full table scan: %s | %s", table, query, "; ".join(scans))
+
+
+def statement_cache_stats() -> dict[str, Any]:
+    stats: dict[str, Any] = {}
+    for name, cached in (("insert", _insert_statement), ("update", _update_statement), ("selection", compile_selection)):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_ratio": info.hits / lookups if lookups else 0.0,
+        }
+
+    return stats
+
+
+class QolsysTransactionState:
+    # Open QolsysDB.transaction() scopes, shared by all the tables of a database
+    def __init__(self) -> None:
+        self.depth: int = 0
+
 
 class QolsysTable:
     def __init__(self, db: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
         self._db: sqlite3.Connection = db
         self._cursor: sqlite3.Cursor = cursor
+        self._transaction: QolsysTransactionState = QolsysTransactionState()
         self._uri: str = ""
         self._table: str = ""
         self._columns: list[str] = []
+        self._column_set: frozenset[str] = frozenset()
+        self._indexes: list[tuple[str, ...]] = []
         self._abort_on_error: bool = False
         self._implemented: bool = False
         self._report_new_columns: bool = True
+        self._store: QolsysMemoryStore | None = None
+        self._changes: QolsysChangeLog = QolsysChangeLog()  # shared by the tables of a QolsysDB
+        self._updates_effective: int = 0
+        self._updates_noop: int = 0  # updates that matched no row or left every value unchanged
+
+        # Retention (history tables) and ingest, see configure
+        self._time_column: str | None = None
+        self._retention: QolsysRetentionPolicy | None = None
+        self._ignore_on_ingest: bool = False
+        self._row_count: int | None = None  # SQLite backend, None when unknown
+        self._retention_checked: float = 0.0
 
     @property
     def uri(self) -> str:
@@ -30,6 +121,7 @@ class QolsysTable:
             msg = "The column list must not be empty."
             raise ValueError(msg)
 
+        self._column_set = frozenset(self._columns)
         primary_key = self._columns[0]
         other_columns = self._columns[1:]
 
@@ -37,9 +129,16 @@ class QolsysTable:
         column_defs += [f"{col} TEXT" for col in other_columns]
 
         try:
-            query: str = f"CREATE TABLE {self._table} ({', '.join(column_defs)})"
+            # A file-backed database keeps the tables of the existing file (see QolsysDB)
+            query: str = f"CREATE TABLE IF NOT EXISTS {self._table} ({', '.join(column_defs)})"
             self._cursor.execute(query)
-            self._db.commit()
+
+            # Secondary indexes on the columns used by readers and panel selections
+            for index in self._indexes:
+                query = f"CREATE INDEX IF NOT EXISTS idx_{self._table}_{'_'.join(index)} ON {self._table} ({', '.join(index)})"
+                self._cursor.execute(query)
+
+            self._commit()
 
         except sqlite3.Error as err:
             error = QolsysSqlError(
@@ -53,11 +152,230 @@ class QolsysTable:
             if self._abort_on_error:
                 raise error from err
 
+    def use_memory_store(self) -> None:
+        # QolsysDB memory backend: rows are kept in Python dicts and the SQLite table is dropped
+        self._store = QolsysMemoryStore(self.table, self._columns, self._indexes)
+        self._cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def configure(self, retention: QolsysRetentionPolicy | None, ignore_on_ingest: bool) -> None:
+        # ignore_on_ingest: panel rows of this table are not stored (contents never consumed)
+        if retention is not None and retention.max_age is not None and self._time_column is None:
+            LOGGER.warning("%s - max_age retention needs a time column, only max_rows is applied", self.table)
+
+        self._retention = retention
+        self._ignore_on_ingest = ignore_on_ingest
+
+    @property
+    def retention(self) -> QolsysRetentionPolicy | None:
+        return self._retention
+
+    @property
+    def ignore_on_ingest(self) -> bool:
+        return self._ignore_on_ingest
+
+    @property
+    def update_stats(self) -> dict[str, int]:
+        return {"effective": self._updates_effective, "noop": self._updates_noop}
+
+    @property
+    def indexes(self) -> list[tuple[str, ...]]:
+        return self._indexes
+
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
+
+    def adopt(self, other: "QolsysTable", keep_connection: bool = False) -> None:
+        # Take over the connection and layout of the same table loaded in another QolsysDB (see QolsysDB.adopt)
+        # keep_connection: the rows were copied into this table's database, only the layout is taken over
+        if not keep_connection:
+            self._db = other._db
+            self._cursor = other._cursor
+        self._columns = other._columns
+        self._column_set = other._column_set
+        self._store = other._store
+        self._retention = other._retention
+        self._ignore_on_ingest = other._ignore_on_ingest
+        self._row_count = other._row_count
+        self._retention_checked = other._retention_checked
+
+    def select(
+        self,
+        selection: str | None = None,
+        selection_argument: list[str] | str | None = None,
+        order_by: str | None = None,
+        numeric: bool = False,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        # Rows as dicts for the readers, numeric orders like ORDER BY CAST(column AS INTEGER)
+        # Errors are raised as sqlite3.Error for both backends
+        where, arguments = self._reader(selection, selection_argument, (order_by,) if order_by else ())
+        if self._store is not None:
+            return self._store.select(where, arguments, order_by, numeric, limit)
+
+        self._cursor.execute(*self._select_query("*", where, arguments, order_by, numeric, limit))
+        columns = self._columns
+        return [dict(zip(columns, row, strict=True)) for row in self._cursor.fetchall()]
+
+    def rows(
+        self,
+        columns: tuple[str, ...],
+        selection: str | None = None,
+        selection_argument: list[str] | str | None = None,
+        order_by: str | None = None,
+        numeric: bool = False,
+        limit: int | None = None,
+    ) -> list[tuple[Any, ...]]:
+        # Values of the given columns for each matching row, as tuples in columns order
+        # For readers that need a few columns: only those are read and no dict is built per row
+        where, arguments = self._reader(selection, selection_argument, (*columns, order_by) if order_by else columns)
+        if self._store is not None:
+            return self._store.rows(columns, where, arguments, order_by, numeric, limit)
+
+        self._cursor.execute(*self._select_query(", ".join(columns), where, arguments, order_by, numeric, limit))
+        return self._cursor.fetchall()
+
+    def _reader(
+        self, selection: str | None, selection_argument: list[str] | str | None, columns: tuple[str, ...]
+    ) -> tuple[QolsysSelection | None, list[Any]]:
+        # Compiled selection and arguments of a read, columns are checked against the table
+        for column in columns:
+            if column not in self._column_set:
+                msg = f"no such column: {column}"
+                raise sqlite3.OperationalError(msg)
+
+        return self._compile(selection), selection_arguments(selection_argument)
+
+    def _select_query(
+        self,
+        projection: str,
+        where: QolsysSelection | None,
+        arguments: list[Any],
+        order_by: str | None,
+        numeric: bool,
+        limit: int | None,
+    ) -> tuple[str, list[Any]]:
+        query = f"SELECT {projection} FROM {self.table}"
+        params: list[Any] = []
+        if where is not None:
+            query += f" WHERE {where.sql}"
+            params = where.bind(arguments)
+            log_full_scan(self._cursor, self.table, query, params)
+        if order_by:
+            query += f" ORDER BY CAST({order_by} AS INTEGER)" if numeric else f" ORDER BY {order_by}"
+        if limit is not None:
+            query += f" LIMIT {limit}"
+
+        return query, params
+
+    def _compile(self, selection: str | None) -> QolsysSelection | None:
+        # Selection clauses from the panel are parsed and validated once, see QolsysSelection
+        if not selection:
+            return None
+
+        return compile_selection(selection, self._column_set)
+
+    def first(self, selection: str, selection_argument: list[str] | str | None) -> dict[str, Any] | None:
+        rows = self.select(selection, selection_argument, limit=1)
+        return rows[0] if rows else None
+
+    def snapshot(self) -> TableSnapshot:
+        # All rows keyed by primary key, used to diff two versions of the table
+        if self._store is not None:
+            return self._store.snapshot()
+
+        try:
+            rows = self._db.execute(f"SELECT * FROM {self.table}").fetchall()
+        except sqlite3.Error:
+            LOGGER.debug("Snapshot - Unable to read table %s", self.table)
+            return {}
+
+        return {row[0]: row for row in rows}
+
+    def memory_usage(self) -> tuple[int, int]:
+        # Rows and UTF-8 bytes of the stored values
+        if self._store is not None:
+            return len(self._store), self._store.payload_bytes()
+
+        lengths = " + ".join(f"IFNULL(LENGTH(CAST({column} AS BLOB)), 0)" for column in self._columns)
+        rows, size = self._db.execute(f"SELECT COUNT(*), TOTAL({lengths}) FROM {self.table}").fetchone()
+        return rows, int(size)
+
+    def _count(self) -> int:
+        if self._store is not None:
+            return len(self._store)
+
+        if self._row_count is None:
+            self._row_count = self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+        return self._row_count
+
+    def _enforce_retention(self, check_age: bool = False) -> None:
+        # Incremental: each insert past max_rows drops the oldest row, age is checked once per interval
+        retention = self._retention
+        if retention is None:
+            return
+
+        if retention.max_age is not None and self._time_column is not None:
+            now = time.monotonic()
+            if check_age or now - self._retention_checked >= RETENTION_AGE_CHECK_INTERVAL:
+                self._retention_checked = now
+                cutoff = int((time.time() - retention.max_age) * 1000)
+                if self._store is not None:
+                    self._record("delete", self._store.delete_older(self._time_column, cutoff))
+                else:
+                    where = f"CAST({self._time_column} AS INTEGER) BETWEEN 1 AND ?"
+                    keys = self._primary_keys(where, [cutoff])
+                    self._cursor.execute(f"DELETE FROM {self.table} WHERE {where}", (cutoff,))
+                    if self._cursor.rowcount:
+                        self._row_count = None
+                    self._record("delete", keys)
+
+        if retention.max_rows is not None:
+            excess = self._count() - retention.max_rows
+            if excess > 0:
+                # Oldest rows first: insertion order, rowid for SQLite
+                if self._store is not None:
+                    self._record("delete", self._store.delete_oldest(excess))
+                else:
+                    where = f"rowid IN (SELECT rowid FROM {self.table} ORDER BY rowid LIMIT ?)"
+                    keys = self._primary_keys(where, [excess])
+                    self._cursor.execute(f"DELETE FROM {self.table} WHERE {where}", (excess,))
+                    self._row_count = retention.max_rows
+                    self._record("delete", keys)
+
+    def _primary_keys(self, where: str | None, params: list[Any]) -> list[Any]:
+        # Primary keys of the rows an UPDATE or DELETE is about to change, only read for the change log
+        # A SELECT before the statement is cheaper than UPDATE ... RETURNING
+        if not self._changes.enabled:
+            return []
+
+        query = f"SELECT {self._columns[0]} FROM {self.table}"
+        if where is not None:
+            query += f" WHERE {where}"
+        self._cursor.execute(query, params)
+        return [row[0] for row in self._cursor.fetchall()]
+
+    def _record(self, operation: str, primary_keys: list[Any], columns: tuple[str, ...] = ()) -> None:
+        if primary_keys:
+            self._changes.record(self.table, operation, primary_keys, columns)
+
+    def _commit(self) -> None:
+        # Statements run in a transaction scope are committed when the outermost scope exits
+        if self._transaction.depth == 0:
+            self._db.commit()
+
     def clear(self) -> None:
         try:
             query = f"DELETE from {self.table}"
+            self._record("reload", [None])
+            if self._store is not None:
+                self._store.clear()
+                return
+
             self._cursor.execute(query)
-            self._db.commit()
+            self._row_count = 0
+            self._commit()
 
         except sqlite3.Error as err:
             error = QolsysSqlError(
@@ -72,6 +390,8 @@ class QolsysTable:
                 raise error from err
 
     def insert(self, data: dict[str, str]) -> None:
+        if self._ignore_on_ingest:
+            return
 
         try:
             if not self._implemented and data is not None:
@@ -96,12 +416,73 @@ class QolsysTable:
                 LOGGER.warning("New Columns: %s", new_columns)
                 LOGGER.warning("Please Report")
 
-            col_str = ", ".join(full_data.keys())
-            placeholder_str = ", ".join([f":{key}" for key in full_data])
+            query = _insert_statement(self.table, frozenset(full_data))
+            if self._store is not None:
+                inserted = self._store.insert(full_data)
+            else:
+                self._cursor.execute(query, full_data)
+                inserted = self._cursor.rowcount > 0
+                if self._row_count is not None:
+                    self._row_count += self._cursor.rowcount
+
+            if inserted:
+                self._record("insert", [full_data[self._columns[0]]], tuple(self._columns))
 
-            query = f"INSERT OR IGNORE INTO {self.table} ({col_str}) VALUES ({placeholder_str})"
-            self._cursor.execute(query, full_data)
-            self._db.commit()
+            self._enforce_retention()
+            self._commit()
+
+        except sqlite3.Error as err:
+            error = QolsysSqlError(
+                {
+                    "table": self.table,
+                    "query": query,
+                    "columns": self._columns,
+                }
+            )
+
+            if self._abort_on_error:
+                raise error from err
+
+    def insert_many(self, rows: list[dict[str, str]]) -> None:
+        # Bulk insert (load_db): the projection and statement are built once per table, not once per row
+        if not rows or self._ignore_on_ingest:
+            return
+
+        if not self._implemented:
+            LOGGER.warning("New Table format: %s", self.uri)
+            LOGGER.warning("Table: %s", self.table)
+            LOGGER.warning(rows[0])
+            LOGGER.warning("Please Report")
+            return
+
+        columns = self._columns
+        known_columns = frozenset(columns)
+        new_columns: set[str] = set()
+        values = []
+        for row in rows:
+            if not known_columns.issuperset(row):
+                new_columns.update(key for key in row if key not in known_columns)
+            values.append(tuple([row.get(col, "") for col in columns]))
+
+        # Warn once per table if new columns found in iq2meid database
+        if new_columns and self._report_new_columns:
+            LOGGER.warning("New column found in iq2meid database")
+            LOGGER.warning("Table: %s", self.table)
+            LOGGER.warning("New Columns: %s", sorted(new_columns))
+            LOGGER.warning("Please Report")
+
+        query = f"INSERT OR IGNORE INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+        try:
+            if self._store is not None:
+                self._store.insert_many(values)
+            else:
+                self._cursor.executemany(query, values)
+                self._row_count = None
+
+            self._record("reload", [None])
+            self._enforce_retention(check_age=True)
+            self._commit()
 
         except sqlite3.Error as err:
             error = QolsysSqlError(
@@ -117,21 +498,19 @@ class QolsysTable:
 
     def update(
         self, selection: str | None, selection_argument: list[str] | str | None, content_value: dict[str, str] | None
-    ) -> None:
+    ) -> set[str]:
         # selection: 'zone_id=?, partition_id=?'
         # Firmware 4.4.1: selection_argument: '[3,1]'
         # Firmware 4.6.1: selection_argument: ['3','1']
+        # Returns the columns whose value changed in at least one row, empty when the update was a no-op
+        if self._ignore_on_ingest:
+            return set()
 
         # Firmware 4.4.1: selection_argument is sent as a string and needs to be converted to an array
-        if isinstance(selection_argument, str):
-            selection_argument = selection_argument.strip("[]")
-            selection_argument = [item.strip() for item in selection_argument.split(",")]
-
-        if selection_argument is None:
-            selection_argument = []
+        selection_argument = selection_arguments(selection_argument)
 
+        full_data: dict[str, str] = {}
         try:
-            full_data = {}
             new_columns = []
 
             # Separate valid and unknown columns
@@ -149,18 +528,32 @@ class QolsysTable:
                 LOGGER.warning("New Columns: %s", new_columns)
                 LOGGER.warning("Please Report")
 
-            set_clause = ", ".join([f"{key} = ?" for key in full_data])
-            set_values = list(full_data.values())
-
-            if selection:
-                query = f"UPDATE {self.table} SET {set_clause} WHERE {selection}"
-                params = set_values + selection_argument
+            query = ""
+            where = self._compile(selection)
+            query, ordered_columns = _update_statement(self.table, frozenset(full_data), where.sql if where else None)
+            if self._store is not None:
+                keys, changed = self._store.update(where, selection_argument, full_data)
+            else:
+                where_params = where.bind(selection_argument) if where is not None else []
+                keys, changed = self._changed_rows(where.sql if where else None, where_params, full_data)
+
+                # The statement is only run when a stored value differs (an empty update raises as before)
+                if changed or not full_data:
+                    self._cursor.execute(query, [full_data[key] for key in ordered_columns] + where_params)
+
+                # Keys after the update, the primary key may be one of the updated columns
+                primary_key = self._columns[0]
+                if primary_key in changed:
+                    keys = [full_data[primary_key] for _ in keys]
+
+            if changed:
+                self._updates_effective += 1
+                self._record("update", keys, tuple(sorted(changed)))
+                self._commit()
             else:
-                query = f"UPDATE {self.table} SET {set_clause}"
-                params = set_values
+                self._updates_noop += 1
 
-            self._cursor.execute(query, params)
-            self._db.commit()
+            return changed
 
         except sqlite3.Error as err:
             error = QolsysSqlError(
@@ -177,33 +570,63 @@ class QolsysTable:
             if self._abort_on_error:
                 raise error from err
 
+            LOGGER.warning("%s - Update not applied: %s (selection: %s %s)", self.table, err, selection, selection_argument)
+
+            # Nothing was written: callers must not apply the values to the state
+            return set()
+
+    def _changed_rows(self, where: str | None, params: list[Any], data: dict[str, Any]) -> tuple[list[Any], set[str]]:
+        # Primary keys of the rows an update would change and the columns that differ from the stored values
+        if not data:
+            return [], set()
+
+        columns = list(data)
+        values = [text_value(data[column]) for column in columns]
+        query = f"SELECT {self._columns[0]}, {', '.join(columns)} FROM {self.table}"
+        if where is not None:
+            query += f" WHERE {where}"
+            log_full_scan(self._cursor, self.table, query, params)
+        self._cursor.execute(query, params)
+
+        keys = []
+        changed: set[str] = set()
+        for row in self._cursor.fetchall():
+            row_changed = [column for column, old, new in zip(columns, row[1:], values, strict=True) if old != new]
+            if row_changed:
+                keys.append(row[0])
+                changed.update(row_changed)
+
+        return keys, changed
+
     def delete(self, selection: str | None, selection_argument: list[str] | str | None) -> None:
         # selection: 'zone_id=?, partition_id=?'
         # Firmware 4.4.1: selection_argument: '[3,1]'
         # Firmware 4.6.1: selection_argument: ['3','1']
 
         # Firmware 4.4.1: selection_argument is sent as a string and needs to be converted to an array
-        if type(selection_argument) is str:
-            selection_argument = selection_argument.strip("[]")
-            selection_argument = [item.strip() for item in selection_argument.split(",")]
-
-        if selection_argument is None:
-            selection_argument = []
+        selection_argument = selection_arguments(selection_argument)
 
         try:
-            if selection:
-                query = f"DELETE FROM {self.table} WHERE {selection}"
-
-                if "?" in selection:
-                    # Query expects parameters → must pass the list
-                    self._cursor.execute(query, selection_argument)
-                else:
-                    # Query has no ? , do not pass arguments
-                    self._cursor.execute(query)
+            query = ""
+            where = self._compile(selection)
+            if where is not None:
+                query = f"DELETE FROM {self.table} WHERE {where.sql}"
+
+                if self._store is not None:
+                    self._record("delete", self._store.delete(where, selection_argument))
+                    return
+
+                params = where.bind(selection_argument)
+                log_full_scan(self._cursor, self.table, query, params)
+                keys = self._primary_keys(where.sql, params)
+                self._cursor.execute(query, params)
+                if self._row_count is not None:
+                    self._row_count -= self._cursor.rowcount
+                self._record("delete", keys)
             else:
                 self.clear()
 
-            self._db.commit()
+            self._commit()
 
         except sqlite3.Error as err:
             error = QolsysSqlError(
@@ -218,3 +641,5 @@ class QolsysTable:
 
             if self._abort_on_error:
                 raise error from err
+
+            LOGGER.warning("%s - Delete not applied: %s (selection: %s %s)", self.table, err, selection, selection_argument)
@@ -31,4 +31,6 @@ class QolsysTableAlarmedSensor(QolsysTable):
             "opr",
         ]
 
+        self._indexes = [("partition_id",)]
+
         self._create_table()
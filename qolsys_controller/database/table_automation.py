@@ -44,4 +44,6 @@ class QolsysTableAutomation(QolsysTable):
             "linked_security_zone",
         ]
 
+        self._indexes = [("virtual_node_id",)]
+
         self._create_table()
@@ -31,4 +31,6 @@ class QolsysTableDashboardMsgs(QolsysTable):
             "type",
         ]
 
+        self._time_column = "received_time"
+
         self._create_table()
@@ -33,4 +33,6 @@ class QolsysTableDimmerLight(QolsysTable):
             "paired_status",
         ]
 
+        self._indexes = [("node_id",)]
+
         self._create_table()
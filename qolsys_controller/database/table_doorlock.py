@@ -36,4 +36,6 @@ class QolsysTableDoorLock(QolsysTable):
             "configuration",
         ]
 
+        self._indexes = [("node_id",)]
+
         self._create_table()
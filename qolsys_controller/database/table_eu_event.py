@@ -30,4 +30,6 @@ class QolsysTableEuEvent(QolsysTable):
             "feature2",
         ]
 
+        self._time_column = "time"
+
         self._create_table()
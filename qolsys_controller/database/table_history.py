@@ -34,4 +34,6 @@ class QolsysTableHistory(QolsysTable):
             # "History Bypass Event",
         ]
 
+        self._time_column = "time"
+
         self._create_table()
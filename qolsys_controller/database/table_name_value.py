@@ -0,0 +1,84 @@
+import logging  # noqa: INP001
+import sqlite3
+
+from .table import QolsysTable
+
+LOGGER = logging.getLogger(__name__)
+
+NameValueKey = tuple[str, str]
+
+
+class QolsysTableNameValue(QolsysTable):
+    """Base for the name/value tables (qolsyssettings, state) with a write-through cache of their values.
+
+    Values are keyed by (name, partition_id) and maintained by every write path, so readers get
+    them without a query. The panel's update and delete selections are column=? terms joined by AND
+    on any column (see QolsysSelection), so the keys they touch are read back from the table and
+    refreshed with the same lookup the readers used.
+    """
+
+    def __init__(self, db: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
+        super().__init__(db, cursor)
+        self._values: dict[NameValueKey, str] = {}
+
+    def get(self, name: str, partition_id: str) -> str | None:
+        return self._values.get((name, partition_id))
+
+    def adopt(self, other: QolsysTable, keep_connection: bool = False) -> None:
+        super().adopt(other, keep_connection)
+        if isinstance(other, QolsysTableNameValue):
+            self._values = other._values
+
+    def clear(self) -> None:
+        super().clear()
+        self._values.clear()
+
+    def insert(self, data: dict[str, str]) -> None:
+        super().insert(data)
+        # Keys are text like the readers' lookups, the panel may send partition_id as a number
+        self._refresh({(str(data.get("name", "")), str(data.get("partition_id", "")))})
+
+    def insert_many(self, rows: list[dict[str, str]]) -> None:
+        super().insert_many(rows)
+        self._reload()
+
+    def update(
+        self, selection: str | None, selection_argument: list[str] | str | None, content_value: dict[str, str] | None
+    ) -> set[str]:
+        # Rows matching the selection before and after the update: name or partition_id may change
+        keys = self._selected_keys(selection, selection_argument)
+        changed = super().update(selection, selection_argument, content_value)
+        if changed:
+            self._refresh(keys | self._selected_keys(selection, selection_argument))
+        return changed
+
+    def delete(self, selection: str | None, selection_argument: list[str] | str | None) -> None:
+        keys = self._selected_keys(selection, selection_argument)
+        super().delete(selection, selection_argument)
+        self._refresh(keys)
+
+    def _selected_keys(self, selection: str | None, selection_argument: list[str] | str | None) -> set[NameValueKey]:
+        try:
+            rows = self.rows(("name", "partition_id"), selection, selection_argument)
+        except sqlite3.Error:
+            LOGGER.debug("%s - Unable to read keys for selection: %s", self.table, selection)
+            return set()
+
+        return {(str(name), str(partition_id)) for name, partition_id in rows}
+
+    def _refresh(self, keys: set[NameValueKey]) -> None:
+        for name, partition_id in keys:
+            rows = self.rows(("value",), "name = ? and partition_id = ?", [name, partition_id], limit=1)
+            if not rows:
+                self._values.pop((name, partition_id), None)
+            else:
+                self._values[(name, partition_id)] = str(rows[0][0])
+
+    def _reload(self) -> None:
+        # First row wins on duplicate keys, like the fetchone of the readers
+        self._values.clear()
+        try:
+            for name, partition_id, value in self.rows(("name", "partition_id", "value")):
+                self._values.setdefault((str(name), str(partition_id)), str(value))
+        except sqlite3.Error:
+            LOGGER.debug("%s - Unable to load values", self.table)
@@ -43,4 +43,6 @@ class QolsysTablePowerGDevice(QolsysTable):
             "writeable_capabilities",
         ]
 
+        self._indexes = [("shortID",)]
+
         self._create_table()
@@ -1,12 +1,12 @@
 import logging  # noqa: INP001
 import sqlite3
 
-from .table import QolsysTable
+from .table_name_value import QolsysTableNameValue
 
 LOGGER = logging.getLogger(__name__)
 
 
-class QolsysTableQolsysSettings(QolsysTable):
+class QolsysTableQolsysSettings(QolsysTableNameValue):
     def __init__(self, db: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
         super().__init__(db, cursor)
         self._uri = "content://com.qolsys.qolsysprovider.QolsysSettingsProvider/qolsyssettings"
@@ -24,4 +24,6 @@ class QolsysTableQolsysSettings(QolsysTable):
             "value",
         ]
 
+        self._indexes = [("name", "partition_id")]
+
         self._create_table()
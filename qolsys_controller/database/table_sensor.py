@@ -70,4 +70,6 @@ class QolsysTableSensor(QolsysTable):
             "radio_id",
         ]
 
+        self._indexes = [("zoneid",)]
+
         self._create_table()
@@ -1,12 +1,12 @@
 import logging  # noqa: INP001
 import sqlite3
 
-from .table import QolsysTable
+from .table_name_value import QolsysTableNameValue
 
 LOGGER = logging.getLogger(__name__)
 
 
-class QolsysTableState(QolsysTable):
+class QolsysTableState(QolsysTableNameValue):
     def __init__(self, db: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
         super().__init__(db, cursor)
         self._uri = "content://com.qolsys.qolsysprovider.StateContentProvider/state"
@@ -25,4 +25,6 @@ class QolsysTableState(QolsysTable):
             "extraparams",
         ]
 
+        self._indexes = [("name", "partition_id")]
+
         self._create_table()
@@ -53,4 +53,6 @@ class QolsysTableThermostat(QolsysTable):
             "fan_state",
         ]
 
+        self._indexes = [("node_id",)]
+
         self._create_table()
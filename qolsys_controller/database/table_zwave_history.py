@@ -34,4 +34,6 @@ class QolsysTableZwaveHistory(QolsysTable):
             "protocol",
         ]
 
+        self._time_column = "created_date"
+
         self._create_table()
@@ -85,4 +85,6 @@ class QolsysTableZwaveNode(QolsysTable):
             "central_scene_supported",
         ]
 
+        self._indexes = [("node_id",)]
+
         self._create_table()
@@ -33,4 +33,6 @@ class QolsysTableZwaveOther(QolsysTable):
             "version",
         ]
 
+        self._indexes = [("node_id",)]
+
         self._create_table()
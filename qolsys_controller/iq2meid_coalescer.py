@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+# Row oriented tables receiving bursts of updates (status, time, dBm, battery) for the same row
+IQ2MEID_COALESCE_URIS = frozenset(
+    {
+        "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor",
+        "content://com.qolsys.qolsysprovider.ZwaveContentProvider/zwave_node",
+        "content://com.qolsys.qolsysprovider.AutomationDeviceContentProvider/automation",
+        "content://com.qolsys.qolsysprovider.PowerGDeviceContentProvider/powerg_device",
+    }
+)
+
+# Updates touching these fields are never delayed: zone open/closed and automation device state (lock, cover, light)
+# Partition alarm state lives in the state table, which is never coalesced
+IQ2MEID_CRITICAL_FIELDS = frozenset({"sensorstatus", "state"})
+
+
+class QolsysIq2meidCoalescer:
+    """Merge dbChanged updates to the same (uri, selection, selectionArgs) received within a window.
+
+    Messages that cannot be coalesced (insert, delete, other tables) and updates carrying a critical
+    field flush everything pending first, so the relative order of applied messages is preserved.
+    """
+
+    def __init__(self, apply: Callable[[dict[str, Any]], None]) -> None:
+        self._apply = apply
+        self._pending: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._received: int = 0
+        self._applied: int = 0
+        self._critical: int = 0
+
+    def submit(self, data: dict[str, Any], window_ms: int) -> None:
+        self._received += 1
+
+        key = self._coalesce_key(data) if window_ms > 0 else None
+        if key is None:
+            self.flush()
+            self._apply_message(data)
+            return
+
+        content_values = data.get("contentValues") or {}
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = {**data, "contentValues": dict(content_values)}
+        else:
+            pending["contentValues"].update(content_values)
+
+        if not IQ2MEID_CRITICAL_FIELDS.isdisjoint(content_values):
+            self._critical += 1
+            self.flush()
+            return
+
+        if self._timer is None:
+            try:
+                self._timer = asyncio.get_running_loop().call_later(window_ms / 1000, self.flush)
+            except RuntimeError:
+                # No event loop: nothing can flush later, apply now
+                self.flush()
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # One entry at a time: a failing update is logged and the others are still applied
+        while self._pending:
+            data = self._pending.pop(next(iter(self._pending)))
+            try:
+                self._apply_message(data)
+            except Exception:
+                LOGGER.exception("Coalesced dbChanged update not applied: %s %s", data.get("uri"), data.get("selectionArgs"))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "received": self._received,
+            "applied": self._applied,
+            "coalesced": self._received - self._applied - len(self._pending),
+            "critical": self._critical,
+            "pending": len(self._pending),
+        }
+
+    def _apply_message(self, data: dict[str, Any]) -> None:
+        self._applied += 1
+        self._apply(data)
+
+    @staticmethod
+    def _coalesce_key(data: dict[str, Any]) -> tuple[str, str, str] | None:
+        uri = data.get("uri", "")
+        selection = data.get("selection")
+        if data.get("dbOperation") != "update" or uri not in IQ2MEID_COALESCE_URIS or not selection:
+            return None
+
+        # Firmware 4.4.1 sends selectionArgs as a string, newer firmware as a list
+        return (uri, selection, str(data.get("selectionArgs")))
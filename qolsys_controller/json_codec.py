@@ -0,0 +1,98 @@
+import json
+import logging
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+JSON_CODECS = ["auto", "orjson", "msgspec", "stdlib"]
+
+
+class QolsysJsonCodec:
+    """Stdlib JSON codec, base class for the optional fast codecs.
+
+    dumps() returns bytes so MQTT payloads can be published without an extra str -> bytes copy.
+    loads() accepts bytes or str and raises ValueError on invalid input.
+    """
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def dumps_str(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+    def loads(self, data: bytes | bytearray | str) -> Any:
+        return json.loads(data)
+
+
+class QolsysJsonCodecOrjson(QolsysJsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._option)
+
+    def dumps_str(self, obj: Any) -> str:
+        return self._orjson.dumps(obj, option=self._option).decode()
+
+    def loads(self, data: bytes | bytearray | str) -> Any:
+        # orjson.JSONDecodeError is a json.JSONDecodeError (ValueError)
+        return self._orjson.loads(data)
+
+
+class QolsysJsonCodecMsgspec(QolsysJsonCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def dumps_str(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+    def loads(self, data: bytes | bytearray | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as err:
+            raise ValueError(str(err)) from err
+
+
+def create_json_codec(name: str = "auto") -> QolsysJsonCodec:
+    """Return the codec selected by name.
+
+    "auto" picks orjson, then msgspec, when installed. An explicitly selected codec that is not
+    installed falls back to the stdlib with a warning.
+    """
+    candidates: list[type[QolsysJsonCodec]] = []
+    match name:
+        case "auto":
+            candidates = [QolsysJsonCodecOrjson, QolsysJsonCodecMsgspec]
+        case "orjson":
+            candidates = [QolsysJsonCodecOrjson]
+        case "msgspec":
+            candidates = [QolsysJsonCodecMsgspec]
+        case "stdlib":
+            candidates = []
+        case _:
+            LOGGER.warning("Unknown json_codec '%s', using stdlib json", name)
+
+    for codec_class in candidates:
+        try:
+            return codec_class()
+        except ImportError:
+            if name != "auto":
+                LOGGER.warning("json_codec '%s' is not installed, using stdlib json", name)
+
+    return QolsysJsonCodec()
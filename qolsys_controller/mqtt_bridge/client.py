@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import ssl
 from typing import TYPE_CHECKING, Any
@@ -158,7 +157,7 @@ class MqttBridgeClient:
             event: Event | None = None
             while True:
                 event = await self._queue.get()
-                payload = json.dumps(event.data)
+                payload = self._bridge._controller.settings.codec.dumps(event.data)
 
                 id = event.data.get("id")
                 if event.type == QolsysNotification.ZONE_UPDATE:
@@ -306,8 +305,8 @@ class MqttBridgeClient:
     async def _handle_automation_command(self, topic_virtual_node_id: str | None, payload: str) -> None:
         # Decode JSON
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = self._bridge._controller.settings.codec.loads(payload)
+        except ValueError:
             LOGGER.error("MQTT Bridge Client: Invalid JSON payload: %s", payload)
             return
 
@@ -364,8 +363,8 @@ class MqttBridgeClient:
     async def _handle_panel_command(self, payload: str) -> None:
         # Decode JSON
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = self._bridge._controller.settings.codec.loads(payload)
+        except ValueError:
             LOGGER.error("MQTT Bridge Client - Invalid JSON payload: %s", payload)
             return
 
@@ -389,8 +388,8 @@ class MqttBridgeClient:
     async def _handle_partition_command(self, topic_partition_id: str | None, payload: str) -> None:
         # Decode JSON
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = self._bridge._controller.settings.codec.loads(payload)
+        except ValueError:
             LOGGER.error("MQTT Bridge Client - Invalid JSON payload: %s", payload)
             return
 
@@ -434,7 +433,7 @@ class MqttBridgeClient:
 
         await self._client.publish(
             data["response_topic"],
-            json.dumps({"success": True, "command_id": data.get("command_id")}),
+            self._bridge._controller.settings.codec.dumps({"success": True, "command_id": data.get("command_id")}),
             qos=self._bridge.mqtt_qos,
             retain=False,
         )
@@ -583,9 +582,8 @@ class MqttBridgeClient:
             LOGGER.error("No response_topic provided, cannot send error response")
             return
 
-        await self._client.publish(
-            topic=response_topic, payload=json.dumps(response_dict), qos=self._bridge.mqtt_qos, retain=False
-        )
+        payload = self._bridge._controller.settings.codec.dumps(response_dict)
+        await self._client.publish(topic=response_topic, payload=payload, qos=self._bridge.mqtt_qos, retain=False)
 
     async def _cmd_light_on(self, device: QolsysAutomationDevice, endpoint: int, data: dict[str, Any]) -> None:
         service = await self._get_service(device, LightService, endpoint, data)
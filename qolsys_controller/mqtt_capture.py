@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import gzip
+import json
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import aiomqtt
+
+if TYPE_CHECKING:
+    from .controller import QolsysController
+
+LOGGER = logging.getLogger(__name__)
+
+MQTT_CAPTURE_VERSION = 1
+
+
+@dataclass
+class QolsysCapturedMessage:
+    timestamp: float  # seconds since the start of the capture
+    topic: str
+    payload: bytes
+
+
+class QolsysMqttCapture:
+    """Write panel MQTT traffic to a gzip compressed JSON lines file.
+
+    The first line is a header, then one {"t", "topic", "payload"} object per message where t is the
+    number of seconds since the capture was opened. Reopening a file appends a new gzip member with
+    its own header; read_capture() restarts the timeline at each header.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._file: IO[str] | None = None
+        self._start: float = 0.0
+        self._count: int = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def open(self) -> None:
+        if self._file is not None:
+            return
+
+        self._file = gzip.open(self._path, "at", encoding="utf-8")
+        self._start = time.monotonic()
+        header = {
+            "capture": "qolsys_controller",
+            "version": MQTT_CAPTURE_VERSION,
+            "time": datetime.now(timezone.utc).isoformat(),
+        }
+        self._file.write(json.dumps(header) + "\n")
+        LOGGER.debug("MQTT Capture - Writing panel traffic to %s", self._path)
+
+    def write(self, topic: str, payload: bytes) -> None:
+        if self._file is None:
+            return
+
+        line = {"t": round(time.monotonic() - self._start, 6), "topic": topic, "payload": payload.decode(errors="replace")}
+        self._file.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self._count += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+        LOGGER.debug("MQTT Capture - %d messages written to %s", self._count, self._path)
+
+
+def read_capture(path: str | Path) -> Iterator[QolsysCapturedMessage]:
+    offset = 0.0
+    last = 0.0
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            data = json.loads(line)
+            if "capture" in data:
+                # New capture session: continue the timeline after the previous one
+                offset = last
+                continue
+
+            last = offset + data["t"]
+            yield QolsysCapturedMessage(last, data["topic"], data["payload"].encode())
+
+
+async def replay_capture(controller: QolsysController, path: str | Path, speed: float = 1.0) -> dict[str, Any]:
+    """Feed a capture into the controller message handlers, bypassing aiomqtt.
+
+    speed: 1.0 replays at recorded speed, N at N times the recorded speed, 0 as fast as possible.
+    Commands sent by the controller during the replay (e.g. zwave_report) are acknowledged with an
+    empty response so handlers never wait for a panel. A captured syncdatabase response is loaded
+    with panel.load_database.
+    """
+    ack_task = asyncio.create_task(_acknowledge_commands(controller))
+    messages = 0
+    start = time.perf_counter()
+
+    try:
+        for captured in read_capture(path):
+            if speed > 0:
+                delay = start + captured.timestamp / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            message = aiomqtt.Message(captured.topic, captured.payload, qos=0, retain=False, mid=0, properties=None)
+            # Captured responses were addressed to the capturing plugin random_mac
+            if captured.topic.startswith("response_"):
+                data = await controller._decode_mqtt_message(message)
+                if data is not None and data.get("fulldbdata") is not None:
+                    await controller.panel.load_database(data["fulldbdata"])
+            else:
+                await controller.handle_mqtt_message(message)
+
+            messages += 1
+    finally:
+        ack_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await ack_task
+
+    elapsed = time.perf_counter() - start
+    LOGGER.debug("MQTT Replay - %d messages replayed in %.3f s", messages, elapsed)
+    return {"messages": messages, "elapsed": elapsed}
+
+
+async def _acknowledge_commands(controller: QolsysController) -> None:
+    while True:
+        command = await controller._mqtt_publish_queue.get()
+        await controller.mqtt_command_queue.handle_response({"requestID": command._requestID})
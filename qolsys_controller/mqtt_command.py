@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 import uuid
 from typing import TYPE_CHECKING, Any
@@ -209,7 +208,7 @@ class MQTTCommand_Automation(MQTTCommand_IpcCall):
         ipc_request = [
             {
                 "dataType": "string",
-                "dataValue": json.dumps(dict_operation),
+                "dataValue": self._controller.settings.codec.dumps_str(dict_operation),
             }
         ]
 
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+import aiomqtt
+
+from qolsys_controller.errors import QolsysConfigError
+
+LOGGER = logging.getLogger(__name__)
+
+MQTT_INGRESS_OVERFLOW_POLICIES = ["block", "drop_oldest", "drop_newest"]
+
+
+class QolsysStageStats:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+
+
+class QolsysMqttIngressQueue:
+    """Bounded queue between the MQTT reader stage and the apply stage.
+
+    The reader only receives and timestamps messages. When the queue is full, overflow_policy decides:
+    - block: the message is held until the apply stage frees a slot (nothing lost). The reader keeps
+      reading so command responses, which bypass the queue, never wait behind dbChanged traffic
+    - drop_oldest: the oldest queued message is discarded
+    - drop_newest: the incoming message is discarded
+    Dropping dbChanged messages desynchronizes the local database until the next full sync.
+
+    Messages are numbered on arrival. Command responses bypass the queue, so a database snapshot can
+    be received while older messages are still queued: mark_snapshot() records the last arrival and
+    those messages, already reflected in the snapshot, are discarded instead of reverting it.
+    """
+
+    def __init__(self, maxsize: int = 1000, overflow_policy: str = "block") -> None:
+        if overflow_policy not in MQTT_INGRESS_OVERFLOW_POLICIES:
+            msg = f"Invalid MQTT ingress overflow policy: {overflow_policy}"
+            raise QolsysConfigError(msg)
+
+        self._queue: asyncio.Queue[tuple[float, int, aiomqtt.Message]] = asyncio.Queue(maxsize=maxsize)
+        self._overflow_policy = overflow_policy
+        self._held: deque[tuple[float, int, aiomqtt.Message]] = deque()  # block policy, moved to the queue in order
+
+        self._received: int = 0
+        self._fast_path: int = 0
+        self._dropped: int = 0
+        self._superseded: int = 0
+        self._sequence: int = 0  # arrival sequence of the last queued message
+        self._snapshot_sequence: int = 0  # messages up to this sequence are reflected in the last snapshot
+        self._max_depth: int = 0
+        self._max_held: int = 0
+        self._queue_wait = QolsysStageStats()
+        self._apply = QolsysStageStats()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() + len(self._held)
+
+    async def put(self, message: aiomqtt.Message) -> None:
+        self._received += 1
+        self._sequence += 1
+        item = (time.monotonic(), self._sequence, message)
+
+        if self._queue.full():
+            match self._overflow_policy:
+                case "drop_oldest":
+                    self._queue.get_nowait()
+                    self._dropped += 1
+                    LOGGER.debug("MQTT ingress queue full, dropping oldest message")
+                case "drop_newest":
+                    self._dropped += 1
+                    LOGGER.debug("MQTT ingress queue full, dropping message on topic %s", message.topic)
+                    return
+
+        if self._overflow_policy == "block" and (self._held or self._queue.full()):
+            self._held.append(item)
+            self._max_held = max(self._max_held, len(self._held))
+        else:
+            self._queue.put_nowait(item)
+        self._max_depth = max(self._max_depth, self.depth)
+
+    async def get(self) -> aiomqtt.Message:
+        _, message = await self.get_with_sequence()
+        return message
+
+    async def get_with_sequence(self) -> tuple[int, aiomqtt.Message]:
+        # Next message not superseded by a snapshot, with its arrival sequence
+        while True:
+            received, sequence, message = await self._queue.get()
+            if self._held:
+                self._queue.put_nowait(self._held.popleft())
+            self._queue_wait.record(time.monotonic() - received)
+            if not self.superseded(sequence):
+                return sequence, message
+
+            self._superseded += 1
+            LOGGER.debug("MQTT ingress queue, discarding message on topic %s received before snapshot", message.topic)
+
+    def mark_snapshot(self) -> None:
+        # A database snapshot was received: every message queued so far is reflected in it
+        self._snapshot_sequence = self._sequence
+
+    def superseded(self, sequence: int) -> bool:
+        return sequence <= self._snapshot_sequence
+
+    def record_fast_path(self) -> None:
+        self._fast_path += 1
+
+    def record_apply(self, elapsed: float) -> None:
+        self._apply.record(elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "reader": {"received": self._received, "fast_path": self._fast_path},
+            "queue": {
+                "depth": self.depth,
+                "max_depth": self._max_depth,
+                "maxsize": self._queue.maxsize,
+                "overflow_policy": self._overflow_policy,
+                "dropped": self._dropped,
+                "held": len(self._held),
+                "max_held": self._max_held,
+                "superseded": self._superseded,
+                "wait": self._queue_wait.to_dict(),
+            },
+            "apply": self._apply.to_dict(),
+        }
@@ -25,6 +25,7 @@ class QolsysObservable:
         self._observers: dict[QolsysNotification, list[Callback]] = {}
         self._batch_update_active = False
         self._batch_update_data: dict[QolsysNotification, dict[str, Any]] = {}
+        self._notification_count = 0
 
     def register(self, notification: QolsysNotification, callback: Callback) -> None:
         callbacks = self._observers.setdefault(notification, [])
@@ -61,6 +62,7 @@ class QolsysObservable:
 
     def notify(self, event: Event) -> None:
         notification = event.type
+        self._notification_count += 1
 
         if self._batch_update_active:
             event_dict = self._batch_update_data.get(notification, {}).copy()
@@ -70,6 +72,11 @@ class QolsysObservable:
             for callback in self._observers.get(notification, []):
                 self._call_callback(callback, event)
 
+    @property
+    def notification_count(self) -> int:
+        # Notifications sent or batched since creation, setters notify only when a value changes
+        return self._notification_count
+
     def start_batch_update(self) -> None:
         self._batch_update_data.clear()
         self._batch_update_active = True
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from qolsys_controller.automation.device import QolsysAutomationDevice
@@ -15,6 +19,8 @@ from qolsys_controller.errors import QolsysConfigError
 from qolsys_controller.observable import Event
 
 from .database.db import QolsysDB
+from .database.diff import QolsysTableDiff, TableSnapshot
+from .database.table import QolsysTable
 from .enum_qolsys import (
     AutomationDeviceProtocol,
     PartitionAlarmState,
@@ -24,6 +30,7 @@ from .enum_qolsys import (
     QolsysNotification,
     QolsysPanelType,
 )
+from .iq2meid_coalescer import QolsysIq2meidCoalescer
 from .partition import QolsysPartition
 from .scene import QolsysScene
 from .users import QolsysUser
@@ -35,11 +42,22 @@ LOGGER = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from qolsys_controller.controller import QolsysController
 
+Iq2meidHandler = Callable[[dict[str, Any]], None]
+
+IQ2MEID_DB_OPERATIONS = {"update": "updating", "delete": "deleting", "insert": "inserting"}
+
 
 class QolsysPanel:
     def __init__(self, controller: QolsysController) -> None:
         self._controller = controller
+        # Created with the default backend, the database_backend setting is applied on the first load
         self._db = QolsysDB()
+        self._iq2meid_handlers: dict[tuple[str, str], Iq2meidHandler] = {}
+        self._iq2meid_pending: list[dict[str, Any]] | None = None
+        self._database_loaded: bool = False
+        self._zwave_refresh_pending: bool = False
+        self._iq2meid_coalescer = QolsysIq2meidCoalescer(self._dispatch_db_changed)
+        self._build_iq2meid_handlers()
 
         # Partition settings
         self.settings_partition = ["SYSTEM_STATUS", "EXIT_SOUNDS", "ENTRY_DELAYS", "SYSTEM_STATUS_CHANGED_TIME"]
@@ -123,6 +141,10 @@ class QolsysPanel:
     def db(self) -> QolsysDB:
         return self._db
 
+    @property
+    def iq2meid_coalescer(self) -> QolsysIq2meidCoalescer:
+        return self._iq2meid_coalescer
+
     @property
     def PANEL_TAMPER_STATE(self) -> str:
         self._PANEL_TAMPER_STATE = self.db.get_setting_panel("PANEL_TAMPER_STATE")
@@ -341,18 +363,90 @@ class QolsysPanel:
         self._PANEL_SCENES_SETTING = self.db.get_setting_panel("PANEL_SCENES_SETTING")
         return self.PANEL_SCENES_SETTING
 
-    async def load_database(self, database: Any | None) -> None:
-        self.db.load_db(database)
-        self._controller.state.sync_partitions_data(self.get_partitions_from_db())
-        self._controller.state.sync_zones_data(self.get_zones_from_db())
-        self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-        self._controller.state.sync_scenes_data(self.get_scenes_from_db())
-        self._controller.state.sync_weather_data(self.get_weather_from_db())
-
-        LOGGER.debug("sync_data - update automation devices z-wave devices states")
-        for autdev in self._controller.state.automation_devices:
-            if isinstance(autdev, QolsysAutomationDeviceZwave):
-                await autdev.zwave_report()
+    @property
+    def database_loaded(self) -> bool:
+        return self._database_loaded
+
+    async def load_database(self, database: Any | None, refresh_zwave: bool = True) -> None:
+        # refresh_zwave: request the live state of Z-Wave devices, disabled when the panel is not connected (warm start)
+        self._iq2meid_coalescer.flush()
+        rows = sum(len(table.get("resultSet") or []) for table in database) if database else 0
+        start = time.perf_counter()
+
+        # Resync after a reconnect: diff the new snapshot against the current tables by primary key
+        # and only apply inserted/changed/deleted rows to the domain objects
+        snapshot = None
+        if self._database_loaded and self._controller.settings.incremental_resync:
+            snapshot = self.db.snapshot(self._resync_tables())
+        diff: dict[str, QolsysTableDiff] | None = None
+
+        if rows >= self._controller.settings.sync_database_thread_threshold:
+            # Build a fresh database in a worker thread, readers keep using the current one meanwhile.
+            # dbChanged messages received during the load are replayed on top of the new snapshot.
+            self._iq2meid_pending = []
+            try:
+                if snapshot is None:
+                    loaded_db = await asyncio.to_thread(self._load_db_worker, self._new_db(), database)
+                else:
+                    loaded_db, diff = await asyncio.to_thread(self._resync_db_worker, self._new_db(), database, snapshot)
+            finally:
+                pending = self._iq2meid_pending
+                self._iq2meid_pending = None
+
+            worker_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            self.db.adopt(loaded_db)
+            for message in pending:
+                self.parse_iq2meid_message(message)
+
+            LOGGER.debug(
+                "sync_data - loaded %d rows in worker thread in %.1f ms, replayed %d dbChanged messages",
+                rows,
+                worker_ms,
+                len(pending),
+            )
+        elif snapshot is not None:
+            loaded_db, diff = self._resync_db_worker(self._new_db(), database, snapshot)
+            self.db.adopt(loaded_db)
+        elif self.db.backend != self._controller.settings.database_backend:
+            # database_backend setting changed since the current database was created
+            self.db.adopt(self._load_db_worker(self._new_db(), database))
+        else:
+            self._configure_db(self.db)
+            self.db.load_db(database)
+
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            report = self.db.memory_report()
+            LOGGER.debug("sync_data - database holds %d rows, %d bytes", report["rows"], report["bytes"])
+
+        self._database_loaded = True
+
+        if diff is None:
+            self._controller.state.sync_partitions_data(self.get_partitions_from_db())
+            self._controller.state.sync_zones_data(self.get_zones_from_db())
+            self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
+            self._controller.state.sync_scenes_data(self.get_scenes_from_db())
+            self._controller.state.sync_weather_data(self.get_weather_from_db())
+            zwave_report_ids = None
+        else:
+            zwave_report_ids = self._apply_database_diff(diff)
+
+        LOGGER.debug("sync_data - event loop blocked %.1f ms applying %d rows", (time.perf_counter() - start) * 1000, rows)
+
+        if not refresh_zwave:
+            # Every Z-Wave device is refreshed on the next load, not only the changed ones
+            self._zwave_refresh_pending = True
+        else:
+            if self._zwave_refresh_pending:
+                zwave_report_ids = None
+                self._zwave_refresh_pending = False
+
+            LOGGER.debug("sync_data - update automation devices z-wave devices states")
+            for autdev in self._controller.state.automation_devices:
+                if isinstance(autdev, QolsysAutomationDeviceZwave):
+                    if zwave_report_ids is not None and autdev.virtual_node_id not in zwave_report_ids:
+                        continue
+                    await autdev.zwave_report()
 
         # Validate all local user match a Qolsys Panel user
         qolsys_users = self.db.get_users()
@@ -382,24 +476,307 @@ class QolsysPanel:
                 LOGGER.debug("Found matching zone_id: %s", self._controller._zone_id)
                 break
 
+    def _new_db(self) -> QolsysDB:
+        # Empty database with the current settings, loaded by a worker and then adopted
+        db = QolsysDB(self._controller.settings.database_backend)
+        self._configure_db(db)
+        return db
+
+    def open_database_file(self, path: Path) -> QolsysDB:
+        # Database file with the current settings, opened and validated in a worker thread, then adopted
+        db = QolsysDB("sqlite", path)
+        self._configure_db(db)
+        return db
+
+    def _configure_db(self, db: QolsysDB) -> None:
+        settings = self._controller.settings
+        db.configure(settings.database_retention, settings.database_ignore_tables, settings.database_change_log_size)
+
+    @staticmethod
+    def _load_db_worker(db: QolsysDB, database: Any) -> QolsysDB:
+        db.load_db(database)
+        return db
+
+    @staticmethod
+    def _resync_db_worker(
+        db: QolsysDB, database: Any, snapshot: dict[str, TableSnapshot]
+    ) -> tuple[QolsysDB, dict[str, QolsysTableDiff]]:
+        QolsysPanel._load_db_worker(db, database)
+        return db, db.diff(snapshot)
+
+    def _resync_tables(self) -> list[QolsysTable]:
+        # Tables backing domain objects, the other tables (history, events, ...) are only reloaded
+        db = self.db
+        return [
+            db.table_partition,
+            db.table_qolsyssettings,
+            db.table_state,
+            db.table_alarmedsensor,
+            db.table_sensor,
+            db.table_powerg_device,
+            db.table_automation,
+            db.table_virtual_device,
+            db.table_zwave_node,
+            db.table_doorlock,
+            db.table_dimmer,
+            db.table_thermostat,
+            db.table_zwave_other,
+            db.table_scene,
+            db.table_weather,
+        ]
+
+    def _apply_database_diff(self, diff: dict[str, QolsysTableDiff]) -> set[str]:
+        # Sync only the domain objects backed by changed tables, returns the Z-Wave nodes needing a zwave_report
+        db = self.db
+        state = self._controller.state
+
+        def changed_values(tables: list[QolsysTable], column: str) -> set[str]:
+            values: set[str] = set()
+            for table in tables:
+                if table.table in diff:
+                    values |= diff[table.table].values(column)
+            return values
+
+        def changed(tables: list[QolsysTable]) -> bool:
+            return any(table.table in diff for table in tables)
+
+        for table_diff in diff.values():
+            LOGGER.debug(
+                "sync_data - resync %s: %d inserted, %d changed, %d deleted",
+                table_diff.table,
+                len(table_diff.inserted),
+                len(table_diff.changed),
+                len(table_diff.deleted),
+            )
+
+        if changed([db.table_partition, db.table_qolsyssettings, db.table_state, db.table_alarmedsensor]):
+            state.sync_partitions_data(self.get_partitions_from_db())
+
+        if changed([db.table_sensor, db.table_powerg_device]):
+            zone_ids = changed_values([db.table_sensor], "zoneid")
+            short_ids = changed_values([db.table_powerg_device], "shortID")
+            zone_ids |= {zone.zone_id for zone in state.zones if zone.shortID in short_ids}
+            state.sync_zones_data(self.get_zones_from_db(), changed_ids=zone_ids)
+
+        zwave_tables = [db.table_zwave_node, db.table_doorlock, db.table_dimmer, db.table_thermostat, db.table_zwave_other]
+        node_ids = changed_values([db.table_automation], "virtual_node_id")
+        node_ids |= changed_values(zwave_tables, "node_id")
+        node_ids |= changed_values([db.table_virtual_device], "device_id")
+        if changed([db.table_automation, db.table_virtual_device, *zwave_tables]):
+            state.sync_automation_devices_data(self.get_automation_devices_from_db(), changed_ids=node_ids)
+
+        if changed([db.table_scene]):
+            state.sync_scenes_data(self.get_scenes_from_db())
+
+        if changed([db.table_weather]):
+            state.sync_weather_data(self.get_weather_from_db())
+
+        LOGGER.debug(
+            "sync_data - resync applied %d changed rows from %d tables",
+            sum(table_diff.count for table_diff in diff.values()),
+            len(diff),
+        )
+        return node_ids
+
     # Parse Z-Wave message
     def parse_zwave_message(self, data: dict[str, Any]) -> None:
         zwave = data.get("ZWAVE_RESPONSE", "")
-        payload = base64.b64decode(zwave.get("ZWAVE_PAYLOAD", "")).hex()
         node_id: str = str(zwave.get("NODE_ID", 0))
 
         # Update Atomation Device Z-Wave Service with raw payload
         automation_device = self._controller.state.automation_device(node_id)
         if isinstance(automation_device, QolsysAutomationDeviceZwave):
-            automation_device.update_raw(bytes.fromhex(payload))
+            payload = base64.b64decode(zwave.get("ZWAVE_PAYLOAD", ""))
+            automation_device.update_raw(memoryview(payload))
+
+    def _dispatch_db_changed(self, data: dict[str, Any]) -> None:
+        dbOperation = data.get("dbOperation", "")
+        uri = data.get("uri", "")
+        handler = self._iq2meid_handlers.get((dbOperation, uri))
+
+        if handler is not None:
+            with self.db.transaction():
+                handler(data)
+
+        elif dbOperation in IQ2MEID_DB_OPERATIONS:
+            LOGGER.debug("iq2meid %s unknown uri:%s", IQ2MEID_DB_OPERATIONS[dbOperation], uri)
+            LOGGER.debug(data)
+
+        else:
+            LOGGER.debug("iq2meid - Unknow dboperation: %s", dbOperation)
+            LOGGER.debug(data)
+
+    def register_iq2meid_handler(self, db_operation: str, uri: str, handler: Iq2meidHandler) -> None:
+        self._iq2meid_handlers[(db_operation, uri)] = handler
+
+    def _build_iq2meid_handlers(self) -> None:
+        # dbChanged dispatch table: (dbOperation, uri) -> handler, one dict lookup per message
+        self._iq2meid_handlers = {}
+        db = self.db
+
+        # Update
+        self.register_iq2meid_handler("update", db.table_qolsyssettings.uri, self._update_qolsyssettings)
+        self.register_iq2meid_handler("update", db.table_sensor.uri, self._update_sensor)
+        self.register_iq2meid_handler("update", db.table_state.uri, self._update_state)
+        self.register_iq2meid_handler("update", db.table_partition.uri, self._update_partition)
+        self.register_iq2meid_handler("update", db.table_zwave_node.uri, self._update_zwave_node)
+        self.register_iq2meid_handler("update", db.table_automation.uri, self._update_automation)
+        self.register_iq2meid_handler("update", db.table_scene.uri, self._update_scene)
+        self.register_iq2meid_handler("update", db.table_powerg_device.uri, self._update_powerg_device)
+        self.register_iq2meid_handler("update", db.table_virtual_device.uri, self._update_virtual_device)
+        self.register_iq2meid_handler(
+            "update", db.table_weather.uri, self._db_update_handler(db.table_weather, self._sync_weather)
+        )
+
+        for table in [
+            db.table_heat_map,
+            db.table_master_slave,
+            db.table_dashboard_msgs,
+            db.table_history,
+            db.table_dimmer,
+            db.table_thermostat,
+            db.table_doorlock,
+            db.table_zwave_history,
+            db.table_alarmedsensor,
+            db.table_iqremotesettings,
+            db.table_trouble_conditions,
+            db.table_eu_event,
+            db.table_zwave_association_goup,
+            db.table_zwave_other,
+            db.table_country_locale,
+            db.table_output_rules,
+        ]:
+            self.register_iq2meid_handler("update", table.uri, self._db_update_handler(table))
+
+        # Delete
+        self.register_iq2meid_handler(
+            "delete", db.table_sensor.uri, self._db_delete_handler(db.table_sensor, self._sync_zones)
+        )
+        self.register_iq2meid_handler(
+            "delete", db.table_weather.uri, self._db_delete_handler(db.table_weather, self._sync_weather)
+        )
+
+        for table in [db.table_alarmedsensor, db.table_partition]:
+            self.register_iq2meid_handler("delete", table.uri, self._db_delete_handler(table, self._sync_partitions))
+
+        for table in [
+            db.table_doorlock,
+            db.table_dimmer,
+            db.table_thermostat,
+            db.table_zwave_node,
+            db.table_automation,
+            db.table_virtual_device,
+            db.table_zwave_other,
+        ]:
+            self.register_iq2meid_handler("delete", table.uri, self._db_delete_handler(table, self._sync_automation_devices))
+
+        for table in [
+            db.table_iqremotesettings,
+            db.table_state,
+            db.table_master_slave,
+            db.table_qolsyssettings,
+            db.table_history,
+            db.table_zwave_history,
+            db.table_user,
+            db.table_dashboard_msgs,
+            db.table_eu_event,
+            db.table_powerg_device,
+            db.table_zwave_association_goup,
+            db.table_output_rules,
+        ]:
+            self.register_iq2meid_handler("delete", table.uri, self._db_delete_handler(table))
+
+        # Insert
+        self.register_iq2meid_handler("insert", db.table_state.uri, self._insert_state)
+        self.register_iq2meid_handler("insert", db.table_qolsyssettings.uri, self._insert_qolsyssettings)
+        self.register_iq2meid_handler("insert", db.table_alarmedsensor.uri, self._insert_alarmedsensor)
+        self.register_iq2meid_handler(
+            "insert", db.table_partition.uri, self._db_insert_handler(db.table_partition, self._sync_partitions)
+        )
+        self.register_iq2meid_handler(
+            "insert", db.table_sensor.uri, self._db_insert_handler(db.table_sensor, self._sync_zones)
+        )
+        self.register_iq2meid_handler(
+            "insert", db.table_weather.uri, self._db_insert_handler(db.table_weather, self._sync_weather)
+        )
+
+        for table in [
+            db.table_doorlock,
+            db.table_dimmer,
+            db.table_thermostat,
+            db.table_zwave_node,
+            db.table_zwave_other,
+            db.table_virtual_device,
+        ]:
+            self.register_iq2meid_handler("insert", table.uri, self._db_insert_handler(table, self._sync_automation_devices))
+
+        for table in [
+            db.table_user,
+            db.table_master_slave,
+            db.table_automation,
+            db.table_history,
+            db.table_iqremotesettings,
+            db.table_heat_map,
+            db.table_zwave_history,
+            db.table_dashboard_msgs,
+            db.table_eu_event,
+            db.table_powerg_device,
+            db.table_zwave_association_goup,
+            db.table_output_rules,
+        ]:
+            self.register_iq2meid_handler("insert", table.uri, self._db_insert_handler(table))
+
+    @staticmethod
+    def _db_update_handler(table: QolsysTable, then: Callable[[], None] | None = None) -> Iq2meidHandler:
+        def handler(data: dict[str, Any]) -> None:
+            changed = table.update(data.get("selection"), data.get("selectionArgs"), data.get("contentValues", ""))
+            if changed and then is not None:
+                then()
+
+        return handler
+
+    @staticmethod
+    def _db_delete_handler(table: QolsysTable, then: Callable[[], None] | None = None) -> Iq2meidHandler:
+        def handler(data: dict[str, Any]) -> None:
+            table.delete(data.get("selection"), data.get("selectionArgs"))
+            if then is not None:
+                then()
+
+        return handler
+
+    @staticmethod
+    def _db_insert_handler(table: QolsysTable, then: Callable[[], None] | None = None) -> Iq2meidHandler:
+        def handler(data: dict[str, Any]) -> None:
+            table.insert(data=data.get("contentValues", {}))
+            if then is not None:
+                then()
+
+        return handler
+
+    def _sync_zones(self) -> None:
+        self._controller.state.sync_zones_data(self.get_zones_from_db())
+
+    def _sync_partitions(self) -> None:
+        self._controller.state.sync_partitions_data(self.get_partitions_from_db())
+
+    def _sync_automation_devices(self) -> None:
+        self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
+
+    def _sync_weather(self) -> None:
+        self._controller.state.sync_weather_data(self.get_weather_from_db())
 
     # Parse panel update to database
-    def parse_iq2meid_message(self, data: dict[str, Any]) -> None:  # noqa: C901, PLR0912, PLR0915
+    def parse_iq2meid_message(self, data: dict[str, Any]) -> None:
         eventName = data.get("eventName")
-        dbOperation = data.get("dbOperation", "")
-        uri = data.get("uri")
 
         match eventName:
+            case "dbChanged":
+                if self._iq2meid_pending is not None:
+                    self._iq2meid_pending.append(data)
+                    return
+
+                self._iq2meid_coalescer.submit(data, self._controller.settings.iq2meid_coalesce_window_ms)
+
             case "stopScreenCapture":
                 pass
 
@@ -414,463 +791,204 @@ class QolsysPanel:
                 LOGGER.debug("Chime Event: %s", json.dumps(data))
                 self._controller.state.notify(Event(QolsysNotification.PANEL_CHIME, self, data))
 
-            case "dbChanged":
-                match dbOperation:
-                    case "update":
-                        content_values = data.get("contentValues", "")
-                        selection = data.get("selection")
-                        selection_argument = data.get("selectionArgs")
-
-                        match uri:
-                            # Update Settings Content Provider
-                            case self.db.table_qolsyssettings.uri:
-                                name = content_values.get("name", "")
-                                new_value = content_values.get("value", "")
-                                old_value = self.db.get_setting_panel(name)
-                                self.db.table_qolsyssettings.update(selection, selection_argument, content_values)
-
-                                # Update Panel Settings - Send notification if settings ha changed
-                                if name in self.settings_panel and old_value != new_value:
-                                    LOGGER.debug("Panel Setting - %s: %s", name, new_value)
-                                    self._controller.state.notify(
-                                        Event(QolsysNotification.PANEL_SETTINGS_UPDATE, self, self.to_event_dict())
-                                    )
-
-                                # Update Partition setting - Send notification if setting has changed
-                                if name in self.settings_partition:
-                                    partition_id = content_values.get("partition_id", "")
-                                    partition = self._controller.state.partition(partition_id)
-                                    if partition is not None:
-                                        match name:
-                                            case "SYSTEM_STATUS":
-                                                partition.system_status = PartitionSystemStatus(new_value)
-                                            case "SYSTEM_STATUS_CHANGED_TIME":
-                                                partition.system_status_changed_time = new_value
-                                            case "EXIT_SOUNDS":
-                                                partition.exit_sounds = new_value
-                                            case "ENTRY_DELAYS":
-                                                partition.entry_delays = new_value
-
-                            # Update Sensor Content Provider
-                            case self.db.table_sensor.uri:
-                                self.db.table_sensor.update(selection, selection_argument, content_values)
-                                zoneid = content_values.get("zoneid", "")
-                                zone = self._controller.state.zone(zone_id=zoneid)
-                                if zone is not None:
-                                    zone.update(content_values)
-
-                            # Update State
-                            case self.db.table_state.uri:
-                                name = content_values.get("name", "")
-                                new_value = content_values.get("value", "")
-                                partition_id = content_values.get("partition_id", "")
-                                self.db.table_state.update(selection, selection_argument, content_values)
-
-                                if name in self.state_partition:
-                                    partition = self._controller.state.partition(partition_id)
-                                    if partition is not None:
-                                        match name:
-                                            case "ALARM_STATE":
-                                                partition.alarm_state = PartitionAlarmState(new_value)
-                                            case "QUICK_EXIT_STATE":
-                                                delay = 0
-                                                start_time = 0
-                                                extra = content_values.get("extraparams", "")
-                                                if extra:
-                                                    try:
-                                                        extra_json = json.loads(extra)
-                                                        delay = int(extra_json.get("delayPageTime", 0) or 0)
-                                                        start_time = int(extra_json.get("stateChangeTime", 0) or 0)
-                                                    except (ValueError, TypeError, json.JSONDecodeError):
-                                                        pass
-                                                try:
-                                                    partition.quick_exit_state = PartitionQuickExitState(new_value)
-                                                    partition.quick_exit_delay = delay
-                                                    partition.quick_exit_start_time = start_time
-                                                except ValueError:
-                                                    LOGGER.error(
-                                                        "Partition%s (%s) - Invalid quick_exit_state: %s",
-                                                        partition._id,
-                                                        partition._name,
-                                                        new_value,
-                                                    )
-
-                            # Update heat_map
-                            case self.db.table_heat_map.uri:
-                                self.db.table_heat_map.update(selection, selection_argument, content_values)
-
-                            # Update master_slave
-                            case self.db.table_master_slave.uri:
-                                self.db.table_master_slave.update(selection, selection_argument, content_values)
-
-                            # Update dashboard_msgs
-                            case self.db.table_dashboard_msgs.uri:
-                                self.db.table_dashboard_msgs.update(selection, selection_argument, content_values)
-
-                            # Update PartitionContentProvider
-                            case self.db.table_partition.uri:
-                                self.db.table_partition.update(selection, selection_argument, content_values)
-                                partition_id = content_values.get("partition_id", "")
-                                partition = self._controller.state.partition(partition_id)
-                                if partition is not None:
-                                    partition.update_partition(content_values)
-
-                            # Update History Content Provider
-                            case self.db.table_history.uri:
-                                self.db.table_history.update(selection, selection_argument, content_values)
-
-                            # Update DimmerLightsContentProvider
-                            case self.db.table_dimmer.uri:
-                                self.db.table_dimmer.update(selection, selection_argument, content_values)
-                                node_id = content_values.get("node_id", "")
-
-                            # Update Thermostat Content Provider
-                            case self.db.table_thermostat.uri:
-                                self.db.table_thermostat.update(selection, selection_argument, content_values)
-                                node_id = content_values.get("node_id", "")
-
-                            # Update DoorLockContentProvider
-                            case self.db.table_doorlock.uri:
-                                self.db.table_doorlock.update(selection, selection_argument, content_values)
-                                node_id = content_values.get("node_id", "")
-
-                            # Update ZwaveContentProvider
-                            case self.db.table_zwave_node.uri:
-                                self.db.table_zwave_node.update(selection, selection_argument, content_values)
-                                node_id = content_values.get("node_id", "")
-
-                                # Update Automation Device if exist
-                                automation_device = self._controller.state.automation_device(node_id)
-                                if isinstance(automation_device, QolsysAutomationDeviceZwave):
-                                    automation_device.update_zwave_device(content_values)
-
-                            # Update Z-Wave History Content Provier
-                            case self.db.table_zwave_history.uri:
-                                self.db.table_zwave_history.update(selection, selection_argument, content_values)
-
-                            # Update AutomationDeviceContentProvider
-                            case self.db.table_automation.uri:
-                                self.db.table_automation.update(selection, selection_argument, content_values)
-                                virtual_node_id = content_values.get("virtual_node_id", "")
-                                automation_device = self._controller.state.automation_device(virtual_node_id)
-                                if automation_device is not None:
-                                    automation_device.update_automation_device(content_values)
-
-                            # Update Alarmed Sensor Content Provider
-                            case self.db.table_alarmedsensor.uri:
-                                self.db.table_alarmedsensor.update(selection, selection_argument, content_values)
-
-                            # Update IQ Remote Settings Content Provider
-                            case self.db.table_iqremotesettings.uri:
-                                self.db.table_iqremotesettings.update(selection, selection_argument, content_values)
-
-                            # Update Scene Content Provider
-                            case self.db.table_scene.uri:
-                                self.db.table_scene.update(selection, selection_argument, content_values)
-                                scene_id = content_values.get("scene_id", "")
-                                scene = self._controller.state.scene(scene_id)
-                                if scene is not None and isinstance(scene, QolsysScene):
-                                    scene.update(content_values)
-
-                            # Update Trouble Conditions
-                            case self.db.table_trouble_conditions.uri:
-                                self.db.table_trouble_conditions.update(selection, selection_argument, content_values)
-
-                            # Update EU_EVENT:
-                            case self.db.table_eu_event.uri:
-                                self.db.table_eu_event.update(selection, selection_argument, content_values)
-
-                            # Update PowerG Device
-                            case self.db.table_powerg_device.uri:
-                                self.db.table_powerg_device.update(selection, selection_argument, content_values)
-                                short_id = content_values.get("shortID", "")
-                                zone = self._controller.state.zone_from_short_id(short_id)
-                                if zone is not None:
-                                    zone.update_powerg(content_values)
-
-                            # Update Weather
-                            case self.db.table_weather.uri:
-                                self.db.table_weather.update(selection, selection_argument, content_values)
-                                self._controller.state.sync_weather_data(self.get_weather_from_db())
-
-                            # Update Zwave Association Group
-                            case self.db.table_zwave_association_goup.uri:
-                                self.db.table_zwave_association_goup.update(selection, selection_argument, content_values)
-
-                            # Update Zwave Other
-                            case self.db.table_zwave_other.uri:
-                                self.db.table_zwave_other.update(selection, selection_argument, content_values)
-
-                            # Country Locale
-                            case self.db.table_country_locale.uri:
-                                self.db.table_country_locale.update(selection, selection_argument, content_values)
-
-                            # Virtual device
-                            case self.db.table_virtual_device.uri:
-                                self.db.table_virtual_device.update(selection, selection_argument, content_values)
-
-                                # Update ADC devices in automation devices list
-                                virtual_node_id = content_values.get("device_id", "")
-                                automation_device = self._controller.state.automation_device(virtual_node_id)
-                                if isinstance(automation_device, QolsysAutomationDeviceADC):
-                                    automation_device.update_adc_device(content_values)
-
-                            # Output Rules
-                            case self.db.table_output_rules.uri:
-                                self.db.table_output_rules.update(selection, selection_argument, content_values)
-
-                            case _:
-                                LOGGER.debug("iq2meid updating unknow uri:%s", uri)
-                                LOGGER.debug(data)
-
-                    case "delete":
-                        selection = data.get("selection")
-                        selection_argument = data.get("selectionArgs")
-
-                        match uri:
-                            case self.db.table_sensor.uri:
-                                self.db.table_sensor.delete(selection, selection_argument)
-                                self._controller.state.sync_zones_data(self.get_zones_from_db())
-
-                            case self.db.table_iqremotesettings.uri:
-                                self.db.table_iqremotesettings.delete(selection, selection_argument)
-
-                            case self.db.table_state.uri:
-                                self.db.table_state.delete(selection, selection_argument)
-
-                            case self.db.table_master_slave.uri:
-                                self.db.table_master_slave.delete(selection, selection_argument)
-
-                            case self.db.table_qolsyssettings.uri:
-                                self.db.table_qolsyssettings.delete(selection, selection_argument)
-
-                            case self.db.table_alarmedsensor.uri:
-                                self.db.table_alarmedsensor.delete(selection, selection_argument)
-                                self._controller.state.sync_partitions_data(self.get_partitions_from_db())
-
-                            case self.db.table_history.uri:
-                                self.db.table_history.delete(selection, selection_argument)
-
-                            case self.db.table_zwave_history.uri:
-                                self.db.table_zwave_history.delete(selection, selection_argument)
-
-                            case self.db.table_doorlock.uri:
-                                self.db.table_doorlock.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_dimmer.uri:
-                                self.db.table_dimmer.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_thermostat.uri:
-                                self.db.table_thermostat.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_zwave_node.uri:
-                                self.db.table_zwave_node.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_automation.uri:
-                                self.db.table_automation.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_partition.uri:
-                                self.db.table_partition.delete(selection, selection_argument)
-                                self._controller.state.sync_partitions_data(self.get_partitions_from_db())
-
-                            case self.db.table_user.uri:
-                                self.db.table_user.delete(selection, selection_argument)
-
-                            case self.db.table_dashboard_msgs.uri:
-                                self.db.table_dashboard_msgs.delete(selection, selection_argument)
-
-                            case self.db.table_eu_event.uri:
-                                self.db.table_eu_event.delete(selection, selection_argument)
-
-                            case self.db.table_powerg_device.uri:
-                                self.db.table_powerg_device.delete(selection, selection_argument)
-
-                            case self.db.table_weather.uri:
-                                self.db.table_weather.delete(selection, selection_argument)
-                                self._controller.state.sync_weather_data(self.get_weather_from_db())
-
-                            case self.db.table_zwave_association_goup.uri:
-                                self.db.table_zwave_association_goup.delete(selection, selection_argument)
-
-                            case self.db.table_virtual_device.uri:
-                                self.db.table_virtual_device.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_zwave_other.uri:
-                                self.db.table_zwave_other.delete(selection, selection_argument)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            case self.db.table_output_rules.uri:
-                                self.db.table_output_rules.delete(selection, selection_argument)
-
-                            case _:
-                                LOGGER.debug("iq2meid deleting unknown uri:%s", uri)
-                                LOGGER.debug(data)
-
-                    case "insert":
-                        content_values = data.get("contentValues", {})
-
-                        match uri:
-                            # Inser State Content Provider
-                            case self.db.table_state.uri:
-                                self.db.table_state.insert(data=content_values)
-
-                                name = content_values.get("name", "")
-                                new_value = content_values.get("value", "")
-                                if name in self.state_partition:
-                                    partition_id = content_values.get("partition_id", "")
-                                    partition = self._controller.state.partition(partition_id)
-                                    if partition is not None:
-                                        match name:
-                                            case "ALARM_STATE":
-                                                partition.alarm_state = PartitionAlarmState(new_value)
-
-                            # Inser Partition Content Provider
-                            case self.db.table_partition.uri:
-                                self.db.table_partition.insert(data=content_values)
-                                self._controller.state.sync_partitions_data(self.get_partitions_from_db())
-
-                            # Insert Settings Content Provider
-                            case self.db.table_qolsyssettings.uri:
-                                self.db.table_qolsyssettings.insert(data=content_values)
-                                # Update Partition setting - Send notification if setting has changed
-                                name = content_values.get("name", "")
-                                new_value = content_values.get("value", "")
-                                if name in self.settings_partition:
-                                    partition_id = content_values.get("partition_id", "")
-                                    partition = self._controller.state.partition(partition_id)
-                                    if partition is not None:
-                                        match name:
-                                            case "SYSTEM_STATUS":
-                                                partition.system_status = PartitionSystemStatus(new_value)
-                                            case "SYSTEM_STATUS_CHANGED_TIME":
-                                                partition.system_status_changed_time = new_value
-                                            case "EXIT_SOUNDS":
-                                                partition.exit_sounds = new_value
-                                            case "ENTRY_DELAYS":
-                                                partition.entry_delays = new_value
-
-                            # UserContentProvider
-                            case self.db.table_user.uri:
-                                self.db.table_user.insert(data=content_values)
-                                # No action needed
-
-                            # MasterSlave Content Provider
-                            case self.db.table_master_slave.uri:
-                                self.db.table_master_slave.insert(data=content_values)
-                                # No action needed
-
-                            # Automation Content Provider
-                            case self.db.table_automation.uri:
-                                self.db.table_automation.insert(content_values)
-                                # No action needed
-
-                            # Sensor Content Provider
-                            case self.db.table_sensor.uri:
-                                self.db.table_sensor.insert(data=content_values)
-                                self._controller.state.sync_zones_data(self.get_zones_from_db())
-
-                            # Door Lock Content Provider
-                            case self.db.table_doorlock.uri:
-                                self.db.table_doorlock.insert(data=content_values)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            # Dimmer Content Provider
-                            case self.db.table_dimmer.uri:
-                                self.db.table_dimmer.insert(data=content_values)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            # Thermostat Content Provider
-                            case self.db.table_thermostat.uri:
-                                self.db.table_thermostat.insert(data=content_values)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            # ZWave Node Content Provider
-                            case self.db.table_zwave_node.uri:
-                                self.db.table_zwave_node.insert(data=content_values)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            # HistoryContentProvider
-                            case self.db.table_history.uri:
-                                self.db.table_history.insert(data=content_values)
-
-                            # AlarmedSensorProvider
-                            case self.db.table_alarmedsensor.uri:
-                                partition_id = content_values.get("partition_id", "")
-                                self.db.table_alarmedsensor.insert(data=content_values)
-
-                                partition = self._controller.state.partition(partition_id)
-                                if partition is not None:
-                                    # Add new alarm type to partition
-                                    try:
-                                        partition.append_alarm_type([PartitionAlarmType(content_values.get("sgroup", ""))])
-                                    except ValueError:
-                                        LOGGER.error("PLEASE REPORT: Unknown alarm type: %s", content_values.get("sgroup", ""))
-                                        partition.append_alarm_type([PartitionAlarmType.EMPTY])
-
-                            # IQRemoteSettingsProvider
-                            case self.db.table_iqremotesettings.uri:
-                                self.db.table_iqremotesettings.insert(data=content_values)
-
-                            # HeatMapContentProvider
-                            case self.db.table_heat_map.uri:
-                                self.db.table_heat_map.insert(data=content_values)
-
-                            # ZDeviceHistoryContentProvider
-                            case self.db.table_zwave_history.uri:
-                                self.db.table_zwave_history.insert(data=content_values)
-
-                            # Dashboard Message Content Provider
-                            case self.db.table_dashboard_msgs.uri:
-                                self.db.table_dashboard_msgs.insert(data=content_values)
-
-                            # EU_EVENT
-                            case self.db.table_eu_event.uri:
-                                self.db.table_eu_event.insert(data=content_values)
-
-                            # PowerG Device
-                            case self.db.table_powerg_device.uri:
-                                self.db.table_powerg_device.insert(data=content_values)
-
-                            # Weather
-                            case self.db.table_weather.uri:
-                                self.db.table_weather.insert(data=content_values)
-                                self._controller.state.sync_weather_data(self.get_weather_from_db())
-
-                            # ZWave Association Group
-                            case self.db.table_zwave_association_goup.uri:
-                                self.db.table_zwave_association_goup.insert(data=content_values)
-
-                            # Zwave Other
-                            case self.db.table_zwave_other.uri:
-                                self.db.table_zwave_other.insert(data=content_values)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            # Virtual Device
-                            case self.db.table_virtual_device.uri:
-                                self.db.table_virtual_device.insert(data=content_values)
-                                self._controller.state.sync_automation_devices_data(self.get_automation_devices_from_db())
-
-                            # Output Rules
-                            case self.db.table_output_rules.uri:
-                                self.db.table_output_rules.insert(data=content_values)
-
-                            case _:
-                                LOGGER.debug("iq2meid inserting unknow uri:%s", uri)
-                                LOGGER.debug(data)
-
-                    case _:
-                        LOGGER.debug("iq2meid - Unknow dboperation: %s", dbOperation)
-                        LOGGER.debug(data)
             case _:
                 LOGGER.debug("iq2meid - Unknow event: %s", eventName)
                 LOGGER.debug(data)
 
+    # Update Settings Content Provider
+    def _update_qolsyssettings(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        name = content_values.get("name", "")
+        new_value = content_values.get("value", "")
+        old_value = self.db.table_qolsyssettings.get(name, content_values.get("partition_id", "0")) or ""
+        if not self.db.table_qolsyssettings.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        # Update Panel Settings - Send notification if settings ha changed
+        if name in self.settings_panel and old_value != new_value:
+            LOGGER.debug("Panel Setting - %s: %s", name, new_value)
+            self._controller.state.notify(Event(QolsysNotification.PANEL_SETTINGS_UPDATE, self, self.to_event_dict()))
+
+        # Update Partition setting - Send notification if setting has changed
+        self._update_partition_setting(content_values)
+
+    # Insert Settings Content Provider
+    def _insert_qolsyssettings(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", {})
+        self.db.table_qolsyssettings.insert(data=content_values)
+
+        # Update Partition setting - Send notification if setting has changed
+        self._update_partition_setting(content_values)
+
+    def _update_partition_setting(self, content_values: dict[str, str]) -> None:
+        name = content_values.get("name", "")
+        if name not in self.settings_partition:
+            return
+
+        new_value = content_values.get("value", "")
+        partition = self._controller.state.partition(content_values.get("partition_id", ""))
+        if partition is not None:
+            match name:
+                case "SYSTEM_STATUS":
+                    partition.system_status = PartitionSystemStatus(new_value)
+                case "SYSTEM_STATUS_CHANGED_TIME":
+                    partition.system_status_changed_time = new_value
+                case "EXIT_SOUNDS":
+                    partition.exit_sounds = new_value
+                case "ENTRY_DELAYS":
+                    partition.entry_delays = new_value
+
+    # Update Sensor Content Provider
+    def _update_sensor(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_sensor.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        zoneid = content_values.get("zoneid", "")
+        zone = self._controller.state.zone(zone_id=zoneid)
+        if zone is not None:
+            zone.update(content_values)
+
+    # Update State
+    def _update_state(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        name = content_values.get("name", "")
+        new_value = content_values.get("value", "")
+        partition_id = content_values.get("partition_id", "")
+        if not self.db.table_state.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        if name not in self.state_partition:
+            return
+
+        partition = self._controller.state.partition(partition_id)
+        if partition is None:
+            return
+
+        match name:
+            case "ALARM_STATE":
+                partition.alarm_state = PartitionAlarmState(new_value)
+            case "QUICK_EXIT_STATE":
+                delay = 0
+                start_time = 0
+                extra = content_values.get("extraparams", "")
+                if extra:
+                    try:
+                        extra_json = json.loads(extra)
+                        delay = int(extra_json.get("delayPageTime", 0) or 0)
+                        start_time = int(extra_json.get("stateChangeTime", 0) or 0)
+                    except (ValueError, TypeError, json.JSONDecodeError):
+                        pass
+                try:
+                    partition.quick_exit_state = PartitionQuickExitState(new_value)
+                    partition.quick_exit_delay = delay
+                    partition.quick_exit_start_time = start_time
+                except ValueError:
+                    LOGGER.error(
+                        "Partition%s (%s) - Invalid quick_exit_state: %s",
+                        partition._id,
+                        partition._name,
+                        new_value,
+                    )
+
+    # Inser State Content Provider
+    def _insert_state(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", {})
+        self.db.table_state.insert(data=content_values)
+
+        name = content_values.get("name", "")
+        new_value = content_values.get("value", "")
+        if name in self.state_partition:
+            partition = self._controller.state.partition(content_values.get("partition_id", ""))
+            if partition is not None:
+                match name:
+                    case "ALARM_STATE":
+                        partition.alarm_state = PartitionAlarmState(new_value)
+
+    # Update PartitionContentProvider
+    def _update_partition(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_partition.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        partition_id = content_values.get("partition_id", "")
+        partition = self._controller.state.partition(partition_id)
+        if partition is not None:
+            partition.update_partition(content_values)
+
+    # Update ZwaveContentProvider
+    def _update_zwave_node(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_zwave_node.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        node_id = content_values.get("node_id", "")
+
+        # Update Automation Device if exist
+        automation_device = self._controller.state.automation_device(node_id)
+        if isinstance(automation_device, QolsysAutomationDeviceZwave):
+            automation_device.update_zwave_device(content_values)
+
+    # Update AutomationDeviceContentProvider
+    def _update_automation(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_automation.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        virtual_node_id = content_values.get("virtual_node_id", "")
+        automation_device = self._controller.state.automation_device(virtual_node_id)
+        if automation_device is not None:
+            automation_device.update_automation_device(content_values)
+
+    # Update Scene Content Provider
+    def _update_scene(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_scene.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        scene_id = content_values.get("scene_id", "")
+        scene = self._controller.state.scene(scene_id)
+        if scene is not None and isinstance(scene, QolsysScene):
+            scene.update(content_values)
+
+    # Update PowerG Device
+    def _update_powerg_device(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_powerg_device.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        short_id = content_values.get("shortID", "")
+        zone = self._controller.state.zone_from_short_id(short_id)
+        if zone is not None:
+            zone.update_powerg(content_values)
+
+    # Virtual device
+    def _update_virtual_device(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", "")
+        if not self.db.table_virtual_device.update(data.get("selection"), data.get("selectionArgs"), content_values):
+            return
+
+        # Update ADC devices in automation devices list
+        virtual_node_id = content_values.get("device_id", "")
+        automation_device = self._controller.state.automation_device(virtual_node_id)
+        if isinstance(automation_device, QolsysAutomationDeviceADC):
+            automation_device.update_adc_device(content_values)
+
+    # AlarmedSensorProvider
+    def _insert_alarmedsensor(self, data: dict[str, Any]) -> None:
+        content_values = data.get("contentValues", {})
+        partition_id = content_values.get("partition_id", "")
+        self.db.table_alarmedsensor.insert(data=content_values)
+
+        partition = self._controller.state.partition(partition_id)
+        if partition is not None:
+            # Add new alarm type to partition
+            try:
+                partition.append_alarm_type([PartitionAlarmType(content_values.get("sgroup", ""))])
+            except ValueError:
+                LOGGER.error("PLEASE REPORT: Unknown alarm type: %s", content_values.get("sgroup", ""))
+                partition.append_alarm_type([PartitionAlarmType.EMPTY])
+
     def check_user(self, user_code: str) -> int:
         for user in self._users:
             if user.user_code == user_code:
@@ -889,6 +1007,10 @@ class QolsysPanel:
 
         automation_devices: list[QolsysAutomationDevice] = []
         devices_list = self.db.get_automation_devices()
+        zwave_devices = self.db.get_zwave_devices()
+        zwave_nodes: dict[str, dict[str, str]] = {}
+        for zwave_device in zwave_devices:
+            zwave_nodes.setdefault(zwave_device["node_id"], zwave_device)
 
         # Add all device in automation content provider table
         for device in devices_list:
@@ -905,9 +1027,11 @@ class QolsysPanel:
 
                 case AutomationDeviceProtocol.ZWAVE:
                     node_id = device.get("virtual_node_id", "")
-                    zwave_node = self.db.get_zwave_device(node_id)
+                    zwave_node = zwave_nodes.get(node_id)
                     if zwave_node is not None:
                         new_device = QolsysAutomationDeviceZwave(self._controller, zwave_node, device)
+                    else:
+                        LOGGER.debug("Zwave node_id %s not found", node_id)
 
                 case AutomationDeviceProtocol.ZIGBEE:
                     new_device = QolsysAutomationDeviceZigbee(self._controller, device)
@@ -921,7 +1045,7 @@ class QolsysPanel:
 
         # Add other Z-Wave devices that are not in automation content provider
         if AutomationDeviceProtocol.ZWAVE in allowed_protocols:
-            for zwave_device in self.db.get_zwave_devices():
+            for zwave_device in zwave_devices:
                 node_type = zwave_device.get("node_type", "")
 
                 if node_type in [
@@ -993,15 +1117,18 @@ class QolsysPanel:
     def get_zones_from_db(self) -> list[QolsysZone]:
         zones = []
         zones_list: list[dict[str, str]] = self.db.get_zones()
+        powerg_devices = self.db.get_powerg_devices()
 
         # Create sensors array
         for zone_info in zones_list:
             new_zone = QolsysZone(zone_info, self._controller.settings)
 
             if new_zone.current_capability == "POWERG":
-                powerg_dict = self.db.get_powerg(short_id=new_zone.shortID)
+                powerg_dict = powerg_devices.get(new_zone.shortID)
                 if powerg_dict is not None:
                     new_zone.update_powerg(powerg_dict)
+                else:
+                    LOGGER.debug("%s value not found", new_zone.shortID)
 
             zones.append(new_zone)
 
@@ -1010,6 +1137,7 @@ class QolsysPanel:
     def get_partitions_from_db(self) -> list[QolsysPartition]:
         partitions = []
         partition_list: list[dict[str, str]] = self.db.get_partitions()
+        alarm_types = self.db.get_alarm_types()
 
         # Create partitions array
         for partition_dict in partition_list:
@@ -1023,7 +1151,7 @@ class QolsysPanel:
             }
 
             alarm_type = []
-            for alarm in self.db.get_alarm_type(partition_id):
+            for alarm in alarm_types.get(partition_id, []):
                 alarm_type.append(PartitionAlarmType(alarm))
 
             alarm_state = PartitionAlarmState(self.db.get_state_partition("ALARM_STATE", partition_id) or "UNKNOWN")
@@ -60,10 +60,6 @@ class QolsysPartition(QolsysObservable):
         self._delay_reset: bool = False
         self._delay_task: asyncio.Task[None] | None = None
 
-        # Alarm Type (alarmedsensor table)
-        self._alarm_type_array: list[PartitionAlarmType] = []
-        self.append_alarm_type(alarm_type_array)
-
         # Quick Exit State
         self._quick_exit_state: PartitionQuickExitState = quick_exit_state
         self._quick_exit_delay: int = 0
@@ -75,6 +71,11 @@ class QolsysPartition(QolsysObservable):
         self._command_arm_stay_silent_disarming: bool = False
         self._command_arm_entry_delay: bool = True
 
+        # Alarm Type (alarmedsensor table)
+        # Appended once every attribute is set: a change notifies with the full partition event
+        self._alarm_type_array: list[PartitionAlarmType] = []
+        self.append_alarm_type(alarm_type_array)
+
     def update_partition(self, data: dict[str, str]) -> None:
         # Check if we are updating same partition_id
         partition_id_update = data.get("partition_id", "")
@@ -6,7 +6,12 @@ from typing import TYPE_CHECKING
 
 from zeroconf.asyncio import AsyncZeroconf
 
+from qolsys_controller.database.changelog import CHANGE_LOG_SIZE
+from qolsys_controller.database.db import DATABASE_BACKENDS
+from qolsys_controller.database.retention import DEFAULT_RETENTION, QolsysRetentionPolicy
 from qolsys_controller.errors import QolsysConfigError
+from qolsys_controller.json_codec import QolsysJsonCodec, create_json_codec
+from qolsys_controller.mqtt_ingress_queue import MQTT_INGRESS_OVERFLOW_POLICIES
 
 LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +36,8 @@ class QolsysSettings:
         self._media_directory: Path = Path()
         self._mqtt_bridge_directory: Path = Path()
         self._users_file_path: Path = Path()
+        self._warm_start_file_path: Path = Path()
+        self._database_file_path: Path = Path()
 
         # Pki
         self._key_size: int = 2048
@@ -43,12 +50,30 @@ class QolsysSettings:
         self._pairing_port: int = 0  # 0 = pick a random high port on start
 
         # MQTT Panel CLIENT - Used to connect to main IQ Panel
+        self._mqtt_port: int = 8883
         self._mqtt_timeout: int = 30
         self._mqtt_ping: int = 300
         self._mqtt_qos: int = 0
         self._mqtt_remote_client_id: str = ""
         self._log_mqtt_messages: bool = False
+        self._mqtt_capture_file: str = ""  # empty = capture disabled
         self._mqtt_command_timeout: int = 30
+        self._json_codec: str = "auto"
+        self._codec: QolsysJsonCodec = create_json_codec(self._json_codec)
+        self._mqtt_decode_thread_threshold: int = 256 * 1024  # bytes
+        self._sync_database_thread_threshold: int = 2000  # rows
+        self._incremental_resync: bool = True
+        self._database_backend: str = "sqlite"
+        self._database_retention: dict[str, QolsysRetentionPolicy] = dict(DEFAULT_RETENTION)
+        self._database_ignore_tables: list[str] = []
+        self._database_change_log_size: int = CHANGE_LOG_SIZE  # changes per table, 0 = disabled
+        self._database_file: bool = False
+        self._database_checkpoint_interval: int = 60  # seconds
+        self._warm_start: bool = False
+        self._warm_start_save_interval: int = 300  # seconds
+        self._mqtt_ingress_queue_size: int = 1000
+        self._mqtt_ingress_overflow_policy: str = "block"
+        self._iq2meid_coalesce_window_ms: int = 0  # 0 = disabled
 
         # MQTT BRIDGE
         self._mqtt_bridge_enabled: bool = True
@@ -233,6 +258,157 @@ class QolsysSettings:
     def log_mqtt_messages(self, log_mqtt_messages: bool) -> None:
         self._log_mqtt_messages = log_mqtt_messages
 
+    @property
+    def json_codec(self) -> str:
+        return self._json_codec
+
+    @json_codec.setter
+    def json_codec(self, value: str) -> None:
+        self._json_codec = value
+        self._codec = create_json_codec(value)
+        LOGGER.debug("Using json codec: %s", self._codec.name)
+
+    @property
+    def codec(self) -> QolsysJsonCodec:
+        return self._codec
+
+    @property
+    def mqtt_decode_thread_threshold(self) -> int:
+        return self._mqtt_decode_thread_threshold
+
+    @mqtt_decode_thread_threshold.setter
+    def mqtt_decode_thread_threshold(self, value: int) -> None:
+        self._mqtt_decode_thread_threshold = value
+
+    @property
+    def sync_database_thread_threshold(self) -> int:
+        return self._sync_database_thread_threshold
+
+    @sync_database_thread_threshold.setter
+    def sync_database_thread_threshold(self, value: int) -> None:
+        self._sync_database_thread_threshold = value
+
+    @property
+    def incremental_resync(self) -> bool:
+        return self._incremental_resync
+
+    @incremental_resync.setter
+    def incremental_resync(self, value: bool) -> None:
+        self._incremental_resync = value
+
+    @property
+    def database_backend(self) -> str:
+        return self._database_backend
+
+    @database_backend.setter
+    def database_backend(self, value: str) -> None:
+        # Applied on the next panel database load
+        if value not in DATABASE_BACKENDS:
+            raise QolsysConfigError(f"Invalid database_backend: {value}")
+        self._database_backend = value
+
+    @property
+    def database_retention(self) -> dict[str, QolsysRetentionPolicy]:
+        return self._database_retention
+
+    @database_retention.setter
+    def database_retention(self, value: dict[str, QolsysRetentionPolicy]) -> None:
+        # Table name -> policy, applied on the next panel database load
+        for table, policy in value.items():
+            limits = (policy.max_rows, policy.max_age)
+            if any(limit is not None and limit <= 0 for limit in limits):
+                raise QolsysConfigError(f"Invalid database_retention for {table}: {policy}")
+        self._database_retention = value
+
+    @property
+    def database_ignore_tables(self) -> list[str]:
+        return self._database_ignore_tables
+
+    @database_ignore_tables.setter
+    def database_ignore_tables(self, value: list[str]) -> None:
+        # Applied on the next panel database load
+        self._database_ignore_tables = value
+
+    @property
+    def database_change_log_size(self) -> int:
+        return self._database_change_log_size
+
+    @database_change_log_size.setter
+    def database_change_log_size(self, value: int) -> None:
+        # Applied on the next panel database load
+        if value < 0:
+            raise QolsysConfigError(f"Invalid database_change_log_size: {value}")
+        self._database_change_log_size = value
+
+    @property
+    def database_file(self) -> bool:
+        return self._database_file
+
+    @database_file.setter
+    def database_file(self, value: bool) -> None:
+        # Opened at startup, requires the sqlite database backend
+        self._database_file = value
+
+    @property
+    def database_checkpoint_interval(self) -> int:
+        return self._database_checkpoint_interval
+
+    @database_checkpoint_interval.setter
+    def database_checkpoint_interval(self, value: int) -> None:
+        if value <= 0:
+            raise QolsysConfigError(f"Invalid database_checkpoint_interval: {value}")
+        self._database_checkpoint_interval = value
+
+    @property
+    def warm_start(self) -> bool:
+        return self._warm_start
+
+    @warm_start.setter
+    def warm_start(self, value: bool) -> None:
+        self._warm_start = value
+
+    @property
+    def warm_start_save_interval(self) -> int:
+        return self._warm_start_save_interval
+
+    @warm_start_save_interval.setter
+    def warm_start_save_interval(self, value: int) -> None:
+        self._warm_start_save_interval = value
+
+    @property
+    def mqtt_ingress_queue_size(self) -> int:
+        return self._mqtt_ingress_queue_size
+
+    @mqtt_ingress_queue_size.setter
+    def mqtt_ingress_queue_size(self, value: int) -> None:
+        self._mqtt_ingress_queue_size = value
+
+    @property
+    def mqtt_ingress_overflow_policy(self) -> str:
+        return self._mqtt_ingress_overflow_policy
+
+    @mqtt_ingress_overflow_policy.setter
+    def mqtt_ingress_overflow_policy(self, value: str) -> None:
+        if value not in MQTT_INGRESS_OVERFLOW_POLICIES:
+            raise QolsysConfigError(f"Invalid mqtt_ingress_overflow_policy: {value}")
+        self._mqtt_ingress_overflow_policy = value
+
+    @property
+    def iq2meid_coalesce_window_ms(self) -> int:
+        return self._iq2meid_coalesce_window_ms
+
+    @iq2meid_coalesce_window_ms.setter
+    def iq2meid_coalesce_window_ms(self, value: int) -> None:
+        self._iq2meid_coalesce_window_ms = value
+
+    @property
+    def mqtt_capture_file(self) -> str:
+        return self._mqtt_capture_file
+
+    @mqtt_capture_file.setter
+    def mqtt_capture_file(self, value: str) -> None:
+        self._mqtt_capture_file = value
+
     @property
     def check_user_code_on_disarm(self) -> bool:
         return self._check_user_code_on_disarm
@@ -257,6 +433,14 @@ class QolsysSettings:
     def auto_discover_pki(self, value: bool) -> None:
         self._auto_discover_pki = value
 
+    @property
+    def mqtt_port(self) -> int:
+        return self._mqtt_port
+
+    @mqtt_port.setter
+    def mqtt_port(self, value: int) -> None:
+        self._mqtt_port = value
+
     @property
     def mqtt_timeout(self) -> int:
         return self._mqtt_timeout
@@ -299,6 +483,8 @@ class QolsysSettings:
         self._pki_directory = self._config_directory.joinpath("pki")
         self._media_directory = self._config_directory.joinpath("media")
         self._users_file_path = self._config_directory.joinpath("users.conf")
+        self._warm_start_file_path = self._config_directory.joinpath("warm_start.json.gz")
+        self._database_file_path = self._config_directory.joinpath("panel_database.db")
         self._mqtt_bridge_directory = self._config_directory.joinpath(self._mqtt_bridge_folder)
 
     @property
@@ -309,6 +495,14 @@ class QolsysSettings:
     def users_file_path(self) -> Path:
         return self._users_file_path
 
+    @property
+    def warm_start_file_path(self) -> Path:
+        return self._warm_start_file_path
+
+    @property
+    def database_file_path(self) -> Path:
+        return self._database_file_path
+
     @property
     def mqtt_bridge_directory(self) -> Path:
         return self._mqtt_bridge_directory
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import bisect
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from qolsys_controller.automation.device import QolsysAutomationDevice
 from qolsys_controller.automation_adc.device import QolsysAutomationDeviceADC
@@ -21,6 +22,12 @@ if TYPE_CHECKING:
     from .zone import QolsysZone
 
 
+def _remove_all(entities: list[Any], removed: list[Any]) -> None:
+    # Remove several entities from a state list in one pass
+    removed_ids = {id(entity) for entity in removed}
+    entities[:] = [entity for entity in entities if id(entity) not in removed_ids]
+
+
 class QolsysState(QolsysObservable):
     def __init__(self, controller: QolsysController) -> None:
         super().__init__()
@@ -31,6 +38,14 @@ class QolsysState(QolsysObservable):
         self._automation_devices: list[QolsysAutomationDevice] = []
         self._scenes: list[QolsysScene] = []
 
+        # Lookup indexes by id, kept consistent with the lists by the add/delete methods
+        # and by automation_device_rekey when a device changes virtual_node_id
+        self._partitions_by_id: dict[str, QolsysPartition] = {}
+        self._zones_by_id: dict[str, QolsysZone] = {}
+        self._zones_by_short_id: dict[str, list[QolsysZone]] = {}  # PowerG zones, first zone added wins
+        self._automation_devices_by_id: dict[str, QolsysAutomationDevice] = {}
+        self._scenes_by_id: dict[str, QolsysScene] = {}
+
     @property
     def partitions(self) -> list[QolsysPartition]:
         return self._partitions
@@ -52,28 +67,24 @@ class QolsysState(QolsysObservable):
         return self._weather
 
     def partition(self, partition_id: str) -> QolsysPartition | None:
-        for partition in self.partitions:
-            if partition.id == partition_id:
-                return partition
-
-        return None
+        return self._partitions_by_id.get(partition_id)
 
     def partition_add(self, new_partition: QolsysPartition) -> None:
-        for partition in self.partitions:
-            if new_partition.id == partition.id:
-                LOGGER.debug(
-                    "Adding Partition to State, Partition%s (%s) - Already in Partitions List",
-                    new_partition.id,
-                    partition.name,
-                )
-                return
-
-        self.partitions.append(new_partition)
-        self.partitions.sort(key=lambda x: x.id, reverse=False)
+        partition = self._partitions_by_id.get(new_partition.id)
+        if partition is not None:
+            LOGGER.debug(
+                "Adding Partition to State, Partition%s (%s) - Already in Partitions List",
+                new_partition.id,
+                partition.name,
+            )
+            return
+
+        self._partitions_by_id[new_partition.id] = new_partition
+        bisect.insort(self.partitions, new_partition, key=lambda x: x.id)
         self.notify(Event(QolsysNotification.PARTITION_ADD, self, new_partition.to_dict_event()))
 
     def partition_delete(self, partition_id: str) -> None:
-        partition = self.partition(partition_id)
+        partition = self._partitions_by_id.pop(partition_id, None)
 
         if partition is None:
             LOGGER.debug("Deleting Partition from State, Partition%s not found", partition_id)
@@ -83,24 +94,20 @@ class QolsysState(QolsysObservable):
         self.notify(Event(QolsysNotification.PARTITION_DELETE, self, partition.to_dict_event()))
 
     def scene(self, scene_id: str) -> QolsysScene | None:
-        for scene in self.scenes:
-            if scene.scene_id == scene_id:
-                return scene
-
-        return None
+        return self._scenes_by_id.get(scene_id)
 
     def scene_add(self, new_scene: QolsysScene) -> None:
-        for scene in self.scenes:
-            if new_scene.scene_id == scene.scene_id:
-                LOGGER.debug("Adding Scene to State, Scene%s (%s) - Already in Scene List", new_scene.scene_id, scene.name)
-                return
+        scene = self._scenes_by_id.get(new_scene.scene_id)
+        if scene is not None:
+            LOGGER.debug("Adding Scene to State, Scene%s (%s) - Already in Scene List", new_scene.scene_id, scene.name)
+            return
 
-        self.scenes.append(new_scene)
-        self.scenes.sort(key=lambda x: x.scene_id, reverse=False)
+        self._scenes_by_id[new_scene.scene_id] = new_scene
+        bisect.insort(self.scenes, new_scene, key=lambda x: x.scene_id)
         self.notify(Event(QolsysNotification.SCENE_ADD, self, new_scene.to_dict_event()))
 
     def scene_delete(self, scene_id: str) -> None:
-        scene = self.scene(scene_id)
+        scene = self._scenes_by_id.pop(scene_id, None)
 
         if scene is None:
             LOGGER.debug("Deleting Scene from State, Scene%s not found", scene_id)
@@ -110,27 +117,24 @@ class QolsysState(QolsysObservable):
         self.notify(Event(QolsysNotification.SCENE_DELETE, self, scene.to_dict_event()))
 
     def automation_device(self, virtual_node_id: str) -> QolsysAutomationDevice | None:
-        for automation_device in self.automation_devices:
-            if automation_device.virtual_node_id == virtual_node_id:
-                return automation_device
-        return None
+        return self._automation_devices_by_id.get(virtual_node_id)
 
     def automation_device_add(self, new_automation_device: QolsysAutomationDevice) -> None:
-        for automation_device in self.automation_devices:
-            if new_automation_device.virtual_node_id == automation_device.virtual_node_id:
-                LOGGER.debug(
-                    "Adding AutomationDevice to State, AutDev%s (%s) - Already in AutomationDevice List",
-                    new_automation_device.virtual_node_id,
-                    automation_device.device_name,
-                )
-                return
-
-        self.automation_devices.append(new_automation_device)
-        self.automation_devices.sort(key=lambda x: x.virtual_node_id, reverse=False)
+        automation_device = self._automation_devices_by_id.get(new_automation_device.virtual_node_id)
+        if automation_device is not None:
+            LOGGER.debug(
+                "Adding AutomationDevice to State, AutDev%s (%s) - Already in AutomationDevice List",
+                new_automation_device.virtual_node_id,
+                automation_device.device_name,
+            )
+            return
+
+        self._automation_devices_by_id[new_automation_device.virtual_node_id] = new_automation_device
+        bisect.insort(self.automation_devices, new_automation_device, key=lambda x: x.virtual_node_id)
         self.notify(Event(QolsysNotification.AUTOMATION_ADD, self, new_automation_device.to_dict_event()))
 
     def automation_device_delete(self, virtual_node_id: str) -> None:
-        automation_device = self.automation_device(virtual_node_id)
+        automation_device = self._automation_devices_by_id.pop(virtual_node_id, None)
 
         if automation_device is None:
             LOGGER.debug("Deleting AutomationDevice from State, AutDev%s not found", virtual_node_id)
@@ -139,182 +143,242 @@ class QolsysState(QolsysObservable):
         self.automation_devices.remove(automation_device)
         self.notify(Event(QolsysNotification.AUTOMATION_DELETE, self, automation_device.to_dict_event()))
 
+    def automation_device_rekey(self, automation_device: QolsysAutomationDevice, previous_virtual_node_id: str) -> None:
+        # Called by the virtual_node_id setter, devices not (or no longer) in the state are ignored
+        if self._automation_devices_by_id.get(previous_virtual_node_id) is not automation_device:
+            return
+
+        del self._automation_devices_by_id[previous_virtual_node_id]
+        if automation_device.virtual_node_id in self._automation_devices_by_id:
+            # The device already in the list keeps the id, the renamed one leaves the list and the index
+            LOGGER.warning(
+                "AutDev%s renamed to AutDev%s - Already in AutomationDevice List",
+                previous_virtual_node_id,
+                automation_device.virtual_node_id,
+            )
+            self.automation_devices.remove(automation_device)
+            self.notify(Event(QolsysNotification.AUTOMATION_DELETE, self, automation_device.to_dict_event()))
+            return
+
+        self._automation_devices_by_id[automation_device.virtual_node_id] = automation_device
+        # Lists stay sorted by id for the add methods
+        self.automation_devices.sort(key=lambda x: x.virtual_node_id)
+
     def zone(self, zone_id: str) -> QolsysZone | None:
-        for zone in self.zones:
-            if zone.zone_id == zone_id:
-                return zone
-        return None
+        return self._zones_by_id.get(zone_id)
 
     def zone_from_short_id(self, short_id: int) -> QolsysZone | None:
-        for zone in self.zones:
-            if zone.shortID == str(short_id):
-                return zone
-        return None
+        zones = self._zones_by_short_id.get(str(short_id))
+        return zones[0] if zones else None
 
     def zone_add(self, new_zone: QolsysZone) -> None:
-        for zone in self.zones:
-            if new_zone.zone_id == zone.zone_id:
-                LOGGER.debug("Adding Zone to State, zone%s (%s) - Already in Zone List", new_zone.zone_id, new_zone.sensorname)
-                return
+        if new_zone.zone_id in self._zones_by_id:
+            LOGGER.debug("Adding Zone to State, zone%s (%s) - Already in Zone List", new_zone.zone_id, new_zone.sensorname)
+            return
 
-        self.zones.append(new_zone)
-        self.zones.sort(key=lambda x: x.zone_id, reverse=False)
+        self._zones_by_id[new_zone.zone_id] = new_zone
+        if new_zone.shortID:
+            self._zones_by_short_id.setdefault(new_zone.shortID, []).append(new_zone)
+        bisect.insort(self.zones, new_zone, key=lambda x: x.zone_id)
         self.notify(Event(QolsysNotification.ZONE_ADD, self, new_zone.to_dict_event()))
 
     def zone_delete(self, zone_id: str) -> None:
-        zone = self.zone(zone_id)
+        zone = self._zones_by_id.get(zone_id)
 
         if zone is None:
             LOGGER.debug("Deleting Zone from State, Zone%s not found", zone_id)
             return
 
         self.zones.remove(zone)
+        self._zone_unindex(zone)
         self.notify(Event(QolsysNotification.ZONE_DELETE, self, zone.to_dict_event()))
 
-    def sync_automation_devices_data(self, db_automation_devices: list[QolsysAutomationDevice]) -> None:
-        db_automation_list = []
-        for db_automation in db_automation_devices:
-            db_automation_list.append(db_automation.virtual_node_id)
-
-        state_automation_list = []
-        for state_automation in self.automation_devices:
-            state_automation_list.append(state_automation.virtual_node_id)
+    def _zone_unindex(self, zone: QolsysZone) -> None:
+        del self._zones_by_id[zone.zone_id]
+        zones = self._zones_by_short_id.get(zone.shortID)
+        if zones is not None:
+            zones.remove(zone)
+            if not zones:
+                del self._zones_by_short_id[zone.shortID]
+
+    # sync_*_data: reconcile the state with the entities read from the panel database, keyed by id.
+    # Existing entities are updated in state order, missing ones deleted in state order, new ones added
+    # in database order (first entity wins for a repeated id). Returns the number of entities added,
+    # deleted or changed by their update (at least one notification sent).
+
+    def sync_automation_devices_data(
+        self, db_automation_devices: list[QolsysAutomationDevice], changed_ids: set[str] | None = None
+    ) -> int:
+        # changed_ids: only update these existing devices (incremental resync), None updates all of them
+        db_automation_by_id: dict[str, QolsysAutomationDevice] = {}
+        for device in db_automation_devices:
+            db_automation_by_id.setdefault(device.virtual_node_id, device)
 
         # Update existing Automation Devices
+        updated = 0
         for state_automation in self.automation_devices:
-            if state_automation.virtual_node_id in db_automation_list:
-                for db_automation in db_automation_devices:
-                    if state_automation.virtual_node_id == db_automation.virtual_node_id:
-                        # Update ADC extracted attributes
-                        if isinstance(state_automation, QolsysAutomationDeviceADC) and isinstance(
-                            db_automation, QolsysAutomationDeviceADC
-                        ):
-                            state_automation.update_adc_device(db_automation.to_dict_adc())
-
-                        # Update Z-Wave extra attributes
-                        if isinstance(state_automation, QolsysAutomationDeviceZwave) and isinstance(
-                            db_automation, QolsysAutomationDeviceZwave
-                        ):
-                            state_automation.update_zwave_device(db_automation.to_dict_zwave())
-
-                        # Update Automation Device base attributes
-                        state_automation.update_automation_device(db_automation.to_dict())
-
-                        LOGGER.debug("sync_data - update AutDev%s", state_automation.virtual_node_id)
-                        break
+            db_automation = db_automation_by_id.get(state_automation.virtual_node_id)
+            if db_automation is None or (changed_ids is not None and state_automation.virtual_node_id not in changed_ids):
+                continue
+
+            notifications = state_automation.notification_count
+
+            # Update ADC extracted attributes
+            if isinstance(state_automation, QolsysAutomationDeviceADC) and isinstance(
+                db_automation, QolsysAutomationDeviceADC
+            ):
+                state_automation.update_adc_device(db_automation.to_dict_adc())
+
+            # Update Z-Wave extra attributes
+            if isinstance(state_automation, QolsysAutomationDeviceZwave) and isinstance(
+                db_automation, QolsysAutomationDeviceZwave
+            ):
+                state_automation.update_zwave_device(db_automation.to_dict_zwave())
+
+            # Update Automation Device base attributes
+            state_automation.update_automation_device(db_automation.to_dict())
+
+            LOGGER.debug("sync_data - update AutDev%s", state_automation.virtual_node_id)
+            updated += state_automation.notification_count != notifications
+
+        # Delete Automation Devices
+        deleted = [device for device in self.automation_devices if device.virtual_node_id not in db_automation_by_id]
+        _remove_all(self.automation_devices, deleted)
+        for state_automation in deleted:
+            LOGGER.debug("sync_data - delete AutDev%s", state_automation.virtual_node_id)
+            del self._automation_devices_by_id[state_automation.virtual_node_id]
+            self.notify(Event(QolsysNotification.AUTOMATION_DELETE, self, state_automation.to_dict_event()))
 
         # Add new Automation Devices
-        for db_automation in db_automation_devices:
-            if db_automation.virtual_node_id not in state_automation_list:
-                LOGGER.debug("sync_data - add AutDev%s", db_automation.virtual_node_id)
+        added = 0
+        for virtual_node_id, db_automation in db_automation_by_id.items():
+            if virtual_node_id not in self._automation_devices_by_id:
+                LOGGER.debug("sync_data - add AutDev%s", virtual_node_id)
                 self.automation_device_add(db_automation)
+                added += 1
 
-        # Delete Automation Device
-        for state_automation in list(self.automation_devices):
-            if state_automation.virtual_node_id not in db_automation_list:
-                LOGGER.debug("sync_data - delete AutDev%s", state_automation.virtual_node_id)
-                self.automation_device_delete(state_automation.virtual_node_id)
+        LOGGER.debug("sync_data - AutDev: %d changed, %d deleted, %d added", updated, len(deleted), added)
+        return updated + len(deleted) + added
 
     def sync_weather_data(self, db_weather: QolsysWeather) -> None:
         LOGGER.debug("sync_data - update Weather")
         self._weather.update(db_weather.forecasts)
 
-    def sync_scenes_data(self, db_scenes: list[QolsysScene]) -> None:
-        db_scene_list = []
-        for db_scene in db_scenes:
-            db_scene_list.append(db_scene.scene_id)
-
-        state_scene_list = []
-        for state_scene in self.scenes:
-            state_scene_list.append(state_scene.scene_id)
+    def sync_scenes_data(self, db_scenes: list[QolsysScene]) -> int:
+        db_scenes_by_id: dict[str, QolsysScene] = {}
+        for scene in db_scenes:
+            db_scenes_by_id.setdefault(scene.scene_id, scene)
 
         # Update existing scenes
+        updated = 0
         for state_scene in self.scenes:
-            if state_scene.scene_id in db_scene_list:
-                for db_scene in db_scenes:
-                    if state_scene.scene_id == db_scene.scene_id:
-                        LOGGER.debug("sync_data - update Scene%s", state_scene.scene_id)
-                        state_scene.update(db_scene.to_dict())
-                        break
+            db_scene = db_scenes_by_id.get(state_scene.scene_id)
+            if db_scene is None:
+                continue
+
+            LOGGER.debug("sync_data - update Scene%s", state_scene.scene_id)
+            notifications = state_scene.notification_count
+            state_scene.update(db_scene.to_dict())
+            updated += state_scene.notification_count != notifications
 
         # Delete scenes
-        for state_scene in list(self.scenes):
-            if state_scene.scene_id not in db_scene_list:
-                LOGGER.debug("sync_data - delete Scene%s", state_scene.scene_id)
-                self.scene_delete(state_scene.scene_id)
-
-        # Add new scene
-        for db_scene in db_scenes:
-            if db_scene.scene_id not in state_scene_list:
-                LOGGER.debug("sync_data - add Scene%s", db_scene.scene_id)
+        deleted = [scene for scene in self.scenes if scene.scene_id not in db_scenes_by_id]
+        _remove_all(self.scenes, deleted)
+        for state_scene in deleted:
+            LOGGER.debug("sync_data - delete Scene%s", state_scene.scene_id)
+            del self._scenes_by_id[state_scene.scene_id]
+            self.notify(Event(QolsysNotification.SCENE_DELETE, self, state_scene.to_dict_event()))
+
+        # Add new scenes
+        added = 0
+        for scene_id, db_scene in db_scenes_by_id.items():
+            if scene_id not in self._scenes_by_id:
+                LOGGER.debug("sync_data - add Scene%s", scene_id)
                 self.scene_add(db_scene)
+                added += 1
 
-    def sync_zones_data(self, db_zones: list[QolsysZone]) -> None:
-        db_zone_list = []
-        for db_zone in db_zones:
-            db_zone_list.append(db_zone.zone_id)
+        LOGGER.debug("sync_data - Scenes: %d changed, %d deleted, %d added", updated, len(deleted), added)
+        return updated + len(deleted) + added
 
-        state_zone_list = []
-        for state_zone in self.zones:
-            state_zone_list.append(state_zone.zone_id)
+    def sync_zones_data(self, db_zones: list[QolsysZone], changed_ids: set[str] | None = None) -> int:
+        # changed_ids: only update these existing zones (incremental resync), None updates all of them
+        db_zones_by_id: dict[str, QolsysZone] = {}
+        for zone in db_zones:
+            db_zones_by_id.setdefault(zone.zone_id, zone)
 
         # Update existing zones
+        updated = 0
         for state_zone in self.zones:
-            if state_zone.zone_id in db_zone_list:
-                for db_zone in db_zones:
-                    if state_zone.zone_id == db_zone.zone_id:
-                        LOGGER.debug("sync_data - update Zone%s", state_zone.zone_id)
-                        state_zone.update(db_zone.to_dict())
-                        state_zone.update_powerg(db_zone.to_powerg_dict())
-                        break
+            db_zone = db_zones_by_id.get(state_zone.zone_id)
+            if db_zone is None or (changed_ids is not None and state_zone.zone_id not in changed_ids):
+                continue
+
+            LOGGER.debug("sync_data - update Zone%s", state_zone.zone_id)
+            notifications = state_zone.notification_count
+            state_zone.update(db_zone.to_dict())
+            state_zone.update_powerg(db_zone.to_powerg_dict())
+            updated += state_zone.notification_count != notifications
 
         # Delete zones
-        for state_zone in list(self.zones):
-            if state_zone.zone_id not in db_zone_list:
-                LOGGER.debug("sync_data - delete Zone%s", state_zone.zone_id)
-                self.zone_delete(state_zone.zone_id)
-
-        # Add new zone
-        for db_zone in db_zones:
-            if db_zone.zone_id not in state_zone_list:
-                LOGGER.debug("sync_data - add Zone%s", db_zone.zone_id)
+        deleted = [zone for zone in self.zones if zone.zone_id not in db_zones_by_id]
+        _remove_all(self.zones, deleted)
+        for state_zone in deleted:
+            LOGGER.debug("sync_data - delete Zone%s", state_zone.zone_id)
+            self._zone_unindex(state_zone)
+            self.notify(Event(QolsysNotification.ZONE_DELETE, self, state_zone.to_dict_event()))
+
+        # Add new zones
+        added = 0
+        for zone_id, db_zone in db_zones_by_id.items():
+            if zone_id not in self._zones_by_id:
+                LOGGER.debug("sync_data - add Zone%s", zone_id)
                 self.zone_add(db_zone)
+                added += 1
 
-    def sync_partitions_data(self, db_partitions: list[QolsysPartition]) -> None:
-        db_partition_list = []
-        for db_partition in db_partitions:
-            db_partition_list.append(db_partition.id)
+        LOGGER.debug("sync_data - Zones: %d changed, %d deleted, %d added", updated, len(deleted), added)
+        return updated + len(deleted) + added
 
-        state_partition_list = []
-        for state_partition in self.partitions:
-            state_partition_list.append(state_partition.id)
+    def sync_partitions_data(self, db_partitions: list[QolsysPartition]) -> int:
+        db_partitions_by_id: dict[str, QolsysPartition] = {}
+        for partition in db_partitions:
+            db_partitions_by_id.setdefault(partition.id, partition)
 
         # Update existing partitions
+        updated = 0
         for state_partition in self.partitions:
-            if state_partition.id in db_partition_list:
-                for db_partition in db_partitions:
-                    if state_partition.id == db_partition.id:
-                        LOGGER.debug("sync_data - update Partition%s", state_partition.id)
-                        state_partition.update_partition(db_partition.to_dict_partition())
-                        state_partition.update_settings(db_partition.to_dict_settings())
-                        state_partition.alarm_type_array = db_partition.alarm_type_array
-                        state_partition.alarm_state = db_partition.alarm_state
-                        state_partition.quick_exit_state = db_partition.quick_exit_state
-                        state_partition.quick_exit_delay = db_partition.quick_exit_delay
-                        state_partition.quick_exit_start_time = db_partition.quick_exit_start_time
-                        break
+            db_partition = db_partitions_by_id.get(state_partition.id)
+            if db_partition is None:
+                continue
+
+            LOGGER.debug("sync_data - update Partition%s", state_partition.id)
+            notifications = state_partition.notification_count
+            state_partition.update_partition(db_partition.to_dict_partition())
+            state_partition.update_settings(db_partition.to_dict_settings())
+            state_partition.alarm_type_array = db_partition.alarm_type_array
+            state_partition.alarm_state = db_partition.alarm_state
+            state_partition.quick_exit_state = db_partition.quick_exit_state
+            state_partition.quick_exit_delay = db_partition.quick_exit_delay
+            state_partition.quick_exit_start_time = db_partition.quick_exit_start_time
+            updated += state_partition.notification_count != notifications
 
         # Delete partitions
-        for state_partition in list(self.partitions):
-            if state_partition.id not in db_partition_list:
-                LOGGER.debug("sync_data - delete Partition%s", state_partition.id)
-                self.partition_delete(state_partition.id)
-
-        # Add new partition
-        for db_partition in db_partitions:
-            if db_partition.id not in state_partition_list:
-                LOGGER.debug("sync_data - add Partition%s", db_partition.id)
+        deleted = [partition for partition in self.partitions if partition.id not in db_partitions_by_id]
+        _remove_all(self.partitions, deleted)
+        for state_partition in deleted:
+            LOGGER.debug("sync_data - delete Partition%s", state_partition.id)
+            del self._partitions_by_id[state_partition.id]
+            self.notify(Event(QolsysNotification.PARTITION_DELETE, self, state_partition.to_dict_event()))
+
+        # Add new partitions
+        added = 0
+        for partition_id, db_partition in db_partitions_by_id.items():
+            if partition_id not in self._partitions_by_id:
+                LOGGER.debug("sync_data - add Partition%s", partition_id)
                 self.partition_add(db_partition)
+                added += 1
+
+        LOGGER.debug("sync_data - Partitions: %d changed, %d deleted, %d added", updated, len(deleted), added)
+        return updated + len(deleted) + added
 
     def dump(self) -> None:  # noqa: PLR0912, PLR0915
         LOGGER.debug("*** Device Information ***")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .controller import QolsysController
+
+LOGGER = logging.getLogger(__name__)
+
+WARM_START_VERSION = 1
+
+
+class QolsysWarmStart:
+    """Persist the panel database to the config directory so a restart can serve state before the panel is synced.
+
+    The file is a gzip compressed JSON object. Its database entry has the syncdatabase fulldbdata layout,
+    so a warm start goes through panel.load_database like a live snapshot, and the live sync that follows
+    is reconciled as an incremental resync.
+    """
+
+    def __init__(self, controller: QolsysController) -> None:
+        self._controller = controller
+
+    @property
+    def path(self) -> Path:
+        return self._controller.settings.warm_start_file_path
+
+    async def save(self) -> bool:
+        # Rows are read on the event loop (shared database connection), compressed and written in a worker thread
+        start = time.perf_counter()
+        panel = self._controller.panel
+        data = {
+            "version": WARM_START_VERSION,
+            "time": datetime.now(timezone.utc).isoformat(),
+            "random_mac": self._controller.settings.random_mac,
+            "imei": panel.imei,
+            "product_type": panel.product_type.value,
+            "database": panel.db.dump_db(),
+        }
+        payload = self._controller.settings.codec.dumps(data)
+
+        try:
+            await asyncio.to_thread(self._write, self.path, payload)
+        except OSError as err:
+            LOGGER.warning("Warm Start - Unable to save snapshot to %s: %s", self.path, err)
+            return False
+
+        LOGGER.debug("Warm Start - Snapshot saved to %s in %.1f ms", self.path, (time.perf_counter() - start) * 1000)
+        return True
+
+    async def load(self) -> dict[str, Any] | None:
+        if not self.path.is_file():
+            LOGGER.debug("Warm Start - No snapshot found: %s", self.path)
+            return None
+
+        try:
+            payload = await asyncio.to_thread(self._read, self.path)
+            data = self._controller.settings.codec.loads(payload)
+        except (OSError, EOFError, ValueError) as err:
+            LOGGER.warning("Warm Start - Unable to read snapshot %s: %s", self.path, err)
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != WARM_START_VERSION:
+            LOGGER.warning("Warm Start - Ignoring snapshot with unsupported format: %s", self.path)
+            return None
+
+        random_mac = self._controller.settings.random_mac
+        if random_mac and data.get("random_mac") != random_mac:
+            LOGGER.warning("Warm Start - Ignoring snapshot saved for another plugin: %s", data.get("random_mac"))
+            return None
+
+        return data
+
+    @staticmethod
+    def _write(path: Path, payload: bytes) -> None:
+        # Write to a temporary file first so an interrupted save never corrupts the previous snapshot
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wb", compresslevel=6) as handle:
+            handle.write(payload)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: Path) -> bytes:
+        with gzip.open(path, "rb") as handle:
+            return handle.read()
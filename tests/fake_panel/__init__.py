@@ -0,0 +1,9 @@
+"""Local stand-in for an IQ Panel MQTT endpoint, for end-to-end and load tests without a panel.
+
+Requires the bridge extra (amqtt) for the TLS broker.
+"""
+
+from .database import fake_database
+from .panel import FakePanel
+
+__all__ = ["FakePanel", "fake_database"]
@@ -0,0 +1,61 @@
+"""Small syncdatabase payloads served by the fake panel."""
+
+from __future__ import annotations
+
+from typing import Any
+
+SENSOR_URI = "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor"
+PARTITION_URI = "content://com.qolsys.qolsysprovider.PartitionContentProvider/partition"
+SETTINGS_URI = "content://com.qolsys.qolsysprovider.QolsysSettingsProvider/qolsyssettings"
+STATE_URI = "content://com.qolsys.qolsysprovider.StateContentProvider/state"
+
+
+def fake_database(partitions: int = 1, zones: int = 4) -> list[dict[str, Any]]:
+    """Return a fulldbdata payload with partitions and door/window zones."""
+    partition_rows = []
+    setting_rows = []
+    state_rows = []
+    row_id = 0
+
+    for pid in range(partitions):
+        partition_rows.append({"_id": str(pid), "partition_id": str(pid), "name": f"Partition {pid}", "devices": ""})
+        for name, value in [("SYSTEM_STATUS", "DISARM"), ("EXIT_SOUNDS", "ON"), ("ENTRY_DELAYS", "ON")]:
+            row_id += 1
+            setting_rows.append({"_id": str(row_id), "partition_id": str(pid), "name": name, "value": value})
+        for name, value in [("ALARM_STATE", "None"), ("QUICK_EXIT_STATE", "None")]:
+            row_id += 1
+            state_rows.append({"_id": str(row_id), "partition_id": str(pid), "name": name, "value": value})
+
+    sensor_rows = [
+        {
+            "_id": str(zid),
+            "zoneid": str(zid),
+            "sensorid": str(100000 + zid),
+            "sensorname": f"Zone {zid}",
+            "sensorstatus": "Closed",
+            "sensortype": "Door_Window",
+            "sensorgroup": "entryexitdelay",
+            "partition_id": str(zid % partitions),
+            "battery_status": "Normal",
+            "current_capability": "SRF",
+        }
+        for zid in range(1, zones + 1)
+    ]
+
+    return [
+        {"uri": PARTITION_URI, "resultSet": partition_rows},
+        {"uri": SETTINGS_URI, "resultSet": setting_rows},
+        {"uri": STATE_URI, "resultSet": state_rows},
+        {"uri": SENSOR_URI, "resultSet": sensor_rows},
+    ]
+
+
+def sensor_update(zone_id: int, **content_values: str) -> dict[str, Any]:
+    return {
+        "eventName": "dbChanged",
+        "dbOperation": "update",
+        "uri": SENSOR_URI,
+        "selection": "zoneid=?",
+        "selectionArgs": [str(zone_id)],
+        "contentValues": {"zoneid": str(zone_id), **content_values},
+    }
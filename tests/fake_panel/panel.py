@@ -0,0 +1,204 @@
+"""FakePanel — TLS MQTT broker plus a panel-side client answering the plugin commands."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import random
+import socket
+import ssl
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import aiomqtt
+
+from .database import fake_database
+from .pki import write_panel_certificates, write_plugin_certificates, write_plugin_pki
+
+if TYPE_CHECKING:
+    from qolsys_controller.controller import QolsysController
+
+LOGGER = logging.getLogger(__name__)
+
+# Commands of mqtt_initialize_session_task, never dropped so a session can always be established
+SESSION_COMMANDS = frozenset({"connect_v204", "pingevent", "pair_status_request", "syncdatabase"})
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+class FakePanel:
+    """Emulate the MQTT side of an IQ Panel on 127.0.0.1.
+
+    - Answers connect_v204, pingevent, pair_status_request and syncdatabase (serving database).
+    - Acknowledges every other command on its responseTopic after response_latency seconds, dropping
+      a response_loss fraction of them (session commands are never dropped).
+    - emit() publishes dbChanged / ZWAVE_RESPONSE streams at a target rate.
+
+    Usage:
+        async with FakePanel(tmp_path) as panel:
+            panel.configure(controller)
+            await controller.run_forever(...)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        database: list[dict[str, Any]] | None = None,
+        random_mac: str = "aa:bb:cc:dd:ee:01",
+        response_latency: float = 0.0,
+        response_loss: float = 0.0,
+        seed: int = 1,
+    ) -> None:
+        self.directory = directory
+        self.database = database if database is not None else fake_database()
+        self.random_mac = random_mac
+        self.response_latency = response_latency
+        self.response_loss = response_loss
+        self.port = _free_port()
+        self.commands: Counter[str] = Counter()
+        self.dropped: int = 0
+
+        self._rng = random.Random(seed)
+        self._broker: Any = None
+        self._client: aiomqtt.Client | None = None
+        self._client_task: asyncio.Task[None] | None = None
+        self._client_ready = asyncio.Event()
+        self._pending: set[asyncio.Task[None]] = set()
+        self._certfile, self._keyfile = write_panel_certificates(directory / "fake_panel")
+        self._plugin_files = write_plugin_certificates(directory / "fake_panel", random_mac)
+
+    async def __aenter__(self) -> FakePanel:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    def configure(self, controller: QolsysController) -> None:
+        """Point a controller at this panel, as if it had been paired with it."""
+        settings = controller.settings
+        settings.config_directory = str(self.directory / "config")
+        settings.check_config_directory(create=True)
+        write_plugin_pki(settings.pki_directory, self.random_mac, self._plugin_files, self._certfile)
+
+        settings.panel_ip = "127.0.0.1"
+        settings.plugin_ip = "127.0.0.1"
+        settings.random_mac = self.random_mac
+        settings.mqtt_port = self.port
+        settings.auto_discover_pki = False
+        settings.mqtt_bridge_enabled = False
+
+    async def start(self) -> None:
+        from amqtt.broker import Broker
+
+        config = {
+            "listeners": {
+                "default": {
+                    "type": "tcp",
+                    "bind": f"127.0.0.1:{self.port}",
+                    "ssl": True,
+                    "certfile": str(self._certfile),
+                    "keyfile": str(self._keyfile),
+                    "cafile": str(self._plugin_files[0]),
+                }
+            },
+            "plugins": {"amqtt.plugins.authentication.AnonymousAuthPlugin": {"allow_anonymous": True}},
+        }
+        self._broker = Broker(config)
+        await self._broker.start()
+
+        self._client_task = asyncio.create_task(self._run_client())
+        await asyncio.wait_for(self._client_ready.wait(), timeout=10)
+
+    async def stop(self) -> None:
+        for task in [*self._pending, self._client_task]:
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+        if self._broker is not None:
+            await self._broker.shutdown()
+            self._broker = None
+
+    async def disconnect_clients(self) -> None:
+        """Restart the broker, dropping every client connection (reconnect tests)."""
+        await self.stop()
+        self._client_ready.clear()
+        await self.start()
+
+    async def emit(self, topic: str, messages: list[dict[str, Any]], rate: float = 0) -> float:
+        """Publish messages on topic at rate messages per second (0 = unthrottled). Returns the elapsed time."""
+        client = self._require_client()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i, message in enumerate(messages):
+            if rate > 0:
+                delay = start + i / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await client.publish(topic, json.dumps(message))
+        return loop.time() - start
+
+    async def emit_db_changed(self, messages: list[dict[str, Any]], rate: float = 0) -> float:
+        return await self.emit("iq2meid", messages, rate)
+
+    async def emit_zwave_responses(self, node_id: int, payloads: list[bytes], rate: float = 0) -> float:
+        messages = [
+            {"ZWAVE_RESPONSE": {"NODE_ID": node_id, "ZWAVE_PAYLOAD": base64.b64encode(payload).decode()}}
+            for payload in payloads
+        ]
+        return await self.emit("ZWAVE_RESPONSE", messages, rate)
+
+    def _require_client(self) -> aiomqtt.Client:
+        if self._client is None:
+            msg = "FakePanel is not started"
+            raise RuntimeError(msg)
+        return self._client
+
+    async def _run_client(self) -> None:
+        tls_context = ssl.create_default_context()
+        tls_context.check_hostname = False
+        tls_context.verify_mode = ssl.CERT_NONE
+
+        async with aiomqtt.Client("127.0.0.1", port=self.port, tls_context=tls_context, identifier="fake-panel") as client:
+            self._client = client
+            await client.subscribe("mastermeid")
+            self._client_ready.set()
+            try:
+                async for message in client.messages:
+                    command = json.loads(message.payload)  # type: ignore[arg-type]
+                    task = asyncio.create_task(self._respond(command))
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
+            finally:
+                self._client = None
+
+    async def _respond(self, command: dict[str, Any]) -> None:
+        event_name = command.get("eventName", "")
+        self.commands[event_name] += 1
+
+        if event_name not in SESSION_COMMANDS and self._rng.random() < self.response_loss:
+            self.dropped += 1
+            return
+
+        if self.response_latency > 0:
+            await asyncio.sleep(self.response_latency)
+
+        response: dict[str, Any] = {"requestID": command.get("requestID"), "eventName": event_name, "status": "success"}
+        match event_name:
+            case "connect_v204":
+                response["master_imei"] = "000000000000001"
+                response["primary_product_type"] = "IQPanel4"
+            case "syncdatabase":
+                response["fulldbdata"] = self.database
+
+        await self._require_client().publish(command.get("responseTopic", ""), json.dumps(response))
@@ -0,0 +1,67 @@
+"""Certificates for the fake panel broker and the paired plugin."""
+
+from __future__ import annotations
+
+import ipaddress
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+
+def _self_signed(common_name: str, directory: Path, name: str) -> tuple[Path, Path]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    directory.mkdir(parents=True, exist_ok=True)
+    key_path = directory / f"{name}.key"
+    cert_path = directory / f"{name}.cer"
+    key_path.write_bytes(
+        key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    )
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    return cert_path, key_path
+
+
+def write_panel_certificates(directory: Path) -> tuple[Path, Path]:
+    """Create the broker certificate and key, returns (certfile, keyfile)."""
+    return _self_signed("Fake IQ Panel", directory, "fake_panel")
+
+
+def write_plugin_certificates(directory: Path, random_mac: str) -> tuple[Path, Path]:
+    """Create the plugin client certificate and key, returns (certfile, keyfile).
+
+    The broker requests client certificates and trusts this one, like a panel after pairing.
+    """
+    return _self_signed(random_mac, directory, "plugin")
+
+
+def write_plugin_pki(pki_directory: Path, random_mac: str, plugin_files: tuple[Path, Path], panel_certfile: Path) -> None:
+    """Lay out the files QolsysPKI expects after a successful pairing.
+
+    The panel certificate is saved as the .qolsys file, so the controller pins the fake broker.
+    """
+    pki_id = random_mac.replace(":", "").lower()
+    directory = pki_directory / pki_id
+    directory.mkdir(parents=True, exist_ok=True)
+    certfile, keyfile = plugin_files
+    (directory / f"{pki_id}.key").write_bytes(keyfile.read_bytes())
+    (directory / f"{pki_id}.cer").write_bytes(certfile.read_bytes())
+    (directory / f"{pki_id}.secure").write_bytes(certfile.read_bytes())
+    (directory / f"{pki_id}.qolsys").write_bytes(panel_certfile.read_bytes())
@@ -0,0 +1,652 @@
+"""Tests for QolsysDB — table operations on both backends, transactions, SQL cache, indexes, the settings/state cache and the database file."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from qolsys_controller.database.db import DATABASE_BACKENDS, QolsysDB
+from qolsys_controller.database.retention import QolsysRetentionPolicy
+from qolsys_controller.database.selection import compile_selection, selection_arguments
+from qolsys_controller.database.table import _explained_queries, _insert_statement, _update_statement
+from tests.fake_panel.database import fake_database
+
+
+@pytest.fixture(params=DATABASE_BACKENDS)
+def db(request: pytest.FixtureRequest) -> QolsysDB:
+    return QolsysDB(request.param)
+
+
+def _load_sensors(db: QolsysDB, zones: list[str]) -> None:
+    db.table_sensor.insert_many([{"_id": zone, "zoneid": zone, "sensorstatus": "Closed"} for zone in zones])
+
+
+class TestTable:
+    def test_insert_ignores_existing_primary_key(self, db: QolsysDB) -> None:
+        db.table_sensor.insert({"_id": "1", "zoneid": "1", "sensorname": "Door"})
+        db.table_sensor.insert({"_id": "1", "zoneid": "9", "sensorname": "Window"})
+
+        assert [(zone["zoneid"], zone["sensorname"], zone["sensorstatus"]) for zone in db.get_zones()] == [("1", "Door", "")]
+
+    def test_select_orders_numeric_and_text(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["10", "2", "1", "x"])
+
+        assert [zone["zoneid"] for zone in db.table_sensor.select(order_by="zoneid", numeric=True)] == ["x", "1", "2", "10"]
+        assert [zone["zoneid"] for zone in db.table_sensor.select(order_by="zoneid")] == ["1", "10", "2", "x"]
+        assert [zone["zoneid"] for zone in db.table_sensor.select(order_by="zoneid", limit=2)] == ["1", "10"]
+
+    def test_rows_reads_selected_columns(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["10", "2", "1"])
+        sensor = db.table_sensor
+
+        assert sensor.rows(("zoneid", "sensorstatus"), order_by="zoneid", numeric=True) == [
+            ("1", "Closed"),
+            ("2", "Closed"),
+            ("10", "Closed"),
+        ]
+        assert sensor.rows(("_id",), "zoneid=?", ["2"]) == [("2",)]
+        assert sensor.rows(("zoneid",), order_by="zoneid", limit=1) == [("1",)]
+        with pytest.raises(sqlite3.OperationalError, match="no such column"):
+            sensor.rows(("zoneid", "unknown"))
+
+    def test_update_returns_changed_columns(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["1", "2"])
+        sensor = db.table_sensor
+
+        assert sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open", "sensorname": ""}) == {"sensorstatus"}
+        assert sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open"}) == set()
+        assert sensor.update("zoneid=?", ["9"], {"sensorstatus": "Open"}) == set()
+        assert sensor.update(None, None, {"sensorstatus": "Open"}) == {"sensorstatus"}
+        assert sensor.update("zoneid=?", ["2"], {"sensorstatus": "Open", "zoneid": 2}) == set()
+
+        assert [zone["sensorstatus"] for zone in db.get_zones()] == ["Open", "Open"]
+        assert sensor.update_stats == {"effective": 2, "noop": 3}
+        assert db.update_stats() == {"sensor": {"effective": 2, "noop": 3}}
+
+        # Only the rows and columns that changed are logged
+        updates = [change for change in db.changes_since(0).changes if change.operation == "update"]
+        assert [(change.primary_key, change.columns) for change in updates] == [
+            ("1", ("sensorstatus",)),
+            ("2", ("sensorstatus",)),
+        ]
+
+    @pytest.mark.parametrize(
+        ("selection", "selection_argument"),
+        [
+            ("zoneid=?", ["2"]),
+            ("zoneid = ? AND sensorstatus = ?", ["2", "Closed"]),
+            ("zoneid=? and sensorstatus=?", "[2, Closed]"),
+            ("zoneid=2", None),
+            ("zoneid = '2'", []),
+        ],
+    )
+    def test_update_selection(self, db: QolsysDB, selection: str, selection_argument: list[str] | str | None) -> None:
+        _load_sensors(db, ["1", "2", "3"])
+        db.table_sensor.update(selection, selection_argument, {"sensorstatus": "Open"})
+
+        assert {zone["zoneid"]: zone["sensorstatus"] for zone in db.get_zones()} == {"1": "Closed", "2": "Open", "3": "Closed"}
+
+    def test_update_indexed_and_primary_key_columns(self, db: QolsysDB) -> None:
+        db.table_powerg_device.insert({"_id": "1", "shortID": "A1", "dealer_code": "Motion"})
+        db.table_powerg_device.update("shortID=?", ["A1"], {"shortID": "B2"})
+
+        assert db.get_powerg("A1") is None
+        device = db.get_powerg("B2")
+        assert device is not None
+        assert device["dealer_code"] == "Motion"
+
+        db.table_powerg_device.update("_id=?", ["1"], {"_id": "7"})
+        assert list(db.table_powerg_device.snapshot()) == ["7"]
+        assert db.table_powerg_device.first("_id=?", ["7"]) == device | {"_id": "7"}
+
+    def test_delete_selection_and_all(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["1", "2", "3"])
+
+        db.table_sensor.delete("zoneid=?", ["2"])
+        assert [zone["zoneid"] for zone in db.get_zones()] == ["1", "3"]
+
+        db.table_sensor.delete(None, None)
+        assert db.get_zones() == []
+
+    @pytest.mark.parametrize(
+        "selection", ["zoneid=? OR", "unknown_column=?", "zoneid=? OR 1=1", "zoneid=?; DROP TABLE sensor", "zoneid=(SELECT 1)"]
+    )
+    def test_invalid_selection_changes_nothing(self, db: QolsysDB, selection: str) -> None:
+        _load_sensors(db, ["1"])
+        db.table_sensor.update(selection, ["1"], {"sensorstatus": "Open"})
+        db.table_sensor.delete(selection, ["1"])
+
+        assert [zone["sensorstatus"] for zone in db.get_zones()] == ["Closed"]
+
+    def test_numbers_stored_as_text(self, db: QolsysDB) -> None:
+        db.table_sensor.insert({"_id": 1, "zoneid": 1})  # type: ignore[dict-item]
+        db.table_sensor.update("zoneid=?", [1], {"sensorstatus": "Open"})  # type: ignore[list-item]
+
+        assert db.get_zones()[0]["zoneid"] == "1"
+        assert db.get_zones()[0]["sensorstatus"] == "Open"
+
+    def test_backends_read_the_same_rows(self) -> None:
+        database = fake_database(partitions=2, zones=12)
+        sqlite_db = QolsysDB("sqlite")
+        memory_db = QolsysDB("memory")
+        sqlite_db.load_db(database)
+        memory_db.load_db(database)
+
+        assert memory_db.dump_db() == sqlite_db.dump_db()
+        assert memory_db.snapshot() == sqlite_db.snapshot()
+        assert memory_db.get_zones() == sqlite_db.get_zones()
+        assert memory_db.get_partitions() == sqlite_db.get_partitions()
+        assert memory_db.get_alarm_type("1") == sqlite_db.get_alarm_type("1")
+        assert memory_db.get_setting_partition("SYSTEM_STATUS", "1") == sqlite_db.get_setting_partition("SYSTEM_STATUS", "1")
+
+    def test_set_based_readers_match_per_key_readers(self, db: QolsysDB) -> None:
+        db.load_db(fake_database(partitions=2, zones=12))
+        db.table_alarmedsensor.insert({"_id": "90", "partition_id": "1", "sgroup": "Glassbreak"})
+        db.table_powerg_device.insert({"_id": "91", "shortID": "C3", "dealer_code": "Smoke"})
+
+        alarm_types = db.get_alarm_types()
+        for partition in db.get_partitions():
+            assert alarm_types.get(partition["partition_id"], []) == db.get_alarm_type(partition["partition_id"])
+        assert "Glassbreak" in alarm_types["1"]
+
+        devices = db.get_powerg_devices()
+        assert devices["C3"] == db.get_powerg("C3")
+        assert all(devices[short_id] == db.get_powerg(short_id) for short_id in devices)
+
+    def test_unknown_backend(self) -> None:
+        with pytest.raises(ValueError, match="Unknown database backend"):
+            QolsysDB("postgres")
+
+
+class TestSelection:
+    COLUMNS = frozenset({"zoneid", "partition_id", "sensorstatus"})
+
+    def test_compiled_once_per_selection_text(self) -> None:
+        compile_selection.cache_clear()
+        selection = compile_selection("zoneid=? and partition_id = 0", self.COLUMNS)
+
+        assert compile_selection("zoneid=? and partition_id = 0", self.COLUMNS) is selection
+        assert compile_selection.cache_info().hits == 1
+        # Only validated column names and placeholders reach SQL, literals are bound
+        assert selection.sql == "zoneid = ? AND partition_id = ?"
+        assert selection.bind(["3"]) == ["3", "0"]
+
+    def test_in_memory_matcher(self) -> None:
+        selection = compile_selection("zoneid=? AND sensorstatus='Open'", self.COLUMNS)
+
+        assert selection.matches({"zoneid": "3", "sensorstatus": "Open"}, [3])
+        assert not selection.matches({"zoneid": "3", "sensorstatus": "Closed"}, ["3"])
+        assert compile_selection("zoneid=? AND zoneid=?", self.COLUMNS).criteria(["1", "2"]) is None
+
+    @pytest.mark.parametrize("selection", ["zoneid=? OR 1=1", "zoneid=?; DELETE FROM sensor", "unknown=?", "zoneid LIKE ?"])
+    def test_invalid_clauses_rejected(self, selection: str) -> None:
+        with pytest.raises(sqlite3.OperationalError):
+            compile_selection(selection, self.COLUMNS)
+
+    def test_firmware_string_arguments(self) -> None:
+        assert selection_arguments("[3, 1]") == ["3", "1"]
+        assert selection_arguments(["3", "1"]) == ["3", "1"]
+        assert selection_arguments(None) == []
+        assert selection_arguments("[]") == []
+        assert selection_arguments("") == []
+
+    def test_clauses_outside_the_subset_are_rejected(self, db: QolsysDB, caplog: pytest.LogCaptureFixture) -> None:
+        _load_sensors(db, ["1", "2"])
+        table = db.table_sensor
+
+        with caplog.at_level(logging.WARNING):
+            table.delete("zoneid IN (?, ?)", ["1", "2"])
+            assert table.update("zoneid = ? OR 1=1", ["1"], {"sensorstatus": "Open"}) == set()
+        assert [(zone["zoneid"], zone["sensorstatus"]) for zone in db.get_zones()] == [("1", "Closed"), ("2", "Closed")]
+        warnings = [record.getMessage() for record in caplog.records if record.getMessage().startswith("sensor - ")]
+        assert [warning.split(":")[0] for warning in warnings] == [
+            "sensor - Delete not applied",
+            "sensor - Update not applied",
+        ]
+        assert "zoneid IN (?, ?)" in warnings[0]
+
+        with pytest.raises(sqlite3.OperationalError):
+            table.select("zoneid LIKE ?", ["1%"])
+
+    def test_failed_write_is_logged(self, db: QolsysDB, caplog: pytest.LogCaptureFixture) -> None:
+        _load_sensors(db, ["1"])
+        with caplog.at_level(logging.WARNING):
+            db.table_sensor.delete("zoneid=?; DELETE FROM sensor", ["1"])
+
+        assert len(db.get_zones()) == 1
+        assert any(record.getMessage().startswith("sensor - Delete not applied") for record in caplog.records)
+
+    def test_failed_update_reports_no_change(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["1"])
+        assert db.table_sensor.update("unknown_column=?", ["1"], {"sensorstatus": "Open"}) == set()
+        assert db.table_qolsyssettings.update("unknown_column=?", ["1"], {"value": "1"}) == set()
+        assert db.get_zones()[0]["sensorstatus"] != "Open"
+
+    def test_delete_without_placeholders(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["1", "99"])
+        db.table_sensor.delete("_id = 99", "[]")
+
+        assert [zone["zoneid"] for zone in db.get_zones()] == ["1"]
+
+
+class TestTransaction:
+    def test_statements_commit_when_scope_exits(self) -> None:
+        db = QolsysDB()
+        with db.transaction():
+            db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+            db.table_sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open"})
+            # Readers see the pending rows and never commit
+            assert db.get_zones()[0]["sensorstatus"] == "Open"
+            assert db.db.in_transaction
+
+        assert not db.db.in_transaction
+
+    def test_nested_scopes_join_outermost(self) -> None:
+        db = QolsysDB()
+        with db.transaction():
+            with db.transaction():
+                db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+            assert db.db.in_transaction
+
+        assert not db.db.in_transaction
+
+    def test_scope_commits_on_exception(self) -> None:
+        db = QolsysDB()
+        with pytest.raises(RuntimeError), db.transaction():
+            db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+            raise RuntimeError
+
+        assert not db.db.in_transaction
+        assert len(db.get_zones()) == 1
+
+    def test_statements_outside_scope_autocommit(self) -> None:
+        db = QolsysDB()
+        db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+        assert not db.db.in_transaction
+
+    def test_load_db_is_one_transaction(self) -> None:
+        db = QolsysDB()
+        commits = 0
+
+        class CountingConnection:
+            def __init__(self, connection: object) -> None:
+                self._connection = connection
+
+            def commit(self) -> None:
+                nonlocal commits
+                commits += 1
+
+            def __getattr__(self, name: str) -> object:
+                return getattr(self._connection, name)
+
+        connection = CountingConnection(db.db)
+        db._db = connection  # type: ignore[assignment]
+        for table in db._table_array:
+            table._db = connection  # type: ignore[assignment]
+
+        rows = [{"_id": str(i), "zoneid": str(i)} for i in range(10)]
+        db.load_db([{"uri": db.table_sensor.uri, "resultSet": rows}])
+
+        assert commits == 1
+        assert len(db.get_zones()) == 10
+
+
+class TestBulkLoad:
+    def test_rows_are_projected_on_known_columns(self, db: QolsysDB) -> None:
+        rows = [{"_id": "1", "zoneid": "1", "sensorstatus": "Open"}, {"_id": "2", "zoneid": "2"}, {"_id": "1", "zoneid": "9"}]
+        db.load_db([{"uri": db.table_sensor.uri, "resultSet": rows}])
+
+        zones = db.get_zones()
+        # Duplicate primary keys are ignored like the row by row insert
+        assert [(zone["zoneid"], zone["sensorstatus"]) for zone in zones] == [("1", "Open"), ("2", "")]
+
+    def test_unknown_columns_reported_once_per_table(self, db: QolsysDB, caplog: pytest.LogCaptureFixture) -> None:
+        rows = [{"_id": str(i), "zoneid": str(i), "new_col": "x", f"other_{i % 2}": "y"} for i in range(50)]
+
+        with caplog.at_level(logging.WARNING):
+            db.load_db([{"uri": db.table_sensor.uri, "resultSet": rows}])
+
+        reports = [record.getMessage() for record in caplog.records if record.getMessage().startswith("New Columns")]
+        assert reports == ["New Columns: ['new_col', 'other_0', 'other_1']"]
+        assert len(db.get_zones()) == 50
+
+
+class TestStatementCache:
+    def test_recurring_update_shapes_hit_cache(self) -> None:
+        db = QolsysDB()
+        db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+        db.table_sensor.insert({"_id": "2", "zoneid": "2"})
+        _update_statement.cache_clear()
+
+        for zone_id in ("1", "2") * 5:
+            db.table_sensor.update("zoneid=?", [zone_id], {"sensorstatus": "Open", "time": "1"})
+
+        stats = db.statement_cache_stats()["update"]
+        assert (stats["misses"], stats["hits"]) == (1, 9)
+        assert stats["hit_ratio"] == pytest.approx(0.9)
+
+    def test_column_order_does_not_change_bound_values(self) -> None:
+        db = QolsysDB()
+        db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+        db.table_sensor.insert({"_id": "2", "zoneid": "2"})
+
+        db.table_sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open", "sensorname": "Door"})
+        db.table_sensor.update("zoneid=?", ["2"], {"sensorname": "Window", "sensorstatus": "Closed"})
+
+        zones = {zone["zoneid"]: zone for zone in db.get_zones()}
+        assert (zones["1"]["sensorstatus"], zones["1"]["sensorname"]) == ("Open", "Door")
+        assert (zones["2"]["sensorstatus"], zones["2"]["sensorname"]) == ("Closed", "Window")
+
+    def test_insert_statement_cached_per_table(self) -> None:
+        db = QolsysDB()
+        _insert_statement.cache_clear()
+        db.table_sensor.insert({"_id": "1", "zoneid": "1"})
+        db.table_sensor.insert({"_id": "2", "zoneid": "2"})
+
+        assert db.statement_cache_stats()["insert"]["hits"] == 1
+        assert len(db.get_zones()) == 2
+
+
+class TestIndexes:
+    def test_declared_indexes_are_created(self) -> None:
+        db = QolsysDB()
+        db.cursor.execute("SELECT tbl_name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+        created = {table: sql for table, sql in db.cursor.fetchall()}
+
+        assert created["qolsyssettings"].endswith("(name, partition_id)")
+        assert created["sensor"].endswith("(zoneid)")
+        assert len(created) == sum(len(table.indexes) for table in db._table_array)
+
+    @pytest.mark.parametrize(
+        ("table", "selection"),
+        [
+            ("qolsyssettings", "name = ? and partition_id = ?"),
+            ("state", "name = ? and partition_id = ?"),
+            ("powerg_device", "shortID = ?"),
+            ("zwave_node", "node_id = ?"),
+            ("alarmedsensor", "partition_id = ?"),
+            ("sensor", "zoneid=?"),
+            ("automation", "virtual_node_id=?"),
+        ],
+    )
+    def test_hot_lookups_use_index(self, table: str, selection: str) -> None:
+        db = QolsysDB()
+        params = ["1"] * selection.count("?")
+        db.cursor.execute(f"EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE {selection}", params)
+        plan = [row[3] for row in db.cursor.fetchall()]
+
+        assert any("USING INDEX" in detail for detail in plan)
+
+    def test_full_scan_logged_once_in_debug(self, caplog: pytest.LogCaptureFixture) -> None:
+        db = QolsysDB()
+        _explained_queries.clear()
+
+        with caplog.at_level(logging.DEBUG, logger="qolsys_controller.database.table"):
+            for _ in range(3):
+                db.table_sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open"})
+                db.table_sensor.update("sensorname=?", ["Door"], {"sensorstatus": "Open"})
+
+        scans = [record.getMessage() for record in caplog.records if "Full table scan" in record.getMessage()]
+        assert len(scans) == 1
+        assert "WHERE sensorname = ?" in scans[0]
+
+
+def _load_settings(db: QolsysDB) -> None:
+    settings = [
+        {"_id": "1", "partition_id": "0", "name": "AC_STATUS", "value": "Connected"},
+        {"_id": "2", "partition_id": "0", "name": "SYSTEM_STATUS", "value": "DISARM"},
+        {"_id": "3", "partition_id": "1", "name": "SYSTEM_STATUS", "value": "ARM-STAY"},
+    ]
+    state = [{"_id": "1", "partition_id": "0", "name": "ALARM_STATE", "value": "None"}]
+    db.load_db(
+        [
+            {"uri": db.table_qolsyssettings.uri, "resultSet": settings},
+            {"uri": db.table_state.uri, "resultSet": state},
+        ]
+    )
+
+
+class TestNameValueCache:
+    def test_readers_do_not_query(self, db: QolsysDB) -> None:
+        _load_settings(db)
+        statements: list[str] = []
+        db.db.set_trace_callback(statements.append)
+
+        assert db.get_setting_panel("AC_STATUS") == "Connected"
+        assert db.get_setting_partition("SYSTEM_STATUS", "1") == "ARM-STAY"
+        assert db.get_setting_partition("UNKNOWN", "1") == ""
+        assert db.get_state_partition("ALARM_STATE", "0") == "None"
+        assert db.get_state_partition("ALARM_STATE", "1") is None
+        assert statements == []
+
+    def test_write_paths_keep_cache_consistent(self, db: QolsysDB) -> None:
+        _load_settings(db)
+        settings = db.table_qolsyssettings
+
+        settings.update("name=? AND partition_id=?", ["AC_STATUS", "0"], {"value": "Disconnected"})
+        assert db.get_setting_panel("AC_STATUS") == "Disconnected"
+
+        # Firmware 4.4.1 string arguments, and a selection that moves the row to another key
+        settings.update("_id=?", "[3]", {"partition_id": "2"})
+        assert db.get_setting_partition("SYSTEM_STATUS", "1") == ""
+        assert db.get_setting_partition("SYSTEM_STATUS", "2") == "ARM-STAY"
+
+        settings.insert({"_id": "4", "partition_id": "0", "name": "BATTERY_STATUS", "value": "Normal"})
+        assert db.get_setting_panel("BATTERY_STATUS") == "Normal"
+
+        settings.delete("name=?", ["SYSTEM_STATUS"])
+        assert db.get_setting_panel("SYSTEM_STATUS") == ""
+        assert db.get_setting_partition("SYSTEM_STATUS", "2") == ""
+
+        db.table_state.delete(None, None)
+        assert db.get_state_partition("ALARM_STATE", "0") is None
+
+    def test_numeric_partition_id_is_cached_as_text(self, db: QolsysDB) -> None:
+        _load_settings(db)
+        db.table_qolsyssettings.insert({"_id": "5", "partition_id": 0, "name": "PANEL_TAMPER_STATE", "value": "Open"})
+        db.table_state.insert({"_id": "5", "partition_id": 1, "name": "ALARM_STATE", "value": "Alarm"})
+
+        assert db.get_setting_panel("PANEL_TAMPER_STATE") == "Open"
+        assert db.get_state_partition("ALARM_STATE", "1") == "Alarm"
+        assert all(isinstance(part, str) for key in db.table_qolsyssettings._values for part in key)
+
+    def test_adopted_database_keeps_cache(self, db: QolsysDB) -> None:
+        loaded = QolsysDB(db.backend)
+        _load_settings(loaded)
+
+        db.adopt(loaded)
+        assert db.get_setting_panel("AC_STATUS") == "Connected"
+        db.table_qolsyssettings.update("name=?", ["AC_STATUS"], {"value": "Disconnected"})
+        assert db.get_setting_panel("AC_STATUS") == "Disconnected"
+
+
+def _history(event_id: int, timestamp: int) -> dict[str, str]:
+    return {"_id": str(event_id), "events": "Disarmed", "time": str(timestamp)}
+
+
+class TestRetention:
+    def test_max_rows_keeps_most_recent_inserts(self, db: QolsysDB) -> None:
+        db.configure({"history": QolsysRetentionPolicy(max_rows=3)}, [])
+        history = db.table_history
+        history.insert_many([_history(event_id, 0) for event_id in range(1, 6)])
+        assert [row["_id"] for row in history.select()] == ["3", "4", "5"]
+
+        history.insert(_history(6, 0))
+        history.delete("_id=?", ["4"])
+        history.insert(_history(7, 0))
+        history.insert(_history(8, 0))
+        assert [row["_id"] for row in history.select()] == ["6", "7", "8"]
+
+    def test_max_age_drops_old_rows(self, db: QolsysDB) -> None:
+        now = int(time.time() * 1000)
+        db.configure({"history": QolsysRetentionPolicy(max_age=3600)}, [])
+        history = db.table_history
+
+        # Rows without a numeric time are kept
+        history.insert_many([_history(1, now - 7200 * 1000), _history(2, now), {"_id": "3", "time": ""}])
+        assert [row["_id"] for row in history.select()] == ["2", "3"]
+
+        # Checked at most once per interval on insert
+        history.insert(_history(4, now - 7200 * 1000))
+        assert len(history.select()) == 3
+
+    def test_unknown_table_is_reported(self, db: QolsysDB, caplog: pytest.LogCaptureFixture) -> None:
+        with caplog.at_level(logging.WARNING):
+            db.configure({"histories": QolsysRetentionPolicy(max_rows=1)}, ["no_such_table"])
+
+        assert "unknown table histories" in caplog.text
+        assert "unknown table no_such_table" in caplog.text
+
+    def test_ignored_table_is_not_stored(self, db: QolsysDB) -> None:
+        db.configure({}, ["heat_map"])
+        heat_map = db.table_heat_map
+        db.load_db([{"uri": heat_map.uri, "resultSet": [{"_id": "1"}]}])
+        heat_map.insert({"_id": "2"})
+        heat_map.update("_id=?", ["2"], {"_id": "3"})
+
+        assert heat_map.select() == []
+        assert heat_map.ignore_on_ingest
+
+    def test_memory_report(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["1", "2"])
+        db.table_history.insert(_history(1, 1700000000000))
+
+        report = db.memory_report()
+        assert report["backend"] == db.backend
+        assert set(report["tables"]) == {"sensor", "history"}
+        assert report["tables"]["sensor"]["rows"] == 2
+        assert report["tables"]["history"]["bytes"] == len("1" + "Disarmed" + "1700000000000")
+        assert report["rows"] == 3
+        assert report["bytes"] == sum(table["bytes"] for table in report["tables"].values())
+
+
+class TestChangeLog:
+    def test_row_changes_are_numbered(self, db: QolsysDB) -> None:
+        sensor = db.table_sensor
+        sensor.insert({"_id": "1", "zoneid": "1"})
+        sensor.insert({"_id": "1", "zoneid": "9"})  # ignored, primary key exists
+        sensor.insert({"_id": "2", "zoneid": "2"})
+        start = db.change_sequence
+        sensor.update("zoneid=?", ["2"], {"sensorstatus": "Open", "sensorname": "Door"})
+        sensor.update("zoneid=?", ["7"], {"sensorstatus": "Open"})  # no row
+        sensor.delete("zoneid=?", ["1"])
+
+        changes = db.changes_since(0).changes
+        assert [(change.sequence, change.operation, change.primary_key) for change in changes] == [
+            (1, "insert", "1"),
+            (2, "insert", "2"),
+            (3, "update", "2"),
+            (4, "delete", "1"),
+        ]
+        assert changes[0].columns == tuple(sensor.columns)
+        assert changes[2].columns == ("sensorname", "sensorstatus")
+
+        change_set = db.changes_since(start)
+        assert change_set.sequence == db.change_sequence == 4
+        assert [change.operation for change in change_set.changes] == ["update", "delete"]
+        assert not change_set.truncated
+        assert db.changes_since(4).changes == []
+
+    def test_load_and_adopt_reload_tables(self, db: QolsysDB) -> None:
+        _load_sensors(db, ["1", "2"])
+        assert [(change.operation, change.primary_key) for change in db.changes_since(0, ["sensor"]).changes] == [
+            ("reload", None)
+        ]
+
+        start = db.change_sequence
+        loaded = QolsysDB(db.backend)
+        _load_sensors(loaded, ["3"])
+        db.adopt(loaded)
+
+        change_set = db.changes_since(start, ["sensor"])
+        assert [(change.operation, change.primary_key) for change in change_set.changes] == [("reload", None)]
+        assert change_set.sequence > start
+
+    def test_truncated_tables(self, db: QolsysDB) -> None:
+        db.configure({}, [], change_log_size=2)
+        for zone in ("1", "2", "3"):
+            db.table_sensor.insert({"_id": zone, "zoneid": zone})
+
+        change_set = db.changes_since(0)
+        assert change_set.truncated == {"sensor"}
+        assert [change.primary_key for change in change_set.changes] == ["2", "3"]
+        assert not db.changes_since(1).truncated
+
+        # Sequence from another change log (restart): every table must be re-read
+        assert len(db.changes_since(100).truncated) == len(db.snapshot())
+
+    def test_disabled(self, db: QolsysDB) -> None:
+        db.configure({}, [], change_log_size=0)
+        _load_sensors(db, ["1"])
+        db.table_sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open"})
+
+        assert db.change_sequence == 0
+        assert db.changes_since(0).changes == []
+
+
+class TestDatabaseFile:
+    def test_rows_kept_across_reopen(self, tmp_path: Path) -> None:
+        path = tmp_path / "panel.db"
+        db = QolsysDB(path=path)
+        db.load_db(fake_database(zones=3))
+        zones = db.get_zones()
+
+        reopened = QolsysDB(path=path)
+        assert reopened.path == path
+        assert reopened.db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert reopened.get_zones() == zones
+
+    def test_adopt_copies_into_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "panel.db"
+        db = QolsysDB(path=path)
+        connection = db.db
+        loaded = QolsysDB()
+        loaded.load_db(fake_database(zones=2))
+        db.adopt(loaded)
+
+        assert db.db is connection
+        assert db.path == path
+        assert len(db.get_zones()) == 2
+        db.table_sensor.update("zoneid=?", ["1"], {"sensorstatus": "Open"})
+        assert QolsysDB(path=path).table_sensor.first("zoneid = ?", ["1"])["sensorstatus"] == "Open"  # type: ignore[index]
+
+    def test_invalid_files_are_recreated(self, tmp_path: Path) -> None:
+        path = tmp_path / "panel.db"
+        path.write_bytes(b"not a database" * 512)
+        assert QolsysDB(path=path).get_zones() == []
+
+        db = QolsysDB(path=path)
+        _load_sensors(db, ["1"])
+        db.db.execute("PRAGMA user_version=99")
+        assert QolsysDB(path=path).get_zones() == []
+
+    def test_table_with_another_layout_is_emptied(self, tmp_path: Path) -> None:
+        path = tmp_path / "panel.db"
+        db = QolsysDB(path=path)
+        db.load_db(fake_database(zones=2))
+        db.db.execute("ALTER TABLE sensor ADD COLUMN removed_column TEXT")
+        partitions = db.get_partitions()
+
+        reopened = QolsysDB(path=path)
+        assert reopened.get_zones() == []
+        assert reopened.get_partitions() == partitions
+        _load_sensors(reopened, ["1"])
+        assert len(reopened.get_zones()) == 1
+
+    def test_checkpoint(self, tmp_path: Path) -> None:
+        path = tmp_path / "panel.db"
+        db = QolsysDB(path=path)
+        db.load_db(fake_database(zones=2))
+        assert Path(f"{path}-wal").stat().st_size > 0
+
+        assert db.checkpoint(truncate=True)
+        assert Path(f"{path}-wal").stat().st_size == 0
+        assert not QolsysDB().checkpoint()
+
+    def test_requires_sqlite_backend(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="sqlite"):
+            QolsysDB("memory", tmp_path / "panel.db")
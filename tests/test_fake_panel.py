@@ -0,0 +1,95 @@
+"""End-to-end tests of the controller session against the local fake panel."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.enum_qolsys import ZoneStatus
+from qolsys_controller.errors import QolsysOperationTimeoutError
+from tests.fake_panel import FakePanel
+from tests.fake_panel.database import sensor_update
+
+# The fake panel broker needs the bridge extra
+pytest.importorskip("amqtt")
+
+
+@contextlib.asynccontextmanager
+async def _running_controller(panel: FakePanel) -> AsyncIterator[QolsysController]:
+    controller = QolsysController()
+    panel.configure(controller)
+    task = asyncio.create_task(controller.run_forever(reconnect=True, run_once=False, start_pairing=False))
+    try:
+        await asyncio.wait_for(controller.wait_until_connected(), timeout=20)
+        yield controller
+    finally:
+        await controller.stop()
+        await task
+
+
+async def _wait_for(predicate: object, timeout: float = 5) -> None:
+    async def poll() -> None:
+        while not predicate():  # type: ignore[operator]
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout=timeout)
+
+
+class TestFakePanelSession:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_session_initialization_and_db_changed_stream(self, tmp_path: Path) -> None:
+        async with FakePanel(tmp_path) as panel, _running_controller(panel) as controller:
+            assert {"connect_v204", "pingevent", "pair_status_request", "syncdatabase"} <= set(panel.commands)
+            assert len(controller.state.zones) == 4
+
+            updates = [sensor_update(zone, sensorstatus="Open") for zone in range(1, 5)]
+            await panel.emit_db_changed(updates, rate=200)
+
+            await _wait_for(lambda: all(zone.sensorstatus == ZoneStatus.OPEN for zone in controller.state.zones))
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_command_latency_and_loss(self, tmp_path: Path) -> None:
+        async with FakePanel(tmp_path, response_latency=0.05, response_loss=1.0) as panel:
+            async with _running_controller(panel) as controller:
+                controller.settings._mqtt_command_timeout = 1
+                with pytest.raises(QolsysOperationTimeoutError):
+                    await controller.commands.panel.timesync()
+
+            assert panel.dropped == 1
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_reconnect_after_panel_restart(self, tmp_path: Path) -> None:
+        async with FakePanel(tmp_path) as panel, _running_controller(panel) as controller:
+            await panel.disconnect_clients()
+
+            await _wait_for(lambda: panel.commands["syncdatabase"] == 2, timeout=20)
+            await asyncio.wait_for(controller.wait_until_connected(), timeout=10)
+            assert len(controller.state.zones) == 4
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_warm_start_serves_state_before_panel_sync(self, tmp_path: Path) -> None:
+        async with FakePanel(tmp_path) as panel:
+            async with _running_controller(panel) as controller:
+                controller.settings.warm_start = True
+
+            # Restart while the panel is unreachable
+            await panel.stop()
+            controller = QolsysController()
+            panel.configure(controller)
+            controller.settings.warm_start = True
+            task = asyncio.create_task(controller.run_forever(reconnect=True, run_once=False, start_pairing=False))
+            try:
+                await _wait_for(lambda: len(controller.state.zones) == 4)
+                assert controller.state_stale
+
+                await panel.start()
+                await asyncio.wait_for(controller.wait_until_connected(), timeout=20)
+                assert not controller.state_stale
+            finally:
+                await controller.stop()
+                await task
@@ -0,0 +1,109 @@
+"""Tests for QolsysIq2meidCoalescer — merging bursts of dbChanged updates."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from qolsys_controller.iq2meid_coalescer import QolsysIq2meidCoalescer
+
+SENSOR_URI = "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor"
+AUTOMATION_URI = "content://com.qolsys.qolsysprovider.AutomationDeviceContentProvider/automation"
+STATE_URI = "content://com.qolsys.qolsysprovider.StateContentProvider/state"
+
+
+def _update(uri: str, zone_id: str, **content_values: str) -> dict[str, Any]:
+    return {
+        "eventName": "dbChanged",
+        "dbOperation": "update",
+        "uri": uri,
+        "selection": "zoneid=?",
+        "selectionArgs": [zone_id],
+        "contentValues": {"zoneid": zone_id, **content_values},
+    }
+
+
+def _make_coalescer() -> tuple[QolsysIq2meidCoalescer, list[dict[str, Any]]]:
+    applied: list[dict[str, Any]] = []
+    return QolsysIq2meidCoalescer(applied.append), applied
+
+
+class TestQolsysIq2meidCoalescer:
+    def test_disabled_applies_immediately(self) -> None:
+        coalescer, applied = _make_coalescer()
+        coalescer.submit(_update(SENSOR_URI, "1", sensor_dbm="-40"), window_ms=0)
+        coalescer.submit(_update(SENSOR_URI, "1", sensor_dbm="-41"), window_ms=0)
+        assert len(applied) == 2
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_merges_updates_to_same_row_within_window(self) -> None:
+        coalescer, applied = _make_coalescer()
+        coalescer.submit(_update(SENSOR_URI, "1", sensor_dbm="-40"), window_ms=10)
+        coalescer.submit(_update(SENSOR_URI, "1", battery_status="Normal"), window_ms=10)
+        coalescer.submit(_update(SENSOR_URI, "1", sensor_dbm="-42"), window_ms=10)
+        coalescer.submit(_update(SENSOR_URI, "2", sensor_dbm="-50"), window_ms=10)
+        assert applied == []
+
+        await asyncio.sleep(0.03)
+
+        assert [message["contentValues"] for message in applied] == [
+            {"zoneid": "1", "sensor_dbm": "-42", "battery_status": "Normal"},
+            {"zoneid": "2", "sensor_dbm": "-50"},
+        ]
+        assert coalescer.stats() == {"received": 4, "applied": 2, "coalesced": 2, "critical": 0, "pending": 0}
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_critical_field_is_not_delayed(self) -> None:
+        coalescer, applied = _make_coalescer()
+        coalescer.submit(_update(SENSOR_URI, "2", sensor_dbm="-50"), window_ms=1000)
+        coalescer.submit(_update(SENSOR_URI, "1", sensor_dbm="-40"), window_ms=1000)
+        coalescer.submit(_update(SENSOR_URI, "1", sensorstatus="Open"), window_ms=1000)
+
+        # Flushed in arrival order, merged row carries the critical field
+        assert [message["contentValues"] for message in applied] == [
+            {"zoneid": "2", "sensor_dbm": "-50"},
+            {"zoneid": "1", "sensor_dbm": "-40", "sensorstatus": "Open"},
+        ]
+        assert coalescer.stats()["critical"] == 1
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_automation_state_is_not_delayed(self) -> None:
+        coalescer, applied = _make_coalescer()
+        update = _update(AUTOMATION_URI, "3", state="Locked")
+        coalescer.submit(update, window_ms=1000)
+
+        assert [message["contentValues"] for message in applied] == [update["contentValues"]]
+        assert coalescer.stats()["critical"] == 1
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_non_coalescable_message_flushes_pending_first(self) -> None:
+        coalescer, applied = _make_coalescer()
+        coalescer.submit(_update(SENSOR_URI, "1", sensor_dbm="-40"), window_ms=1000)
+        state_update = _update(STATE_URI, "1", name="ALARM_STATE", value="ALARM")
+        coalescer.submit(state_update, window_ms=1000)
+        delete = {"eventName": "dbChanged", "dbOperation": "delete", "uri": SENSOR_URI, "selection": "zoneid=?"}
+        coalescer.submit(delete, window_ms=1000)
+
+        assert [message["uri"] for message in applied] == [SENSOR_URI, STATE_URI, SENSOR_URI]
+        assert applied[1] is state_update
+        assert applied[2] is delete
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_failed_update_does_not_drop_the_others(self, caplog: pytest.LogCaptureFixture) -> None:
+        applied: list[dict[str, Any]] = []
+
+        def apply(data: dict[str, Any]) -> None:
+            if data["selectionArgs"] == ["2"]:
+                raise ValueError("bad row")
+            applied.append(data)
+
+        coalescer = QolsysIq2meidCoalescer(apply)
+        for zone_id in ("1", "2", "3"):
+            coalescer.submit(_update(SENSOR_URI, zone_id, sensor_dbm="-40"), window_ms=1000)
+        coalescer.flush()
+
+        assert [message["selectionArgs"] for message in applied] == [["1"], ["3"]]
+        assert "Coalesced dbChanged update not applied" in caplog.text
+        assert coalescer.stats()["pending"] == 0
@@ -0,0 +1,92 @@
+"""Tests for the pluggable JSON codec."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib.util
+import json
+from typing import Any
+
+import pytest
+
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.json_codec import JSON_CODECS, QolsysJsonCodec, create_json_codec
+from qolsys_controller.mqtt_command import MQTTCommand_Automation
+
+PAYLOAD = {
+    "eventName": "dbChanged",
+    "dbOperation": "update",
+    "selectionArgs": ["1", "2"],
+    "contentValues": {"sensorstatus": "Open", "zoneid": 7, "nested": {"a": None, "b": 1.5, "c": True}},
+    "unicode": "Entrée",
+}
+
+
+def _codec(name: str) -> QolsysJsonCodec:
+    codec = create_json_codec(name)
+    if codec.name != name:
+        pytest.skip(f"{name} not installed")
+    return codec
+
+
+@pytest.mark.parametrize("name", JSON_CODECS[1:])
+class TestJsonCodec:
+    def test_dumps_returns_bytes_readable_by_stdlib(self, name: str) -> None:
+        encoded = _codec(name).dumps(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == PAYLOAD
+
+    def test_dumps_str(self, name: str) -> None:
+        assert json.loads(_codec(name).dumps_str(PAYLOAD)) == PAYLOAD
+
+    def test_loads_bytes_and_str(self, name: str) -> None:
+        codec = _codec(name)
+        text = json.dumps(PAYLOAD)
+        assert codec.loads(text) == PAYLOAD
+        assert codec.loads(text.encode()) == PAYLOAD
+
+    def test_invalid_payload_raises_value_error(self, name: str) -> None:
+        codec = _codec(name)
+        with pytest.raises(ValueError):
+            codec.loads(b"{not json")
+        with pytest.raises(ValueError):
+            codec.loads(b"\xff\xfe")
+
+
+class TestCreateJsonCodec:
+    def test_unknown_name_falls_back_to_stdlib(self) -> None:
+        assert create_json_codec("simdjson").name == "stdlib"
+
+    def test_auto_prefers_fast_codec_when_available(self) -> None:
+        installed = [name for name in ("orjson", "msgspec") if importlib.util.find_spec(name) is not None]
+        if not installed:
+            pytest.skip("no fast codec installed")
+        assert create_json_codec("auto").name == installed[0]
+
+
+class TestOutgoingPayloads:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_panel_commands_are_encoded_by_the_codec(self) -> None:
+        controller = QolsysController()
+        controller.settings.json_codec = "auto"
+        published: list[Any] = []
+
+        class _Client:
+            async def publish(self, topic: str, payload: Any, qos: int) -> None:
+                published.append(payload)
+
+        command = MQTTCommand_Automation(controller, 7, 0, 1, "Entrée")
+        controller.enqueue_mqtt_command(command)
+        publish_task = asyncio.create_task(controller.mqtt_publish_task(_Client()))  # type: ignore[arg-type]
+        while not published:
+            await asyncio.sleep(0)
+        publish_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await publish_task
+
+        # Published as bytes, nested dataValue strings decode to the same operation
+        assert published == [controller.settings.codec.dumps(command._payload)]
+        payload = json.loads(published[0])
+        assert payload == command._payload
+        assert json.loads(payload["ipcRequest"][0]["dataValue"])["expected_result"] == "Entrée"
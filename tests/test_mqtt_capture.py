@@ -0,0 +1,91 @@
+"""Tests for MQTT traffic capture and replay."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.mqtt_capture import QolsysMqttCapture, read_capture, replay_capture
+
+UPDATE = {"eventName": "dbChanged", "dbOperation": "update", "uri": "content://x"}
+
+
+def _write_capture(path: Path, messages: list[tuple[str, dict[str, Any]]]) -> None:
+    capture = QolsysMqttCapture(path)
+    capture.open()
+    for topic, payload in messages:
+        capture.write(topic, json.dumps(payload).encode())
+    capture.close()
+
+
+class TestQolsysMqttCapture:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        path = tmp_path / "capture.jsonl.gz"
+        _write_capture(path, [("iq2meid", UPDATE), ("ZWAVE_RESPONSE", {"ZWAVE_RESPONSE": {}})])
+
+        captured = list(read_capture(path))
+        assert [message.topic for message in captured] == ["iq2meid", "ZWAVE_RESPONSE"]
+        assert json.loads(captured[0].payload) == UPDATE
+        assert 0 <= captured[0].timestamp <= captured[1].timestamp
+
+    def test_reopen_appends_session(self, tmp_path: Path) -> None:
+        path = tmp_path / "capture.jsonl.gz"
+        _write_capture(path, [("iq2meid", UPDATE)])
+        _write_capture(path, [("iq2meid", UPDATE)])
+
+        captured = list(read_capture(path))
+        assert len(captured) == 2
+        assert captured[1].timestamp >= captured[0].timestamp
+
+    def test_write_before_open_is_ignored(self, tmp_path: Path) -> None:
+        capture = QolsysMqttCapture(tmp_path / "capture.jsonl.gz")
+        capture.write("iq2meid", b"{}")
+        assert capture.count == 0
+
+
+class TestReplayCapture:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_replay_routes_messages(self, tmp_path: Path) -> None:
+        path = tmp_path / "capture.jsonl.gz"
+        database = [{"uri": "content://x", "resultSet": []}]
+        _write_capture(
+            path,
+            [
+                ("response_aa:bb:cc:dd:ee:ff", {"requestID": "1", "fulldbdata": database}),
+                ("iq2meid", UPDATE),
+                ("ZWAVE_RESPONSE", {"ZWAVE_RESPONSE": {"NODE_ID": 3}}),
+                ("mastermeid", {"eventName": "pingevent"}),
+            ],
+        )
+
+        controller = QolsysController()
+        controller.panel.load_database = AsyncMock()  # type: ignore[method-assign]
+        controller.panel.parse_iq2meid_message = MagicMock()  # type: ignore[method-assign]
+        controller.panel.parse_zwave_message = MagicMock()  # type: ignore[method-assign]
+
+        result = await replay_capture(controller, path, speed=0)
+
+        assert result["messages"] == 4
+        controller.panel.load_database.assert_awaited_once_with(database)
+        controller.panel.parse_iq2meid_message.assert_called_once_with(UPDATE)
+        controller.panel.parse_zwave_message.assert_called_once()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_replay_acknowledges_commands(self, tmp_path: Path) -> None:
+        path = tmp_path / "capture.jsonl.gz"
+        _write_capture(path, [("iq2meid", UPDATE)])
+
+        controller = QolsysController()
+
+        async def ping(_: object) -> None:
+            # Would wait mqtt_command_timeout for a panel response if the replay did not acknowledge it
+            await controller.commands.panel.pingevent()
+
+        controller.handle_mqtt_message = AsyncMock(side_effect=ping)  # type: ignore[method-assign]
+        result = await replay_capture(controller, path, speed=0)
+        assert result["messages"] == 1
@@ -0,0 +1,186 @@
+"""Tests for the MQTT ingress pipeline — bounded queue, overflow policies and stage routing."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import aiomqtt
+import pytest
+
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.errors import QolsysConfigError
+from qolsys_controller.mqtt_ingress_queue import QolsysMqttIngressQueue
+
+
+def _message(topic: str, payload: dict[str, Any] | bytes) -> aiomqtt.Message:
+    data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return aiomqtt.Message(topic, data, qos=0, retain=False, mid=0, properties=None)
+
+
+class _FakeClient:
+    def __init__(self, messages: list[aiomqtt.Message]) -> None:
+        self._messages = messages
+
+    @property
+    async def messages(self) -> Any:
+        for message in self._messages:
+            yield message
+
+
+class TestQolsysMqttIngressQueue:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_fifo_and_stats(self) -> None:
+        queue = QolsysMqttIngressQueue(maxsize=10)
+        for i in range(3):
+            await queue.put(_message("iq2meid", {"i": i}))
+
+        assert queue.depth == 3
+        assert [json.loads((await queue.get()).payload)["i"] for _ in range(3)] == [0, 1, 2]
+        queue.record_apply(0.002)
+
+        stats = queue.stats()
+        assert stats["reader"]["received"] == 3
+        assert stats["queue"]["depth"] == 0
+        assert stats["queue"]["max_depth"] == 3
+        assert stats["queue"]["wait"]["count"] == 3
+        assert stats["apply"]["count"] == 1
+        assert stats["apply"]["max_ms"] == pytest.approx(2.0)
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_drop_oldest(self) -> None:
+        queue = QolsysMqttIngressQueue(maxsize=2, overflow_policy="drop_oldest")
+        for i in range(3):
+            await queue.put(_message("iq2meid", {"i": i}))
+
+        assert [json.loads((await queue.get()).payload)["i"] for _ in range(2)] == [1, 2]
+        assert queue.stats()["queue"]["dropped"] == 1
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_drop_newest(self) -> None:
+        queue = QolsysMqttIngressQueue(maxsize=2, overflow_policy="drop_newest")
+        for i in range(3):
+            await queue.put(_message("iq2meid", {"i": i}))
+
+        assert [json.loads((await queue.get()).payload)["i"] for _ in range(2)] == [0, 1]
+        assert queue.stats()["queue"]["dropped"] == 1
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_block_holds_messages_without_blocking_the_reader(self) -> None:
+        queue = QolsysMqttIngressQueue(maxsize=1, overflow_policy="block")
+        for i in range(3):
+            await asyncio.wait_for(queue.put(_message("iq2meid", {"i": i})), timeout=1)
+
+        assert queue.depth == 3
+        assert queue.stats()["queue"]["held"] == 2
+        assert [json.loads((await queue.get()).payload)["i"] for _ in range(3)] == [0, 1, 2]
+        assert queue.stats()["queue"]["dropped"] == 0
+        assert queue.stats()["queue"]["max_held"] == 2
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_snapshot_supersedes_queued_messages(self) -> None:
+        queue = QolsysMqttIngressQueue(maxsize=10)
+        await queue.put(_message("iq2meid", {"i": 0}))
+        queue.mark_snapshot()
+        await queue.put(_message("iq2meid", {"i": 1}))
+
+        sequence, message = await queue.get_with_sequence()
+        assert json.loads(message.payload)["i"] == 1
+        assert not queue.superseded(sequence)
+        assert queue.superseded(sequence - 1)
+        assert queue.stats()["queue"]["superseded"] == 1
+
+    def test_invalid_policy(self) -> None:
+        with pytest.raises(QolsysConfigError):
+            QolsysMqttIngressQueue(overflow_policy="spill")
+
+
+class TestMqttIngressStages:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_responses_bypass_queue_and_updates_are_queued(self) -> None:
+        controller = QolsysController()
+        controller.settings.random_mac = "aa:bb:cc:dd:ee:ff"
+        controller._mqtt_command_queue.handle_response = AsyncMock()  # type: ignore[method-assign]
+        update = {"eventName": "dbChanged", "dbOperation": "update", "uri": "content://x"}
+        client = _FakeClient(
+            [
+                _message("iq2meid", update),
+                _message("response_aa:bb:cc:dd:ee:ff", {"requestID": "1"}),
+                _message("iq2meid", b"{invalid"),
+            ]
+        )
+
+        await controller.mqtt_listen_task(client)  # type: ignore[arg-type]
+
+        controller._mqtt_command_queue.handle_response.assert_awaited_once_with({"requestID": "1"})
+        assert controller.mqtt_ingress_queue.depth == 2
+        assert controller.mqtt_ingress_queue.stats()["reader"]["fast_path"] == 1
+
+        controller.panel.parse_iq2meid_message = MagicMock()  # type: ignore[method-assign]
+        apply_task = asyncio.create_task(controller.mqtt_apply_task())
+        while controller.mqtt_ingress_queue.depth:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        apply_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await apply_task
+
+        controller.panel.parse_iq2meid_message.assert_called_once_with(update)
+        # Both queued messages went through the apply stage, the invalid one is dropped after decoding
+        assert controller.mqtt_ingress_queue.stats()["apply"]["count"] == 2
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_updates_queued_before_sync_response_are_not_applied(self) -> None:
+        controller = QolsysController()
+        controller.settings.random_mac = "aa:bb:cc:dd:ee:ff"
+        controller._mqtt_command_queue.handle_response = AsyncMock()  # type: ignore[method-assign]
+        stale = {"eventName": "dbChanged", "dbOperation": "update", "uri": "content://x", "contentValues": {"v": "old"}}
+        fresh = {"eventName": "dbChanged", "dbOperation": "update", "uri": "content://x", "contentValues": {"v": "new"}}
+        sync = {"requestID": "1", "fulldbdata": []}
+        client = _FakeClient(
+            [
+                _message("iq2meid", stale),
+                _message("iq2meid", stale),
+                _message("response_aa:bb:cc:dd:ee:ff", sync),
+                _message("iq2meid", fresh),
+                _message("response_aa:bb:cc:dd:ee:ff", {"requestID": "2"}),
+            ]
+        )
+
+        # The snapshot response overtakes the queued updates through the fast path
+        await controller.mqtt_listen_task(client)  # type: ignore[arg-type]
+        controller._mqtt_command_queue.handle_response.assert_any_await(sync)
+        assert controller.mqtt_ingress_queue.depth == 3
+
+        controller.panel.parse_iq2meid_message = MagicMock()  # type: ignore[method-assign]
+        apply_task = asyncio.create_task(controller.mqtt_apply_task())
+        while controller.mqtt_ingress_queue.depth:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        apply_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await apply_task
+
+        controller.panel.parse_iq2meid_message.assert_called_once_with(fresh)
+        assert controller.mqtt_ingress_queue.stats()["queue"]["superseded"] == 2
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_response_reaches_waiter_when_queue_is_full(self) -> None:
+        controller = QolsysController()
+        controller.settings.random_mac = "aa:bb:cc:dd:ee:ff"
+        controller._mqtt_ingress_queue = QolsysMqttIngressQueue(maxsize=1, overflow_policy="block")
+        update = {"eventName": "dbChanged", "dbOperation": "update", "uri": "content://x"}
+        client = _FakeClient(
+            [*[_message("iq2meid", update) for _ in range(3)], _message("response_aa:bb:cc:dd:ee:ff", {"requestID": "1"})]
+        )
+
+        # No apply stage runs: the response must not wait for the queued updates
+        waiter = asyncio.create_task(controller.mqtt_command_queue.wait_for_response("1", timeout=1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(controller.mqtt_listen_task(client), timeout=1)  # type: ignore[arg-type]
+
+        assert await waiter == {"requestID": "1"}
+        assert controller.mqtt_ingress_queue.depth == 3
@@ -0,0 +1,250 @@
+"""Tests for QolsysPanel — iq2meid dbChanged dispatch and database loading."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from qolsys_controller.database.db import QolsysDB
+from qolsys_controller.panel import QolsysPanel
+
+SENSOR_URI = "content://com.qolsys.qolsysprovider.SensorContentProvider/sensor"
+HISTORY_URI = "content://com.qolsys.qolsysprovider.HistoryContentProvider/history"
+
+
+def _make_panel() -> tuple[QolsysPanel, MagicMock]:
+    controller = MagicMock()
+    controller.settings.iq2meid_coalesce_window_ms = 0
+    controller.settings.database_backend = "sqlite"
+    controller.settings.database_retention = {}
+    controller.settings.database_ignore_tables = []
+    controller.settings.database_change_log_size = 500
+    return QolsysPanel(controller), controller
+
+
+def _message(operation: str, uri: str, **kwargs: object) -> dict[str, object]:
+    return {"eventName": "dbChanged", "dbOperation": operation, "uri": uri, **kwargs}
+
+
+class TestIq2meidDispatch:
+    def test_sensor_update_writes_db_and_updates_zone(self) -> None:
+        panel, controller = _make_panel()
+        panel.db.table_sensor.insert({"_id": "1", "zoneid": "1", "sensorstatus": "Closed"})
+
+        content_values = {"zoneid": "1", "sensorstatus": "Open"}
+        panel.parse_iq2meid_message(
+            _message("update", SENSOR_URI, selection="zoneid=?", selectionArgs=["1"], contentValues=content_values)
+        )
+
+        assert panel.db.get_zones()[0]["sensorstatus"] == "Open"
+        controller.state.zone.assert_called_once_with(zone_id="1")
+        controller.state.zone.return_value.update.assert_called_once_with(content_values)
+
+    def test_unchanged_sensor_update_skips_zone(self) -> None:
+        panel, controller = _make_panel()
+        panel.db.table_sensor.insert({"_id": "1", "zoneid": "1", "sensorstatus": "Closed"})
+
+        panel.parse_iq2meid_message(
+            _message(
+                "update",
+                SENSOR_URI,
+                selection="zoneid=?",
+                selectionArgs=["1"],
+                contentValues={"zoneid": "1", "sensorstatus": "Closed"},
+            )
+        )
+
+        controller.state.zone.assert_not_called()
+        assert panel.db.update_stats() == {"sensor": {"effective": 0, "noop": 1}}
+
+    def test_unchanged_settings_and_state_updates_skip_domain(self) -> None:
+        panel, controller = _make_panel()
+        settings_uri = panel.db.table_qolsyssettings.uri
+        state_uri = panel.db.table_state.uri
+        panel.db.table_qolsyssettings.insert({"_id": "1", "name": "AC_STATUS", "value": "Connected", "partition_id": "0"})
+        panel.db.table_state.insert({"_id": "1", "name": "ALARM_STATE", "value": "None", "partition_id": "0"})
+
+        settings = {"name": "AC_STATUS", "value": "Disconnected", "partition_id": "0"}
+        state = {"name": "ALARM_STATE", "value": "Alarm", "partition_id": "0"}
+        for _ in range(2):
+            panel.parse_iq2meid_message(
+                _message("update", settings_uri, selection="name=?", selectionArgs=["AC_STATUS"], contentValues=settings)
+            )
+            panel.parse_iq2meid_message(
+                _message("update", state_uri, selection="name=?", selectionArgs=["ALARM_STATE"], contentValues=state)
+            )
+
+        # Only the first update of each changed a value
+        controller.state.notify.assert_called_once()
+        controller.state.partition.assert_called_once_with("0")
+
+    def test_sensor_insert_syncs_zones(self) -> None:
+        panel, controller = _make_panel()
+        panel.parse_iq2meid_message(_message("insert", SENSOR_URI, contentValues={"_id": "1", "zoneid": "1"}))
+        controller.state.sync_zones_data.assert_called_once()
+
+    def test_db_only_table_insert(self) -> None:
+        panel, controller = _make_panel()
+        panel.parse_iq2meid_message(_message("insert", HISTORY_URI, contentValues={"_id": "7", "events": "Open"}))
+        panel.db.cursor.execute("SELECT events FROM history WHERE _id = '7'")
+        assert panel.db.cursor.fetchone() == ("Open",)
+        controller.state.notify.assert_not_called()
+
+    def test_unknown_uri_and_operation_ignored(self) -> None:
+        panel, _ = _make_panel()
+        panel.parse_iq2meid_message(_message("update", "content://unknown/table", contentValues={}))
+        panel.parse_iq2meid_message(_message("upsert", SENSOR_URI, contentValues={}))
+
+    def test_register_custom_handler(self) -> None:
+        panel, _ = _make_panel()
+        handler = MagicMock()
+        panel.register_iq2meid_handler("update", "content://custom/table", handler)
+        message = _message("update", "content://custom/table")
+        panel.parse_iq2meid_message(message)
+        handler.assert_called_once_with(message)
+
+
+def _database(zone_count: int) -> list[dict[str, object]]:
+    zones = [{"_id": str(i), "zoneid": str(i), "sensorstatus": "Closed"} for i in range(1, zone_count + 1)]
+    return [{"uri": SENSOR_URI, "resultSet": zones}]
+
+
+class TestLoadDatabase:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_small_database_loads_on_event_loop(self) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = 100
+        table = panel.db.table_sensor
+
+        with patch.object(QolsysPanel, "_load_db_worker") as worker:
+            await panel.load_database(_database(3))
+
+        worker.assert_not_called()
+        assert panel.db.table_sensor is table
+        assert len(panel.db.get_zones()) == 3
+        controller.state.sync_zones_data.assert_called_once()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_large_database_loads_in_worker_and_replays_changes(self) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = 2
+        table = panel.db.table_sensor
+        load_db_worker = QolsysPanel._load_db_worker
+
+        def worker(db: QolsysDB, database: object) -> object:
+            # dbChanged received while the snapshot is being loaded
+            panel.parse_iq2meid_message(
+                _message(
+                    "update", SENSOR_URI, selection="zoneid=?", selectionArgs=["2"], contentValues={"sensorstatus": "Open"}
+                )
+            )
+            return load_db_worker(db, database)
+
+        with patch.object(QolsysPanel, "_load_db_worker", side_effect=worker):
+            await panel.load_database(_database(3))
+
+        assert panel.db.table_sensor is table
+        zones = {zone["zoneid"]: zone["sensorstatus"] for zone in panel.db.get_zones()}
+        assert zones == {"1": "Closed", "2": "Open", "3": "Closed"}
+        assert panel._iq2meid_pending is None
+        controller.state.sync_zones_data.assert_called_once()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_database_backend_setting_applied_on_load(self) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = 100
+        controller.settings.database_backend = "memory"
+        table = panel.db.table_sensor
+
+        await panel.load_database(_database(3))
+        panel.parse_iq2meid_message(
+            _message("update", SENSOR_URI, selection="zoneid=?", selectionArgs=["2"], contentValues={"sensorstatus": "Open"})
+        )
+
+        assert panel.db.backend == "memory"
+        assert panel.db.table_sensor is table
+        assert {zone["zoneid"]: zone["sensorstatus"] for zone in panel.db.get_zones()} == {
+            "1": "Closed",
+            "2": "Open",
+            "3": "Closed",
+        }
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    @pytest.mark.parametrize("threshold", [100, 2])  # type: ignore[untyped-decorator]
+    async def test_change_log_size_setting_applied_on_load(self, threshold: int) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = threshold
+        controller.settings.database_change_log_size = 0
+
+        await panel.load_database(_database(3))
+        panel.parse_iq2meid_message(
+            _message("update", SENSOR_URI, selection="zoneid=?", selectionArgs=["2"], contentValues={"sensorstatus": "Open"})
+        )
+
+        assert panel.db.change_sequence == 0
+
+
+class TestIncrementalResync:
+    def test_db_diff_by_primary_key(self) -> None:
+        panel, _ = _make_panel()
+        panel.db.load_db(_database(3))
+        snapshot = panel.db.snapshot()
+
+        database = _database(4)
+        database[0]["resultSet"][1]["sensorstatus"] = "Open"  # type: ignore[index]
+        del database[0]["resultSet"][0]  # type: ignore[attr-defined]
+        panel.db.load_db(database)
+
+        diff = panel.db.diff(snapshot)
+        assert list(diff) == ["sensor"]
+        assert [row["zoneid"] for row in diff["sensor"].inserted] == ["4"]
+        assert [row["zoneid"] for row in diff["sensor"].changed] == ["2"]
+        assert [row["zoneid"] for row in diff["sensor"].deleted] == ["1"]
+        assert diff["sensor"].values("zoneid") == {"1", "2", "4"}
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    @pytest.mark.parametrize("threshold", [100, 2])  # type: ignore[untyped-decorator]
+    async def test_reconnect_applies_changed_rows_only(self, threshold: int) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = threshold
+        controller.settings.incremental_resync = True
+        await panel.load_database(_database(3))
+        controller.state.reset_mock()
+
+        database = _database(3)
+        database[0]["resultSet"][1]["sensorstatus"] = "Open"  # type: ignore[index]
+        await panel.load_database(database)
+
+        controller.state.sync_zones_data.assert_called_once()
+        assert controller.state.sync_zones_data.call_args.kwargs["changed_ids"] == {"2"}
+        controller.state.sync_partitions_data.assert_not_called()
+        controller.state.sync_automation_devices_data.assert_not_called()
+        assert panel.db.get_zones()[1]["sensorstatus"] == "Open"
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_unchanged_snapshot_skips_domain_sync(self) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = 100
+        controller.settings.incremental_resync = True
+        await panel.load_database(_database(3))
+        controller.state.reset_mock()
+
+        await panel.load_database(_database(3))
+
+        controller.state.sync_zones_data.assert_not_called()
+        controller.state.sync_weather_data.assert_not_called()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_disabled_resync_syncs_everything(self) -> None:
+        panel, controller = _make_panel()
+        controller.settings.sync_database_thread_threshold = 100
+        controller.settings.incremental_resync = False
+        await panel.load_database(_database(3))
+        controller.state.reset_mock()
+
+        await panel.load_database(_database(3))
+
+        controller.state.sync_zones_data.assert_called_once()
+        assert "changed_ids" not in controller.state.sync_zones_data.call_args.kwargs
+        controller.state.sync_weather_data.assert_called_once()
@@ -49,6 +49,13 @@ class TestAlarmTypeMapping:
         partition.append_alarm_type([PartitionAlarmType.GLASS_BREAK, PartitionAlarmType.ENTRY_EXIT_NORMAL_DELAY])
         assert partition.alarm_type_array.count(PartitionAlarmType.POLICE_EMERGENCY) == 1
 
+    def test_alarm_types_at_construction(self) -> None:
+        partition = _make_partition(
+            alarm_types=[PartitionAlarmType.GLASS_BREAK], quick_exit_state=PartitionQuickExitState.STARTED
+        )
+        assert partition.alarm_type_array == [PartitionAlarmType.POLICE_EMERGENCY]
+        assert partition.quick_exit_state == PartitionQuickExitState.STARTED
+
 
 class TestPartitionUpdate:
     def test_update_system_status(self) -> None:
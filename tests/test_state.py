@@ -0,0 +1,149 @@
+"""Tests for QolsysState — entity lookups by id, their indexes and the sync_*_data reconciliation."""
+
+from __future__ import annotations
+
+from qolsys_controller.automation_adc.device import QolsysAutomationDeviceADC
+from qolsys_controller.controller import QolsysController
+from qolsys_controller.enum_qolsys import QolsysNotification
+from qolsys_controller.scene import QolsysScene
+from qolsys_controller.zone import QolsysZone
+
+
+def _make_zone(controller: QolsysController, zone_id: str, short_id: str = "") -> QolsysZone:
+    data = {
+        "zoneid": zone_id,
+        "sensorname": f"Zone {zone_id}",
+        "sensorstatus": "Closed",
+        "sensortype": "Door_Window",
+        "partition_id": "0",
+        "shortID": short_id,
+    }
+    return QolsysZone(data, controller.settings)
+
+
+class TestLookups:
+    def test_zone_indexes_follow_add_and_delete(self) -> None:
+        controller = QolsysController()
+        state = controller.state
+        state.zone_add(_make_zone(controller, "1", short_id="101"))
+        state.zone_add(_make_zone(controller, "2"))
+        duplicate = _make_zone(controller, "1")
+        state.zone_add(duplicate)
+
+        assert [zone.zone_id for zone in state.zones] == ["1", "2"]
+        assert state.zone("1") is state.zones[0]
+        assert state.zone("1") is not duplicate
+        assert state.zone_from_short_id(101) is state.zones[0]
+        assert state.zone("3") is None
+
+        state.zone_delete("1")
+        assert state.zone("1") is None
+        assert state.zone_from_short_id(101) is None
+        assert [zone.zone_id for zone in state.zones] == ["2"]
+
+    def test_shared_short_id_falls_back_to_the_remaining_zone(self) -> None:
+        controller = QolsysController()
+        state = controller.state
+        state.zone_add(_make_zone(controller, "1", short_id="101"))
+        state.zone_add(_make_zone(controller, "2", short_id="101"))
+
+        assert state.zone_from_short_id(101) is state.zone("1")
+        state.zone_delete("1")
+        assert state.zone_from_short_id(101) is state.zone("2")
+
+    def test_scene_indexes_follow_add_and_delete(self) -> None:
+        state = QolsysController().state
+        state.scene_add(QolsysScene({"scene_id": "4", "name": "Night"}))
+
+        assert state.scene("4") is state.scenes[0]
+        state.scene_delete("4")
+        assert state.scene("4") is None
+        assert state.scenes == []
+
+    def test_automation_device_follows_virtual_node_id_change(self) -> None:
+        controller = QolsysController()
+        state = controller.state
+        device = QolsysAutomationDeviceADC(controller, {"device_id": "7", "name": "Plug"})
+        state.automation_device_add(device)
+        assert state.automation_device("7") is device
+
+        device.virtual_node_id = "8"
+        assert state.automation_device("7") is None
+        assert state.automation_device("8") is device
+
+        state.automation_device_delete("8")
+        assert state.automation_device("8") is None
+        assert state.automation_devices == []
+
+        # Devices not in the state do not touch the index
+        other = QolsysAutomationDeviceADC(controller, {"device_id": "9", "name": "Light"})
+        other.virtual_node_id = "8"
+        assert state.automation_device("8") is None
+
+    def test_automation_device_renamed_to_an_existing_id(self) -> None:
+        controller = QolsysController()
+        state = controller.state
+        device = QolsysAutomationDeviceADC(controller, {"device_id": "7", "name": "Plug"})
+        other = QolsysAutomationDeviceADC(controller, {"device_id": "8", "name": "Light"})
+        state.automation_device_add(device)
+        state.automation_device_add(other)
+
+        device.virtual_node_id = "8"
+        assert state.automation_device("7") is None
+        assert state.automation_device("8") is other
+        assert state.automation_devices == [other]
+
+        # The list and the index agree, a later sync deletes the remaining device
+        assert state.sync_automation_devices_data([]) == 1
+        assert state.automation_device("8") is None
+        assert state.automation_devices == []
+
+
+class TestSync:
+    def test_zones_reconciled_by_id(self) -> None:
+        controller = QolsysController()
+        state = controller.state
+        events: list[tuple[QolsysNotification, int]] = []
+        for notification in (QolsysNotification.ZONE_ADD, QolsysNotification.ZONE_DELETE):
+            state.register(notification, lambda event: events.append((event.type, event.data["id"])))
+
+        assert state.sync_zones_data([_make_zone(controller, zone_id) for zone_id in ("3", "1", "2")]) == 3
+        assert [zone.zone_id for zone in state.zones] == ["1", "2", "3"]
+        assert [zone_id for _, zone_id in events] == [3, 1, 2]
+
+        # Zone 2 changes, zone 3 is unchanged, zones 1 and 10 are deleted and added back in database order
+        events.clear()
+        zone_2 = _make_zone(controller, "2")
+        zone_2.sensorname = "Kitchen"
+        db_zones = [_make_zone(controller, "10"), zone_2, _make_zone(controller, "3"), _make_zone(controller, "4")]
+        assert state.sync_zones_data(db_zones) == 4
+        assert events == [
+            (QolsysNotification.ZONE_DELETE, 1),
+            (QolsysNotification.ZONE_ADD, 10),
+            (QolsysNotification.ZONE_ADD, 4),
+        ]
+        assert [zone.zone_id for zone in state.zones] == ["10", "2", "3", "4"]
+        assert state.zone("2").sensorname == "Kitchen"  # type: ignore[union-attr]
+        assert state.zone("1") is None
+
+        assert state.sync_zones_data(db_zones) == 0
+
+    def test_changed_ids_limit_updates(self) -> None:
+        controller = QolsysController()
+        state = controller.state
+        state.sync_zones_data([_make_zone(controller, "1"), _make_zone(controller, "2")])
+
+        db_zones = [_make_zone(controller, "1"), _make_zone(controller, "2")]
+        for zone in db_zones:
+            zone.sensorname = "Renamed"
+        assert state.sync_zones_data(db_zones, changed_ids={"2"}) == 1
+        assert [zone.sensorname for zone in state.zones] == ["Zone 1", "Renamed"]
+
+    def test_scenes_reconciled_by_id(self) -> None:
+        state = QolsysController().state
+        assert state.sync_scenes_data([QolsysScene({"scene_id": "2", "name": "Away"}), QolsysScene({"scene_id": "1"})]) == 2
+        assert [scene.scene_id for scene in state.scenes] == ["1", "2"]
+
+        assert state.sync_scenes_data([QolsysScene({"scene_id": "2", "name": "Away"})]) == 1
+        assert [scene.scene_id for scene in state.scenes] == ["2"]
+        assert state.scene("1") is None
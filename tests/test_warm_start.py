@@ -0,0 +1,132 @@
+"""Tests for the warm start snapshot and the database file — save, load, validation and reconciliation with the live sync."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from qolsys_controller.automation_zwave.device import QolsysAutomationDeviceZwave
+from qolsys_controller.controller import QolsysController
+from tests.fake_panel.database import fake_database
+
+
+def _make_controller(directory: Path) -> QolsysController:
+    controller = QolsysController()
+    controller.settings.config_directory = str(directory)
+    controller.settings.random_mac = "aa:bb:cc:dd:ee:01"
+    controller.settings.warm_start = True
+    return controller
+
+
+class TestWarmStart:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        controller = _make_controller(tmp_path)
+        controller.panel.imei = "000000000000001"
+        await controller.panel.load_database(fake_database(zones=3))
+        assert await controller.save_warm_start()
+        assert controller.settings.warm_start_file_path.is_file()
+
+        restarted = _make_controller(tmp_path)
+        assert await restarted.load_warm_start()
+
+        assert restarted.state_stale
+        assert restarted._to_event_dict()["stale"] is True
+        assert restarted.panel.imei == "000000000000001"
+        assert [zone.zone_id for zone in restarted.state.zones] == ["1", "2", "3"]
+        assert restarted.panel.db.get_zones() == controller.panel.db.get_zones()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_stale_state_is_not_saved(self, tmp_path: Path) -> None:
+        controller = _make_controller(tmp_path)
+        assert not await controller.save_warm_start()
+
+        await controller.panel.load_database(fake_database())
+        await controller.save_warm_start()
+        restarted = _make_controller(tmp_path)
+        await restarted.load_warm_start()
+        assert not await restarted.save_warm_start()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_invalid_snapshots_are_ignored(self, tmp_path: Path) -> None:
+        controller = _make_controller(tmp_path)
+        await controller.panel.load_database(fake_database())
+        await controller.save_warm_start()
+
+        other_plugin = _make_controller(tmp_path)
+        other_plugin.settings.random_mac = "aa:bb:cc:dd:ee:02"
+        assert not await other_plugin.load_warm_start()
+
+        controller.settings.warm_start_file_path.write_bytes(gzip.compress(b"{truncated"))
+        assert not await _make_controller(tmp_path).load_warm_start()
+
+        controller.settings.warm_start_file_path.write_bytes(b"not gzip")
+        assert not await _make_controller(tmp_path).load_warm_start()
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_live_sync_refreshes_every_zwave_device(self, tmp_path: Path) -> None:
+        controller = _make_controller(tmp_path)
+        panel = controller.panel
+        zwave_device = MagicMock(spec=QolsysAutomationDeviceZwave)
+        zwave_device.virtual_node_id = "5"
+
+        with patch.object(panel, "get_automation_devices_from_db", return_value=[zwave_device]):
+            await panel.load_database(fake_database(), refresh_zwave=False)
+            zwave_device.zwave_report.assert_not_awaited()
+
+            # Live snapshot identical to the warm start one: no row changed, every device is still refreshed
+            await panel.load_database(fake_database())
+            zwave_device.zwave_report.assert_awaited_once()
+
+            await panel.load_database(fake_database())
+            zwave_device.zwave_report.assert_awaited_once()
+
+
+def _make_database_file_controller(directory: Path) -> QolsysController:
+    controller = _make_controller(directory)
+    controller.settings.warm_start = False
+    controller.settings.database_file = True
+    return controller
+
+
+class TestDatabaseFile:
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_serves_state_after_restart(self, tmp_path: Path) -> None:
+        controller = _make_database_file_controller(tmp_path)
+        assert not await controller.open_database_file()
+        await controller.panel.load_database(fake_database(zones=3))
+        assert await controller.checkpoint_database_file(truncate=True)
+
+        restarted = _make_database_file_controller(tmp_path)
+        assert await restarted.open_database_file()
+        assert restarted.panel.db.path == restarted.settings.database_file_path
+        assert await restarted.load_database_file()
+
+        assert restarted.state_stale
+        assert [zone.zone_id for zone in restarted.state.zones] == ["1", "2", "3"]
+        assert restarted.panel.db.get_zones() == controller.panel.db.get_zones()
+
+        # Live sync in a worker thread: copied into the file
+        restarted.settings.sync_database_thread_threshold = 0
+        await restarted.panel.load_database(fake_database(zones=4))
+        assert restarted.panel.db.path == restarted.settings.database_file_path
+        assert (
+            len(
+                _make_database_file_controller(tmp_path)
+                .panel.open_database_file(restarted.settings.database_file_path)
+                .get_zones()
+            )
+            == 4
+        )
+
+    @pytest.mark.asyncio  # type: ignore[untyped-decorator]
+    async def test_requires_sqlite_backend(self, tmp_path: Path) -> None:
+        controller = _make_database_file_controller(tmp_path)
+        controller.settings.database_backend = "memory"
+
+        assert not await controller.open_database_file()
+        assert controller.panel.db.path is None
+        assert not controller.settings.database_file_path.exists()
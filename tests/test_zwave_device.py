@@ -0,0 +1,50 @@
+"""Tests for Z-Wave raw payload decoding — panel ingress and MultiChannel encapsulation."""
+
+from __future__ import annotations
+
+import base64
+from unittest.mock import MagicMock
+
+from qolsys_controller.automation_zwave.device import QolsysAutomationDeviceZwave
+from qolsys_controller.enum_zwave import ZwaveCommandClass
+from qolsys_controller.panel import QolsysPanel
+
+# MultiChannel Command Encapsulation from endpoint 2: Binary Switch Report, value on
+MULTICHANNEL_SWITCH_REPORT = bytes(
+    [ZwaveCommandClass.MultiChannel, 0x0D, 0x02, 0x00, ZwaveCommandClass.SwitchBinary, 0x03, 0xFF]
+)
+
+
+class TestZwaveRawPayload:
+    def test_panel_passes_decoded_view(self) -> None:
+        controller = MagicMock()
+        device = MagicMock(spec=QolsysAutomationDeviceZwave)
+        controller.state.automation_device.return_value = device
+        panel = QolsysPanel(controller)
+
+        encoded = base64.b64encode(MULTICHANNEL_SWITCH_REPORT).decode()
+        panel.parse_zwave_message({"ZWAVE_RESPONSE": {"NODE_ID": 7, "ZWAVE_PAYLOAD": encoded}})
+
+        controller.state.automation_device.assert_called_once_with("7")
+        (payload,), _ = device.update_raw.call_args
+        assert isinstance(payload, memoryview)
+        assert payload == MULTICHANNEL_SWITCH_REPORT
+
+    def test_multichannel_encapsulation_is_sliced_without_copy(self) -> None:
+        device = MagicMock(spec=QolsysAutomationDeviceZwave)
+        payload = memoryview(MULTICHANNEL_SWITCH_REPORT)
+
+        QolsysAutomationDeviceZwave.update_raw(device, payload)
+
+        (inner, endpoint), _ = device.update_raw.call_args
+        assert endpoint == 2
+        assert inner == MULTICHANNEL_SWITCH_REPORT[4:]
+        assert inner.obj is MULTICHANNEL_SWITCH_REPORT
+
+        QolsysAutomationDeviceZwave.update_raw(device, inner, endpoint)
+        device.parse_command_25.assert_called_once_with(inner, 2)
+
+    def test_truncated_payload_is_ignored(self) -> None:
+        device = MagicMock(spec=QolsysAutomationDeviceZwave)
+        QolsysAutomationDeviceZwave.update_raw(device, bytes([ZwaveCommandClass.MultiChannel]))
+        device.update_raw.assert_not_called()